@@ -0,0 +1,662 @@
+from __future__ import annotations
+
+# Yerel HTTP/JSON iş API'si (Qt-free). Tarayıcı eklentisi / cron gibi dış
+# araçlar URL gönderir; işler GUI ile aynı DownloadScheduler'da çalışır.
+#
+#   POST   /jobs                      {"urls": [...], "format": "MP3", "quality": "320"}
+#                                     ya da {"text": "<yapıştırılan liste / CSV>"}
+#   GET    /jobs                      tüm işler (özet)
+#   GET    /jobs/<id>                 iş + öğe bazında ilerleme
+#   DELETE /jobs/<id>                 işi iptal et
+#   DELETE /jobs/<id>/items/<key>     tek öğeyi iptal et
+#   POST   /jobs/<id>/items/<key>/pause   tek öğeyi duraklat (.part kalır)
+#   POST   /jobs/<id>/items/<key>/resume  kaldığı yerden devam
+#   GET    /events                    Server-Sent Events (job / progress)
+#   GET    /limit                     global hız sınırı ve takvim
+#   PUT    /limit                     {"rate": "2M", "schedule": "07:00-22:00=2M"}
+#   GET    /metrics                   Prometheus metin biçimi (aşama süreleri, sayaçlar)
+#
+# Güvenlik: GUI'de varsayılan kapalı (MEDIA_DL_API=1 ya da MEDIA_DL_API_TOKEN ile
+# açılır). Host başlığı sadece yerel adlar => DNS rebinding ile tarayıcıdaki bir
+# sayfa API'ye ulaşamaz. "out" yapılandırılmış indirme klasörünün dışına çıkamaz.
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from core import (
+    expand_urls, parse_urls, DownloadScheduler, AUDIO_FORMATS, VIDEO_FORMATS, FRAGMENTS_AUTO,
+)
+import metrics
+from bandwidth import format_rate, parse_rate, parse_schedule
+from batch import BatchReport, DownloadBatch
+from progress import ProgressTracker, ItemProgress
+from store import DownloadIndex
+
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+PUMP_INTERVAL = 0.25  # ilerleme olayları bu aralıkla toplanıp yayınlanır
+KEEPALIVE = 15.0
+EVENT_BUFFER = 2000  # geç bağlanan/yavaş izleyiciler için son olaylar
+ANALYZE_WORKERS = 4
+MAX_BODY = 1 << 20
+MAX_WATCHERS = 16  # eşzamanlı SSE bağlantısı (her biri bir HTTP thread'i tutar)
+KEEP_FINISHED = 100  # bitmiş işlerden bellekte tutulan (GET /jobs/<id> için) en yeniler
+
+_LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+# job states
+J_ANALYZING = "analyzing"
+J_RUNNING = "running"
+J_DONE = "done"
+J_ERROR = "error"
+J_CANCELLED = "cancelled"
+
+J_FINAL = (J_DONE, J_ERROR, J_CANCELLED)
+
+
+def api_port() -> int:
+    try:
+        return int(os.environ.get("MEDIA_DL_API_PORT") or API_PORT)
+    except ValueError:
+        return API_PORT
+
+
+def api_token() -> str:
+    return os.environ.get("MEDIA_DL_API_TOKEN", "").strip()
+
+
+def api_enabled() -> bool:
+    # GUI için: açıkça istenmedikçe (ya da token yoksa) dinleme yok
+    flag = os.environ.get("MEDIA_DL_API", "").strip().lower()
+    if flag in ("0", "no", "off", "false"):
+        return False
+    return flag in ("1", "yes", "on", "true") or bool(api_token())
+
+
+def confine_out(base: str, out: str) -> Optional[str]:
+    # istekteki "out": base'in altında bir dizin (göreli ya da mutlak); dışarısı => None
+    root = os.path.realpath(base)
+    path = os.path.realpath(os.path.join(root, os.path.expanduser(out))) if out else root
+    try:
+        inside = os.path.commonpath([root, path]) == root
+    except ValueError:  # Windows: farklı sürücü
+        inside = False
+    return path if inside else None
+
+
+def item_json(p: ItemProgress) -> Dict[str, Any]:
+    return {
+        "key": p.key, "state": p.state, "percent": p.percent,
+        "done_bytes": p.done_b, "total_bytes": p.total_b,
+        "speed": p.speed, "eta": p.eta, "error": p.error,
+        "error_kind": p.kind, "attempts": p.attempt,
+    }
+
+
+def report_json(r: BatchReport) -> Dict[str, Any]:
+    return {
+        "done": r.done, "skipped": r.skipped, "cancelled": r.cancelled,
+        "retried": r.retried, "recovered": r.recovered,
+        "failed": {kind: [j.key for j in jobs] for kind, jobs in r.failed.items()},
+    }
+
+
+# ----------------------------
+# Event hub
+# ----------------------------
+
+class EventHub:
+    # Tek yazıcı (pump), çok okuyucu (SSE bağlantıları). Olaylar sıra
+    # numarasıyla halka tamponda; her izleyici kendi son numarasından devam eder.
+
+    def __init__(self, size: int = EVENT_BUFFER):
+        self._cond = threading.Condition()
+        self._buf: Deque[Tuple[int, str, str]] = deque(maxlen=size)
+        self._seq = 0
+        self._closed = False
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        payload = json.dumps(data, separators=(",", ":"))
+        with self._cond:
+            self._seq += 1
+            self._buf.append((self._seq, event, payload))
+            self._cond.notify_all()
+
+    def wait(self, after: int, timeout: float) -> List[Tuple[int, str, str]]:
+        # after > seq olamaz (çağıran kırpar); tampondan düşmüş olaylar dönmez,
+        # ilk dönen numara after + 1'den büyükse arada boşluk var demektir
+        with self._cond:
+            if self._seq <= after and not self._closed:
+                self._cond.wait(timeout)
+            return [e for e in self._buf if e[0] > after]
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def oldest(self) -> int:
+        # tamponda kalan en eski olay numarası (boşsa bir sonraki)
+        with self._cond:
+            return self._buf[0][0] if self._buf else self._seq + 1
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+# ----------------------------
+# Jobs
+# ----------------------------
+
+class ApiJob:
+    def __init__(
+        self, jid: int, urls: List[str], fmt: str, quality: str, frag_mode: str, out_dir: str,
+        priority: int = 0,
+    ):
+        self.id = jid
+        self.urls = urls
+        self.fmt = fmt
+        self.quality = quality
+        self.frag_mode = frag_mode
+        self.out_dir = out_dir
+        self.priority = priority
+        self.created = time.time()
+        self.state = J_ANALYZING
+        self.error = ""
+        self.tracker = ProgressTracker()
+        self.batch: Optional[DownloadBatch] = None
+        self.report: Optional[BatchReport] = None
+        self.cancelled = False
+
+    def summary(self) -> Dict[str, Any]:
+        a = self.tracker.aggregate()
+        return {
+            "id": self.id, "state": self.state, "error": self.error,
+            "urls": self.urls, "format": self.fmt, "quality": self.quality, "out": self.out_dir,
+            "priority": self.priority,
+            "created": self.created,
+            "skipped": len(self.batch.skipped) if self.batch else 0,
+            "progress": dict(asdict(a), percent=a.percent),
+            "report": report_json(self.report) if self.report else None,
+        }
+
+    def detail(self) -> Dict[str, Any]:
+        d = self.summary()
+        items = []
+        if self.batch:
+            for it in self.batch.items:
+                p = self.tracker.get(it.key)
+                row = {"key": it.key, "url": it.url, "title": it.title}
+                if p:
+                    row.update(item_json(p))
+                items.append(row)
+        d["items"] = items
+        return d
+
+
+class JobManager:
+    def __init__(
+        self,
+        scheduler: DownloadScheduler,
+        out_dir: Callable[[], str],
+        ffmpeg_bin: Callable[[], Optional[str]] = lambda: None,
+        index: Optional[DownloadIndex] = None,
+    ):
+        self.scheduler = scheduler
+        self.out_dir = out_dir
+        self.ffmpeg_bin = ffmpeg_bin
+        self.index = index
+        self.hub = EventHub()
+        self.watchers = threading.BoundedSemaphore(MAX_WATCHERS)
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, ApiJob] = {}
+        self._next = 1
+        self._analyze = ThreadPoolExecutor(max_workers=ANALYZE_WORKERS, thread_name_prefix="api-analyze")
+        self._stop = threading.Event()
+        self._pump = threading.Thread(target=self._pump_loop, name="api-pump", daemon=True)
+        self._pump.start()
+
+    def submit(
+        self, urls: List[str], fmt: str, quality: str, frag_mode: str, out_dir: str, priority: int = 0,
+    ) -> ApiJob:
+        with self._lock:
+            job = ApiJob(self._next, urls, fmt, quality, frag_mode, out_dir or self.out_dir(), priority)
+            self._next += 1
+            self._jobs[job.id] = job
+            self._prune_locked()
+        self.hub.publish("job", job.summary())
+        self._analyze.submit(self._prepare, job)
+        return job
+
+    def jobs(self) -> List[ApiJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get(self, jid: int) -> Optional[ApiJob]:
+        with self._lock:
+            return self._jobs.get(jid)
+
+    def cancel(self, job: ApiJob, key: str = "") -> bool:
+        if key:
+            return bool(job.batch and job.batch.cancel_item(key))
+        job.cancelled = True
+        if job.batch:
+            job.batch.stop()
+        return True
+
+    def pause(self, job: ApiJob, key: str) -> bool:
+        return bool(job.batch and job.batch.pause_item(key))
+
+    def resume(self, job: ApiJob, key: str) -> bool:
+        return bool(job.batch and job.batch.resume_item(key))
+
+    def limit(self) -> Dict[str, Any]:
+        lim = self.scheduler.limiter
+        return {
+            "rate": format_rate(lim.rate),
+            "schedule": ",".join(str(w) for w in lim.schedule),
+            "current": lim.current_rate(),  # şu anki geçerli sınır, bayt/sn (0 = sınırsız)
+        }
+
+    def set_limit(self, data: Dict[str, Any]):
+        # önce ikisi de ayrıştırılır: biri hatalıysa hiçbiri uygulanmaz
+        lim = self.scheduler.limiter
+        rate = parse_rate(str(data["rate"])) if "rate" in data else None
+        schedule = parse_schedule(str(data["schedule"] or "")) if "schedule" in data else None
+        if rate is not None:
+            lim.set_rate(rate)
+        if schedule is not None:
+            lim.set_schedule(schedule)
+
+    def shutdown(self):
+        self._stop.set()
+        self.hub.close()
+        for job in self.jobs():
+            if job.batch and job.state not in J_FINAL:
+                job.batch.abandon()
+        self._analyze.shutdown(wait=False, cancel_futures=True)
+
+    # ---- internals ----
+
+    def _prune_locked(self):
+        # bitmiş işler sınırsız birikmesin: en eski bitmişler düşer
+        finished = [jid for jid, j in self._jobs.items() if j.state in J_FINAL]
+        for jid in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self._jobs[jid]
+
+    def _set_state(self, job: ApiJob, state: str, error: str = ""):
+        job.state = state
+        job.error = error
+        self.hub.publish("job", job.summary())
+        if state in J_FINAL:
+            with self._lock:
+                self._prune_locked()
+
+    def _prepare(self, job: ApiJob):
+        # analiz havuzda (sınırlı); indirme scheduler'da, iş bitişi batch'in geri çağrısıyla
+        try:
+            items = expand_urls(job.urls, should_stop=lambda: job.cancelled or self._stop.is_set())
+        except Exception as ex:
+            self._set_state(job, J_ERROR, str(ex))
+            return
+        if job.cancelled or self._stop.is_set():
+            self._set_state(job, J_CANCELLED)
+            return
+        if not items:
+            self._set_state(job, J_ERROR, "no entries")
+            return
+
+        job.batch = DownloadBatch(
+            items=items,
+            out_dir=job.out_dir,
+            fmt_text=job.fmt,
+            q_text=job.quality,
+            frag_mode=job.frag_mode,
+            ffmpeg_bin=self.ffmpeg_bin(),
+            scheduler=self.scheduler,
+            tracker=job.tracker,
+            index=self.index,
+            priority=job.priority,
+        )
+        self._set_state(job, J_RUNNING)
+        try:
+            job.batch.start(on_complete=lambda b: self._complete(job))
+        except Exception as ex:
+            self._set_state(job, J_ERROR, str(ex))
+
+    def _complete(self, job: ApiJob):
+        # son öğeyi bitiren scheduler thread'inde (ya da öğe yoksa start() içinde)
+        b = job.batch
+        job.report = b.report()
+        self._flush(job)
+        if b.stopped or job.cancelled:
+            self._set_state(job, J_CANCELLED)
+        elif b.errors:
+            self._set_state(job, J_ERROR, b.errors[0].error)
+        else:
+            self._set_state(job, J_DONE)
+
+    def _flush(self, job: ApiJob):
+        for key in job.tracker.take_dirty():
+            p = job.tracker.get(key)
+            if p:
+                self.hub.publish("progress", dict(item_json(p), job=job.id))
+
+    def _pump_loop(self):
+        # tracker'lar hook başına değil, sabit aralıkla okunur
+        # (izleyici sayısından bağımsız tek bir tarama)
+        while not self._stop.wait(PUMP_INTERVAL):
+            for job in self.jobs():
+                if job.state == J_RUNNING:
+                    self._flush(job)
+
+
+# ----------------------------
+# HTTP
+# ----------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "media-downloader"
+    manager: JobManager  # server'dan
+    token: str = ""
+    hosts: frozenset = frozenset(_LOCAL_HOSTS)  # kabul edilen Host başlıkları (boş => hepsi)
+
+    def log_message(self, *args):
+        pass
+
+    # ---- helpers ----
+
+    def _send(self, code: int, data: Any):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, code: int, text: str, ctype: str = "text/plain; charset=utf-8"):
+        body = text.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _fail(self, code: int, msg: str):
+        self._send(code, {"error": msg})
+
+    def _authorized(self, query: Dict[str, List[str]]) -> bool:
+        if not self.token:
+            return True
+        auth = self.headers.get("Authorization", "")
+        if auth == f"Bearer {self.token}":
+            return True
+        # EventSource başlık gönderemez => ?token=
+        return (query.get("token") or [""])[0] == self.token
+
+    def _host_allowed(self) -> bool:
+        if not self.hosts:
+            return True
+        host = self.headers.get("Host", "")
+        try:
+            name = urlsplit(f"//{host}").hostname or ""
+        except ValueError:
+            return False
+        return name.lower() in self.hosts
+
+    def _route(self) -> Optional[Tuple[List[str], Dict[str, List[str]]]]:
+        if not self._host_allowed():
+            self._fail(421, "host not allowed")
+            return None
+        u = urlsplit(self.path)
+        q = parse_qs(u.query)
+        if not self._authorized(q):
+            self._fail(401, "unauthorized")
+            return None
+        parts = [unquote(p) for p in u.path.strip("/").split("/") if p]
+        return parts, q
+
+    def _json_body(self) -> Optional[Dict[str, Any]]:
+        # sadece application/json: tarayıcıdaki başka siteler "basit" istekle iş ekleyemesin
+        if not self.headers.get("Content-Type", "").startswith("application/json"):
+            self._fail(415, "expected application/json")
+            return None
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+            if n < 0:
+                raise ValueError("negative length")
+            if n > MAX_BODY:
+                self._fail(413, "body too large")
+                return None
+            data = json.loads(self.rfile.read(n) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._fail(400, "invalid json")
+            return None
+        if not isinstance(data, dict):
+            self._fail(400, "expected a json object")
+            return None
+        return data
+
+    def _job(self, s: str) -> Optional[ApiJob]:
+        job = self.manager.get(int(s)) if s.isdigit() else None
+        if not job:
+            self._fail(404, "no such job")
+        return job
+
+    # ---- verbs ----
+
+    def do_GET(self):
+        r = self._route()
+        if not r:
+            return
+        parts, q = r
+        if parts == ["jobs"]:
+            self._send(200, [j.summary() for j in self.manager.jobs()])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job(parts[1])
+            if job:
+                self._send(200, job.detail())
+        elif parts == ["events"]:
+            self._events(q)
+        elif parts == ["limit"]:
+            self._send(200, self.manager.limit())
+        elif parts == ["metrics"]:
+            self._send_text(200, metrics.render(), "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._fail(404, "not found")
+
+    def do_POST(self):
+        r = self._route()
+        if not r:
+            return
+        parts, _ = r
+        if len(parts) == 5 and parts[0] == "jobs" and parts[2] == "items" and parts[4] in ("pause", "resume"):
+            self._item_action(parts[1], parts[3], parts[4])
+            return
+        if parts != ["jobs"]:
+            self._fail(404, "not found")
+            return
+        data = self._json_body()
+        if data is None:
+            return
+
+        urls = data.get("urls") or ([data["url"]] if data.get("url") else [])
+        if not urls and isinstance(data.get("text"), str):
+            urls = parse_urls(data["text"])
+        if not isinstance(urls, list) or not all(isinstance(u, str) and u.startswith("http") for u in urls) or not urls:
+            self._fail(400, "urls: list of http(s) URLs required (or text with links)")
+            return
+        urls = list(dict.fromkeys(urls))
+        fmt = str(data.get("format") or "MP4").upper()
+        if fmt not in AUDIO_FORMATS + VIDEO_FORMATS:
+            self._fail(400, f"format: one of {', '.join(AUDIO_FORMATS + VIDEO_FORMATS)}")
+            return
+        try:
+            priority = int(data.get("priority") or 0)
+        except (TypeError, ValueError):
+            self._fail(400, "priority: integer")
+            return
+        out = confine_out(self.manager.out_dir(), str(data.get("out") or ""))
+        if out is None:
+            self._fail(400, "out: must be inside the download folder")
+            return
+        job = self.manager.submit(
+            urls, fmt, str(data.get("quality") or ""),
+            str(data.get("fragments") or FRAGMENTS_AUTO), out, priority,
+        )
+        self._send(201, job.summary())
+
+    def _item_action(self, jid: str, key: str, action: str):
+        job = self._job(jid)
+        if not job:
+            return
+        ok = self.manager.pause(job, key) if action == "pause" else self.manager.resume(job, key)
+        if not ok:
+            self._fail(409, f"item cannot {action} (not found or in the wrong state)")
+            return
+        self._send(202, {"id": job.id, action: key})
+
+    def do_PUT(self):
+        r = self._route()
+        if not r:
+            return
+        parts, _ = r
+        if parts != ["limit"]:
+            self._fail(404, "not found")
+            return
+        data = self._json_body()
+        if data is None:
+            return
+        try:
+            self.manager.set_limit(data)
+        except ValueError as ex:
+            self._fail(400, str(ex))
+            return
+        self._send(200, self.manager.limit())
+
+    def do_DELETE(self):
+        r = self._route()
+        if not r:
+            return
+        parts, _ = r
+        if len(parts) not in (2, 4) or parts[0] != "jobs" or (len(parts) == 4 and parts[2] != "items"):
+            self._fail(404, "not found")
+            return
+        job = self._job(parts[1])
+        if not job:
+            return
+        key = parts[3] if len(parts) == 4 else ""
+        if not self.manager.cancel(job, key):
+            self._fail(404, "no such item")
+            return
+        self._send(202, {"id": job.id, "cancelled": key or True})
+
+    def _events(self, q: Dict[str, List[str]]):
+        if not self.manager.watchers.acquire(blocking=False):
+            self._fail(503, "too many event streams")
+            return
+        try:
+            self._stream(q)
+        finally:
+            self.manager.watchers.release()
+
+    def _stream(self, q: Dict[str, List[str]]):
+        hub = self.manager.hub
+        try:
+            last = int(self.headers.get("Last-Event-ID") or (q.get("since") or [""])[0] or hub.seq)
+        except ValueError:
+            last = hub.seq
+        # EventSource yeniden bağlanırken önceki çalıştırmanın numarasını gönderir:
+        # bu sürecin sırasından büyükse baştan değil, şu andan devam
+        last = max(0, min(last, hub.seq))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            # bağlanınca mevcut durumun özeti
+            self._snapshot()
+            self.wfile.flush()
+            last = max(last, hub.oldest - 1)  # özetten eski, tampondan düşmüşler aranmaz
+            while not hub.closed:
+                events = hub.wait(last, KEEPALIVE)
+                if not events:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    if events[0][0] > last + 1:
+                        # izleyici tamponun gerisinde kaldı: kaçanlar yerine güncel özet
+                        self._snapshot()
+                    chunks = []
+                    for seq, ev, payload in events:
+                        chunks.append(f"id: {seq}\nevent: {ev}\ndata: {payload}\n\n")
+                        last = seq
+                    self.wfile.write("".join(chunks).encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+
+    def _snapshot(self):
+        for job in self.manager.jobs():
+            self.wfile.write(f"event: job\ndata: {json.dumps(job.summary())}\n\n".encode("utf-8"))
+
+
+class ApiServer:
+    def __init__(
+        self,
+        scheduler: DownloadScheduler,
+        out_dir: Callable[[], str],
+        ffmpeg_bin: Callable[[], Optional[str]] = lambda: None,
+        index: Optional[DownloadIndex] = None,
+        host: str = API_HOST,
+        port: Optional[int] = None,
+        token: Optional[str] = None,
+    ):
+        token = api_token() if token is None else token
+        hosts = frozenset(_LOCAL_HOSTS)
+        if host.lower() not in _LOCAL_HOSTS:
+            # ağa açık dinleme token'sız olmaz; token varken Host serbest (rebinding token'ı bilemez)
+            if not token:
+                raise ValueError("MEDIA_DL_API_TOKEN is required when listening on a non-local address")
+            hosts = frozenset()
+        self.manager = JobManager(scheduler, out_dir, ffmpeg_bin, index)
+        handler = type("Handler", (_Handler,), {
+            "manager": self.manager,
+            "token": token,
+            "hosts": hosts,
+        })
+        self.httpd = ThreadingHTTPServer((host, api_port() if port is None else port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    def start(self) -> "ApiServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="api-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        self.manager.shutdown()
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+# Global bant genişliği sınırı (Qt-free). Bütün indirme işleri tek bir token
+# bucket'tan harcar; yt-dlp progress hook'u her blokta consume() çağırır ve
+# gerekirse bekler. Sınır çalışırken değiştirilebilir (işler yeniden başlamaz).
+#
+#   rate:     "2M", "500K", "0" (sınırsız) — yt-dlp --limit-rate gibi, bayt/sn
+#   schedule: "22:00-07:00=0,07:00-22:00=2M" — saat aralığı => hız (ilk eşleşen)
+#
+# Öncelik: bekleyen daha yüksek öncelikli bir iş varsa düşük öncelikliler
+# token alamaz (büyük parti sürerken acil bir iş bant genişliğini alır).
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+BURST_SECONDS = 1.0  # kova kapasitesi: bu kadar saniyelik hız
+MAX_WAIT = 0.25  # bekleyenler hız/takvim değişikliğini ve iptali bu aralıkla görür
+LIMIT_BLOCK = 64 * 1024  # sınır varken yt-dlp okuma bloğu (büyük bloklar => kesik kesik akış)
+
+_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def parse_rate(text: str) -> int:
+    # "2M" / "2MB" / "1.5m" / "500K" / "0" / "" => bayt/sn (0 = sınırsız)
+    s = (text or "").strip().lower().replace(" ", "")
+    if s in ("", "0", "off", "none", "unlimited"):
+        return 0
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)([bkmg]?)(?:i?b)?(?:/s)?", s)
+    if not m:
+        raise ValueError(f"invalid rate: {text!r}")
+    return int(float(m.group(1)) * _UNITS[m.group(2)])
+
+
+def format_rate(n: int) -> str:
+    if not n:
+        return "0"
+    for unit, size in (("G", 1024 ** 3), ("M", 1024 ** 2), ("K", 1024)):
+        if n >= size:
+            return f"{n / size:g}{unit}"
+    return str(n)
+
+
+def _minutes(hhmm: str) -> int:
+    h, _, m = hhmm.strip().partition(":")
+    h_, m_ = int(h), int(m or 0)
+    if not (0 <= h_ <= 24 and 0 <= m_ < 60):
+        raise ValueError(hhmm)
+    return (h_ * 60 + m_) % (24 * 60)
+
+
+@dataclass(frozen=True)
+class Window:
+    start: int  # gün içinde dakika
+    end: int
+    rate: int
+
+    def contains(self, minute: int) -> bool:
+        if self.start == self.end:
+            return True  # 00:00-24:00 => bütün gün
+        if self.start < self.end:
+            return self.start <= minute < self.end
+        return minute >= self.start or minute < self.end  # gece yarısını geçen aralık
+
+    def __str__(self) -> str:
+        return f"{self.start // 60:02d}:{self.start % 60:02d}-{self.end // 60:02d}:{self.end % 60:02d}={format_rate(self.rate)}"
+
+
+def parse_schedule(text: str) -> List[Window]:
+    out: List[Window] = []
+    for part in re.split(r"[,;\s]+", (text or "").strip()):
+        if not part:
+            continue
+        span, eq, rate = part.partition("=")
+        a, dash, b = span.partition("-")
+        if not eq or not dash:
+            raise ValueError(f"invalid schedule entry: {part!r} (HH:MM-HH:MM=RATE)")
+        try:
+            out.append(Window(_minutes(a), _minutes(b), parse_rate(rate)))
+        except ValueError:
+            raise ValueError(f"invalid schedule entry: {part!r}") from None
+    return out
+
+
+class BandwidthLimiter:
+    def __init__(self, rate: int = 0, schedule: Optional[List[Window]] = None):
+        self._cond = threading.Condition()
+        self._rate = max(0, rate)
+        self._schedule: List[Window] = list(schedule or [])
+        self._tokens = 0.0
+        self._stamp = time.monotonic()
+        self._waiting: Dict[int, int] = {}  # öncelik -> bekleyen sayısı
+        self.clock: Callable[[], datetime] = datetime.now
+
+    @classmethod
+    def from_env(cls) -> "BandwidthLimiter":
+        # MEDIA_DL_RATE_LIMIT=2M  MEDIA_DL_BW_SCHEDULE="07:00-22:00=2M"
+        lim = cls()
+        try:
+            lim.set_rate(parse_rate(os.environ.get("MEDIA_DL_RATE_LIMIT", "")))
+        except ValueError:
+            pass
+        try:
+            lim.set_schedule(parse_schedule(os.environ.get("MEDIA_DL_BW_SCHEDULE", "")))
+        except ValueError:
+            pass
+        return lim
+
+    # ---- config (çalışırken değiştirilebilir) ----
+
+    @property
+    def rate(self) -> int:
+        return self._rate
+
+    @property
+    def schedule(self) -> List[Window]:
+        return list(self._schedule)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._rate or any(w.rate for w in self._schedule))
+
+    def set_rate(self, rate: int):
+        with self._cond:
+            self._rate = max(0, int(rate))
+            self._cond.notify_all()
+
+    def set_schedule(self, schedule: List[Window]):
+        with self._cond:
+            self._schedule = list(schedule)
+            self._cond.notify_all()
+
+    def current_rate(self) -> int:
+        # takvimde eşleşen aralık varsa o, yoksa temel hız
+        if self._schedule:
+            now = self.clock()
+            minute = now.hour * 60 + now.minute
+            for w in self._schedule:
+                if w.contains(minute):
+                    return w.rate
+        return self._rate
+
+    # ---- consume ----
+
+    def consume(self, n: int, priority: int = 0, should_stop: Optional[Callable[[], bool]] = None):
+        # `n` bayt harcar; kova boşsa (borç) dolana kadar bekler
+        if n <= 0:
+            return
+        with self._cond:
+            self._waiting[priority] = self._waiting.get(priority, 0) + 1
+            try:
+                while True:
+                    rate = self.current_rate()
+                    now = time.monotonic()
+                    if not rate:
+                        self._tokens = 0.0
+                        self._stamp = now
+                        return
+                    cap = rate * BURST_SECONDS
+                    self._tokens = min(cap, self._tokens + (now - self._stamp) * rate)
+                    self._stamp = now
+
+                    top = max(p for p, c in self._waiting.items() if c)
+                    if priority >= top and self._tokens > 0:
+                        self._tokens -= n  # büyük blok => borç; sonrakiler borç kapanana kadar bekler
+                        return
+                    if should_stop and should_stop():
+                        return
+                    wait = -self._tokens / rate if self._tokens <= 0 else MAX_WAIT
+                    self._cond.wait(min(MAX_WAIT, max(0.005, wait)))
+            finally:
+                self._waiting[priority] -= 1
+                if not self._waiting[priority]:
+                    del self._waiting[priority]
+                self._cond.notify_all()
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import metrics
+from core import (
+    DownloadJob, DownloadScheduler, QueueItem, build_ydl_opts,
+    DONE, ERROR, CANCELLED, PAUSED, QUEUED, RUNNING,
+)
+from progress import ProgressTracker, P_QUEUED, P_POST, P_DONE, P_ERROR, P_CANCELLED, P_PAUSED
+from retry import PERMANENT
+from store import DownloadIndex, QueueStore, Q_DONE, Q_ERROR
+from transcode import AudioTarget, TranscodeTask, ffmpeg_path, split_audio
+
+
+@dataclass
+class BatchReport:
+    # parti sonu özeti (ilk hatada modal diyalog yerine)
+    done: int = 0
+    skipped: int = 0
+    cancelled: int = 0
+    retried: int = 0  # en az bir kez yeniden denenen öğeler
+    recovered: int = 0  # yeniden denemeyle inenler
+    failed: Dict[str, List[DownloadJob]] = field(default_factory=dict)  # hata türü -> işler
+
+    @property
+    def failed_count(self) -> int:
+        return sum(len(v) for v in self.failed.values())
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+class DownloadBatch:
+    # Seçilen öğeleri tek bir parti olarak indirir (Qt-free; GUI ve CLI ortak).
+    # - indekste olanlar ağa çıkmadan atlanır
+    # - her öğe scheduler'da ayrı bir iş
+    # - ses dönüştürme (MP3/WAV/FLAC) indirme slotunu tutmaz: scheduler.transcoder'da
+    # - öğe bazında iptal / duraklatma / devam; diğer işler etkilenmez. Duraklatılmış
+    #   öğeler devam ettirilene ya da parti durdurulana kadar partiyi açık tutar
+    # - bir öğenin hatası partiyi durdurmaz: geçici hatalar scheduler'da yeniden
+    #   denenir, sonunda report() türlerine göre özet verir
+    # - ilerleme tracker'a, kuyruk durumu QueueStore'a yazılır
+    # - run() bitene kadar bloklar; start(on_complete) bloklamaz, parti bitince
+    #   on_complete son öğeyi bitiren thread'de çağrılır (API: iş başına thread yok)
+
+    def __init__(
+        self,
+        items: List[QueueItem],
+        out_dir: str,
+        fmt_text: str,
+        q_text: str,
+        frag_mode: str,
+        ffmpeg_bin: Optional[str],
+        scheduler: DownloadScheduler,
+        tracker: ProgressTracker,
+        index: Optional[DownloadIndex] = None,
+        queue_store: Optional[QueueStore] = None,
+        batch_id: Optional[int] = None,
+        priority: int = 0,
+    ):
+        self.items = items
+        self.out_dir = out_dir
+        self.fmt_text = fmt_text
+        self.q_text = q_text
+        self.frag_mode = frag_mode
+        self.ffmpeg_bin = ffmpeg_bin
+        self.scheduler = scheduler
+        self.tracker = tracker
+        self.index = index
+        self.queue_store = queue_store
+        self.batch_id = batch_id
+        self.priority = priority
+
+        self.jobs: List[DownloadJob] = []
+        self.skipped: List[QueueItem] = []
+        self.audio: Optional[AudioTarget] = None
+        self._tasks: Dict[str, TranscodeTask] = {}
+        self._stop = False
+        self._closing = False
+        self._lock = threading.RLock()  # duraklat / devam / durdur yarışları
+        self._left = 0  # bitmemiş iş sayısı
+        self._settled: Set[int] = set()  # sayaçtan düşmüş işler (iki kez düşmesin)
+        self._complete = threading.Event()
+        self._on_complete: Optional[Callable[["DownloadBatch"], None]] = None
+
+    def stop(self):
+        self._stop = True
+        self._cancel_all()
+
+    def _job(self, key: str) -> Optional[DownloadJob]:
+        return next((j for j in self.jobs if j.key == key), None)
+
+    def cancel_item(self, key: str) -> bool:
+        task = self._tasks.get(key)
+        if task:
+            self.scheduler.transcoder.cancel(task)
+            return True
+        job = self._job(key)
+        if not job:
+            return False
+        with self._lock:
+            if job.state == PAUSED:
+                job.state = CANCELLED
+                self._done(job)
+                return True
+        self.scheduler.cancel(job)
+        return True
+
+    def pause_item(self, key: str) -> bool:
+        # sadece indirme aşaması; dönüştürme duraklatılamaz (iptal edilebilir)
+        job = self._job(key)
+        with self._lock:
+            if not job or key in self._tasks or job.state not in (QUEUED, RUNNING) or self._stop:
+                return False
+            self.scheduler.pause(job)
+        return True
+
+    def resume_item(self, key: str) -> bool:
+        job = self._job(key)
+        with self._lock:
+            if not job or job.state != PAUSED or self._stop or self._closing:
+                return False
+            job.reset()
+            self.tracker.set_state(key, P_QUEUED)
+            self.scheduler.submit(job)
+        return True
+
+    def abandon(self):
+        # uygulama kapanıyor: işleri durdur ama kuyruğu kapatma (sonra devam edilir)
+        self._closing = True
+        self._cancel_all()
+
+    def _cancel_all(self):
+        with self._lock:
+            paused = [j for j in self.jobs if j.state == PAUSED]
+            for job in paused:
+                # kapanırken duraklatılmışlar kuyrukta kalır (sonra devam), durdurulunca iptal
+                if not self._closing:
+                    job.state = CANCELLED
+                self._done(job)
+        for job in list(self.jobs):
+            if job not in paused:
+                self.scheduler.cancel(job)
+        for task in list(self._tasks.values()):
+            self.scheduler.transcoder.cancel(task)
+
+    @property
+    def stopped(self) -> bool:
+        # tek tek iptal edilen öğeler partiyi "durdurulmuş" yapmaz
+        return self._stop
+
+    @property
+    def cancelled(self) -> List[DownloadJob]:
+        return [j for j in self.jobs if j.state == CANCELLED]
+
+    @property
+    def errors(self) -> List[DownloadJob]:
+        return [j for j in self.jobs if j.state == ERROR]
+
+    def report(self) -> BatchReport:
+        r = BatchReport(skipped=len(self.skipped))
+        for job in self.jobs:
+            if job.attempts:
+                r.retried += 1
+            if job.state == DONE:
+                r.done += 1
+                r.recovered += bool(job.attempts)
+            elif job.state == ERROR:
+                r.failed.setdefault(job.error_kind or PERMANENT, []).append(job)
+            elif job.state == CANCELLED:
+                r.cancelled += 1
+        return r
+
+    def _store(self, method: str, *args):
+        if not self.queue_store or self.batch_id is None:
+            return
+        try:
+            getattr(self.queue_store, method)(self.batch_id, *args)
+        except Exception:
+            pass  # kuyruk kaydı yazılamazsa indirme yine devam eder
+
+    def _done(self, job: DownloadJob):
+        with self._lock:
+            if job.id in self._settled:
+                return
+            self._settled.add(job.id)
+        try:
+            self._finished(job)
+        finally:
+            with self._lock:
+                self._left -= 1
+                last = self._left == 0
+            if last:
+                self._close()
+
+    def _close(self):
+        # son öğe bitti (ya da hiç öğe yok)
+        if not self._closing:
+            self._store("close_batch")
+        self._complete.set()
+        if self._on_complete:
+            self._on_complete(self)
+
+    def _finished(self, job: DownloadJob):
+        state = {DONE: P_DONE, ERROR: P_ERROR, PAUSED: P_PAUSED}.get(job.state, P_CANCELLED)
+        if state == P_DONE and self.index:
+            try:
+                self.index.add(job.extractor, job.video_id, self.fmt_text, self.q_text, job.path)
+            except Exception:
+                pass  # indeks yazılamazsa indirme yine başarılı
+        self.tracker.set_state(job.key, state, job.error, job.error_kind if state == P_ERROR else "")
+        self._trace(job, state)
+        if state == P_DONE:
+            self._store("set_state", job.key, Q_DONE)
+        elif state == P_ERROR:
+            self._store("set_state", job.key, Q_ERROR, job.error)
+
+    def _trace(self, job: DownloadJob, state: str):
+        # öğe bitti: sayaçlar + iz satırı (aşama toplamlarıyla)
+        if state == P_PAUSED:
+            return
+        metrics.count("media_dl_items_total", state=state)
+        if state == P_ERROR:
+            metrics.count("media_dl_errors_total", kind=job.error_kind or PERMANENT)
+        metrics.trace_item({
+            "key": job.key, "job": job.id, "batch": self.batch_id, "state": state,
+            "host": job.host, "extractor": job.extractor, "bytes": job.bytes,
+            "attempts": job.attempts, "error_kind": job.error_kind, "error": job.error,
+            "timings": {k: round(v, 4) for k, v in job.timings.items()},
+        })
+
+    def _convert(self, job: DownloadJob, then: Callable[[DownloadJob], None]):
+        # indirme bitti: dönüştürme kuyruğuna; `then` dönüştürme bitince çağrılır
+        def converted(task: TranscodeTask):
+            self._tasks.pop(job.key, None)
+            if task.ended and task.started:
+                job.stage(
+                    "postprocess", task.ended - task.started, pp="ffmpeg-audio",
+                    copy=task.copied, wait=round(task.started - task.queued, 4),
+                )
+            if task.cancelled:
+                job.state = CANCELLED
+            elif task.error:
+                job.state = ERROR
+                job.error = task.error
+                job.error_kind = PERMANENT  # ffmpeg hatası tekrar denemeyle düzelmez
+            else:
+                job.path = task.out
+            then(job)
+
+        self.tracker.set_state(job.key, P_POST)
+        task = TranscodeTask(
+            job.path, self.audio, ffmpeg_path(self.ffmpeg_bin), job.acodec, job.abr, on_done=converted,
+        )
+        self._tasks[job.key] = task
+        self.scheduler.transcoder.submit(task)
+
+    def run(self):
+        # bütün işler (dönüştürme dahil) bitene kadar bloklar
+        self.start()
+        self._complete.wait()
+
+    def start(self, on_complete: Optional[Callable[["DownloadBatch"], None]] = None):
+        self._on_complete = on_complete
+        ydl_opts, self.audio = split_audio(
+            build_ydl_opts(self.out_dir, self.fmt_text, self.q_text, self.frag_mode, self.ffmpeg_bin)
+        )
+        partials: Dict[str, str] = {}
+
+        def hook(job: DownloadJob, d: Dict[str, Any]):
+            self.tracker.update(job.key, d)
+            tmp = d.get("tmpfilename") or ""
+            if tmp and partials.get(job.key) != tmp:
+                partials[job.key] = tmp
+                self._store("set_partial", job.key, tmp)
+
+        def finished(job: DownloadJob):
+            if job.state == PAUSED:
+                with self._lock:
+                    if not (self._stop or self._closing):
+                        self.tracker.set_state(job.key, P_PAUSED)
+                        return  # resume_item() yeniden kuyruğa koyar
+                    if not self._closing:
+                        job.state = CANCELLED
+            if job.state == DONE and self.audio and job.path and not (self._stop or self._closing):
+                try:
+                    self._convert(job, self._done)
+                    return
+                except Exception as ex:
+                    job.state = ERROR
+                    job.error = str(ex)
+                    job.error_kind = PERMANENT
+            self._done(job)
+
+        def retrying(job: DownloadJob):
+            self.tracker.retrying(job.key, job.error, job.error_kind, job.attempts, job.not_before)
+
+        # indekste olanlar ağa hiç çıkmadan atlanır
+        items = self.items
+        if self.index:
+            have = self.index.lookup([(it.extractor, it.video_id) for it in items], self.fmt_text)
+            self.skipped = [it for it in items if DownloadIndex.norm(it.extractor, it.video_id) in have]
+            items = [it for it in items if DownloadIndex.norm(it.extractor, it.video_id) not in have]
+            if self.skipped:
+                metrics.count("media_dl_items_total", len(self.skipped), state="skipped")
+        self.tracker.reset([it.key for it in items])
+
+        if self.queue_store and self.batch_id is None:
+            try:
+                self.batch_id = self.queue_store.create_batch(
+                    items, self.out_dir, self.fmt_text, self.q_text, self.frag_mode
+                )
+            except Exception:
+                self.batch_id = None
+
+        # her URL ayrı bir iş; scheduler bunları paralel çalıştırır
+        self.jobs = [
+            DownloadJob(
+                it.url, ydl_opts, key=it.key, extractor=it.extractor, video_id=it.video_id,
+                priority=self.priority, on_progress=hook, on_finish=finished, on_retry=retrying,
+            )
+            for it in items
+        ]
+        self._left = len(self.jobs)
+        if not self.jobs:
+            self._close()
+            return
+        for job in self.jobs:
+            self.scheduler.submit(job)
+        if self._stop or self._closing:
+            for job in self.jobs:
+                self.scheduler.cancel(job)
@@ -0,0 +1,652 @@
+from __future__ import annotations
+
+# Performans ölçümleri (ağa çıkmaz).
+#   python bench.py                          => hepsi, tablo stderr'e
+#   python bench.py analyze list             => sadece seçilenler
+#   python bench.py --out bench.json         => JSON (commit'ler arası karşılaştırma)
+#   python bench.py --compare bench.json     => yeniden ölç, eski sonuçla karşılaştır
+#   python bench.py --compare a.json b.json  => iki sonuç dosyası
+#   python bench.py --serve --latency 50 --bandwidth 2M   => sadece sahte sunucu
+#
+# MockServer: yerel HTTP; yapay medya dosyaları, parçalı HLS/DASH manifestleri,
+# istek başına gecikme ve bağlantı başına bant genişliği sınırı.
+# bench://playlist/N: N girdilik sahte playlist extractor'ı (sayfa sayfa, gecikmeli).
+#
+# Ölçümler:
+#   analyze  AnalyzeWorker: ilk girdiye kadar geçen süre, girdi/sn
+#   download DownloadWorker: MB/s (düz HTTP ve HLS/DASH parçalı)
+#   scale    DownloadScheduler: eşzamanlı iş sayısına göre MB/s
+#   list     10k girdinin listeye eklenmesi (model + view), en uzun UI takılması
+# Her ölçümden sonra anlık ve en yüksek RSS de yazılır.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from bandwidth import format_rate, parse_rate
+
+
+BENCHES = ("analyze", "download", "scale", "list")
+LIST_BATCH = 50  # AnalyzeWorker ile aynı parti boyu
+CHUNK = 64 * 1024
+_PAYLOAD = bytes(range(256)) * (CHUNK // 256)
+
+
+# ----------------------------
+# Mock media server
+# ----------------------------
+
+def _query(path: str) -> Tuple[str, Dict[str, str]]:
+    parts = urlsplit(path)
+    return parts.path, {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+
+def _int(q: Dict[str, str], key: str, default: int) -> int:
+    try:
+        return int(float(q.get(key) or default))
+    except ValueError:
+        return default
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    # /media/<ad>.<ext>?size=N              N baytlık dosya (Range destekli)
+    # /hls/<ad>.m3u8?segments=N&seg=B&dur=D  HLS media playlist
+    # /dash/<ad>.mpd?segments=N&seg=B&dur=D  DASH (SegmentList)
+    # /seg/<ad>/<i>.<ext>?size=B             parça
+    protocol_version = "HTTP/1.1"  # keep-alive: parçalı indirmede bağlantı tekrar kullanılır
+    mock: "MockServer"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.mock.connections += 1
+
+    def do_HEAD(self):
+        self._route(head=True)
+
+    def do_GET(self):
+        self._route(head=False)
+
+    def _route(self, head: bool):
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+        path, q = _query(self.path)
+        self.mock.requests += 1
+        if path.startswith(("/media/", "/seg/")):
+            ext = path.rsplit(".", 1)[-1]
+            ctype = {"ts": "video/mp2t", "m4s": "video/iso.segment", "webm": "video/webm"}.get(ext, "video/mp4")
+            self._body_sized(_int(q, "size", 1024 * 1024), ctype, head)
+        elif path.startswith("/hls/"):
+            self._text(self._m3u8(path[5:].rsplit(".", 1)[0], q), "application/vnd.apple.mpegurl", head)
+        elif path.startswith("/dash/"):
+            self._text(self._mpd(path[6:].rsplit(".", 1)[0], q), "application/dash+xml", head)
+        else:
+            self.send_error(404)
+
+    def _m3u8(self, name: str, q: Dict[str, str]) -> str:
+        n, seg, dur = _int(q, "segments", 20), _int(q, "seg", 256 * 1024), _int(q, "dur", 4)
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", f"#EXT-X-TARGETDURATION:{dur}", "#EXT-X-MEDIA-SEQUENCE:0"]
+        for i in range(n):
+            lines += [f"#EXTINF:{dur}.0,", f"/seg/{name}/{i}.ts?size={seg}"]
+        lines.append("#EXT-X-ENDLIST")
+        return "\n".join(lines) + "\n"
+
+    def _mpd(self, name: str, q: Dict[str, str]) -> str:
+        n, seg, dur = _int(q, "segments", 20), _int(q, "seg", 256 * 1024), _int(q, "dur", 4)
+        urls = "".join(f'<SegmentURL media="/seg/{name}/{i}.m4s?size={seg}"/>' for i in range(n))
+        bw = seg * 8 // max(1, dur)
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" '
+            f'mediaPresentationDuration="PT{n * dur}S" minBufferTime="PT2S" '
+            'profiles="urn:mpeg:dash:profile:isoff-main:2011">'
+            '<Period><AdaptationSet mimeType="video/mp4" segmentAlignment="true">'
+            f'<Representation id="{name}" codecs="avc1.4d401f,mp4a.40.2" bandwidth="{bw}" width="1280" height="720">'
+            f'<SegmentList duration="{dur}" timescale="1">'
+            f'<Initialization sourceURL="/seg/{name}/init.mp4?size=1024"/>{urls}</SegmentList>'
+            "</Representation></AdaptationSet></Period></MPD>"
+        )
+
+    def _text(self, body: str, ctype: str, head: bool):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def _body_sized(self, size: int, ctype: str, head: bool):
+        start, end = 0, size - 1
+        m = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range") or "")
+        if m and (m.group(1) or m.group(2)):
+            if m.group(1):
+                start = int(m.group(1))
+                end = min(end, int(m.group(2))) if m.group(2) else end
+            else:
+                start = max(0, size - int(m.group(2)))
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        n = end - start + 1
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(n))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        if head:
+            return
+
+        rate = self.mock.bandwidth
+        t0 = time.monotonic()
+        sent = 0
+        try:
+            while sent < n:
+                k = min(CHUNK, n - sent)
+                self.wfile.write(_PAYLOAD[:k])
+                sent += k
+                self.mock.sent += k
+                if rate:
+                    ahead = sent / rate - (time.monotonic() - t0)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class MockServer:
+    # 127.0.0.1 üzerinde rastgele portta; `with MockServer(...) as srv:` ya da start()/stop()
+
+    def __init__(self, latency: float = 0.0, bandwidth: int = 0):
+        self.latency = latency  # istek başına sn
+        self.bandwidth = bandwidth  # bağlantı başına bayt/sn (0 = sınırsız)
+        self.requests = 0
+        self.connections = 0  # açılan TCP bağlantıları (keep-alive ne kadar işe yarıyor)
+        self.sent = 0
+        handler = type("Handler", (_MockHandler,), {"mock": self})
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def media(self, name: str, size: int, ext: str = "mp4") -> str:
+        return f"{self.url}/media/{name}.{ext}?size={size}"
+
+    def hls(self, name: str, segments: int, seg: int) -> str:
+        return f"{self.url}/hls/{name}.m3u8?segments={segments}&seg={seg}"
+
+    def dash(self, name: str, segments: int, seg: int) -> str:
+        return f"{self.url}/dash/{name}.mpd?segments={segments}&seg={seg}"
+
+    def playlist(self, n: int, page: int = 100, delay: float = 0.0, size: int = 1024 * 1024) -> str:
+        # sahte extractor URL'si; girdiler bu sunucudaki medya dosyalarına işaret eder
+        return f"bench://playlist/{n}?page={page}&delay={delay:g}&size={size}&media={self.url}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ----------------------------
+# Stub extractor (bench://playlist/N)
+# ----------------------------
+
+_ie_lock = threading.Lock()
+
+
+def install_extractor():
+    # yt-dlp'nin extractor listesinin başına eklenir (Generic her URL'yi kabul eder)
+    from core import ydl_module
+
+    ydl_module()
+    from yt_dlp.extractor import import_extractors
+    from yt_dlp.extractor.common import InfoExtractor
+    from yt_dlp.globals import extractors
+
+    with _ie_lock:
+        import_extractors()
+        if "BenchPlaylistIE" in extractors.value:
+            return
+
+        class BenchPlaylistIE(InfoExtractor):
+            IE_NAME = "bench:playlist"
+            _VALID_URL = r"bench://playlist/(?P<id>\d+)"
+
+            def _real_extract(self, url):
+                n = int(self._match_id(url))
+                _, q = _query(url)
+                page = max(1, _int(q, "page", 100))
+                size = _int(q, "size", 1024 * 1024)
+                delay = float(q.get("delay") or 0)
+                media = q.get("media") or "http://127.0.0.1:9"
+
+                def entries():
+                    # flat playlist gibi: sayfa başına bir ağ gecikmesi
+                    for i in range(n):
+                        if delay and i % page == 0:
+                            time.sleep(delay)
+                        vid = f"bench{i:06d}"
+                        yield {
+                            "_type": "url",
+                            "ie_key": "Generic",
+                            "id": vid,
+                            "url": f"{media}/media/{vid}.mp4?size={size}",
+                            "title": f"Bench video {i}",
+                            "duration": 60 + i % 600,
+                            "channel": "bench",
+                        }
+
+                return self.playlist_result(entries(), f"bench{n}", f"Bench playlist ({n})")
+
+        extractors.value = {"BenchPlaylistIE": BenchPlaylistIE, **extractors.value}
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024  # macOS bayt, Linux KB
+
+
+def _qt_app():
+    # ekran yoksa offscreen (sunucu / CI)
+    if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def _workers() -> Tuple[Any, Any]:
+    # GUI worker'ları (PyQt6 yoksa None: aynı Qt-free yol doğrudan ölçülür)
+    try:
+        _qt_app()
+        from main import AnalyzeWorker, DownloadWorker
+    except ImportError:
+        return None, None
+    return AnalyzeWorker, DownloadWorker
+
+
+def _round(v: float, nd: int = 2) -> float:
+    return round(v, nd)
+
+
+# ----------------------------
+# Benchmarks
+# ----------------------------
+
+def bench_analyze(srv: MockServer, entries: int, page: int = 100, delay: float = 0.02) -> Dict[str, Any]:
+    from core import batched, iter_entries
+
+    install_extractor()
+    url = srv.playlist(entries, page=page, delay=delay)
+    AnalyzeWorker, _ = _workers()
+
+    got = {"n": 0, "first": 0.0}
+    t0 = time.perf_counter()
+
+    def on_batch(batch: list):
+        if not got["n"]:
+            got["first"] = time.perf_counter() - t0
+        got["n"] += len(batch)
+
+    if AnalyzeWorker is not None:
+        w = AnalyzeWorker([url])
+        w.sig_batch.connect(on_batch)  # aynı thread: doğrudan çağrı
+        errors: List[str] = []
+        w.sig_error.connect(errors.append)
+        w.sig_source_error.connect(lambda u, msg: errors.append(f"{u}: {msg}"))
+        w.run()
+        if errors:
+            raise RuntimeError(errors[0])
+        via = "AnalyzeWorker"
+    else:
+        for batch in batched(iter_entries(url), size=LIST_BATCH, interval=0.2):
+            on_batch(batch)
+        via = "core.iter_entries"
+    total = time.perf_counter() - t0
+    return {
+        "via": via,
+        "entries": got["n"],
+        "page_delay_ms": _round(delay * 1000, 1),
+        "first_entry_ms": _round(got["first"] * 1000, 1),
+        "total_s": _round(total, 3),
+        "entries_per_s": _round(got["n"] / total if total else 0, 1),
+    }
+
+
+def _download(urls: List[str], jobs: int, fmt: str = "MP4", q: str = "1080p") -> Tuple[int, float, int]:
+    # (bayt, sn, hata sayısı) — DownloadWorker (varsa) ya da DownloadBatch
+    from batch import DownloadBatch
+    from core import DownloadScheduler, QueueItem
+    from progress import ProgressTracker
+
+    _, DownloadWorker = _workers()
+    out = tempfile.mkdtemp(prefix="media-dl-bench-")
+    sched = DownloadScheduler(max_jobs=jobs, per_host=jobs, transcode_jobs=1)
+    try:
+        items = [QueueItem(f"b{i}", u) for i, u in enumerate(urls)]
+        batch = DownloadBatch(items, out, fmt, q, "auto", None, sched, ProgressTracker())
+        # yt-dlp'nin konsol ilerleme çubuğu ölçüme karışmasın (GUI'de konsol yok)
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+            t0 = time.perf_counter()
+            if DownloadWorker is not None:
+                DownloadWorker(batch).run()
+            else:
+                batch.run()
+            dt = time.perf_counter() - t0
+        size = sum(
+            os.path.getsize(os.path.join(root, f))
+            for root, _, files in os.walk(out) for f in files
+        )
+        return size, dt, len(batch.errors)
+    finally:
+        sched.shutdown()
+        shutil.rmtree(out, ignore_errors=True)
+
+
+def _rate(size: int, dt: float, errors: int) -> Dict[str, Any]:
+    return {
+        "mb": _round(size / 1024 ** 2),
+        "seconds": _round(dt, 3),
+        "mb_s": _round(size / 1024 ** 2 / dt if dt else 0),
+        "errors": errors,
+    }
+
+
+def bench_download(srv: MockServer, files: int, size: int, jobs: int, segments: int = 32) -> Dict[str, Any]:
+    seg = max(1, size // segments)
+    res = {"files": files, "file_mb": _round(size / 1024 ** 2), "jobs": jobs}
+
+    def run(urls: List[str]) -> Dict[str, Any]:
+        req0, conn0 = srv.requests, srv.connections
+        r = _rate(*_download(urls, jobs))
+        r["requests"] = srv.requests - req0
+        r["connections"] = srv.connections - conn0
+        return r
+
+    res["http"] = run([srv.media(f"h{i}", size) for i in range(files)])
+    res["hls"] = run([srv.hls(f"s{i}", segments, seg) for i in range(files)])
+    res["dash"] = run([srv.dash(f"d{i}", segments, seg) for i in range(files)])
+    return res
+
+
+def bench_scale(srv: MockServer, files: int, size: int, levels: List[int]) -> Dict[str, Any]:
+    # bağlantı başına bant genişliği sınırlıyken paralellik ne kadar ölçekleniyor
+    files = max([files] + levels)  # en yüksek seviyede de her işe bir dosya düşsün
+    res: Dict[str, Any] = {
+        "files": files, "file_mb": _round(size / 1024 ** 2),
+        "per_connection": format_rate(srv.bandwidth), "latency_ms": _round(srv.latency * 1000, 1),
+    }
+    base = 0.0
+    for n in levels:
+        size_b, dt, errors = _download([srv.media(f"c{n}_{i}", size) for i in range(files)], n)
+        r = _rate(size_b, dt, errors)
+        base = base or r["mb_s"] / n
+        r["efficiency"] = _round(r["mb_s"] / (n * base) if base else 0)
+        res[f"jobs_{n}"] = r
+    return res
+
+
+def bench_list(entries: int) -> Dict[str, Any]:
+    # AnalyzeWorker partileri gibi 50'şer ekle, her partiden sonra olayları işle
+    app = _qt_app()
+    from PyQt6.QtCore import QSize
+    from PyQt6.QtWidgets import QListView
+
+    from playlist_model import PlaylistDelegate, PlaylistModel
+    from ui import MediaDownloaderUI
+
+    win = MediaDownloaderUI()
+    model = PlaylistModel(win)
+    view = win.playlist_list
+    view.setModel(model)
+    view.setItemDelegate(PlaylistDelegate(view))
+    view.setSelectionMode(QListView.SelectionMode.NoSelection)
+    view.setIconSize(QSize(96, 96))
+    win.show()
+    app.processEvents()
+
+    rows = [
+        {"id": f"bench{i:06d}", "url": f"http://127.0.0.1:9/media/bench{i:06d}.mp4",
+         "title": f"Bench video {i}", "duration": 60 + i % 600, "channel": "bench"}
+        for i in range(entries)
+    ]
+    rss0 = rss_mb()
+    stalls: List[float] = []
+    t0 = time.perf_counter()
+    for i in range(0, entries, LIST_BATCH):
+        t = time.perf_counter()
+        model.append_entries(rows[i:i + LIST_BATCH])
+        app.processEvents()
+        stalls.append(time.perf_counter() - t)
+    total = time.perf_counter() - t0
+
+    t = time.perf_counter()
+    model.set_filter("video 99")
+    app.processEvents()
+    filt = time.perf_counter() - t
+
+    res = {
+        "entries": model.source_count(),
+        "total_ms": _round(total * 1000, 1),
+        "max_stall_ms": _round(max(stalls) * 1000, 2),
+        "p95_stall_ms": _round(sorted(stalls)[int(len(stalls) * 0.95)] * 1000, 2),
+        "filter_ms": _round(filt * 1000, 2),
+        "rss_delta_mb": _round(rss_mb() - rss0),
+    }
+    win.close()
+    win.deleteLater()
+    app.processEvents()
+    return res
+
+
+# ----------------------------
+# Results
+# ----------------------------
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def _meta(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        from core import ydl_module
+        ytdlp = ydl_module().version.__version__
+    except Exception:
+        ytdlp = ""
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count() or 1,
+        "yt_dlp": ytdlp,
+        "params": {
+            "entries": args.entries, "files": args.files, "size": args.size,
+            "jobs": args.jobs, "scale": args.scale,
+            "latency_ms": args.latency, "bandwidth": args.bandwidth,
+        },
+    }
+
+
+def _flat(d: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for k, v in d.items():
+        if isinstance(v, dict):
+            out.update(_flat(v, f"{prefix}{k}."))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[f"{prefix}{k}"] = float(v)
+    return out
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    a, b = _flat(old.get("results") or {}), _flat(new.get("results") or {})
+    head = f"{old.get('meta', {}).get('commit') or 'old'} -> {new.get('meta', {}).get('commit') or 'new'}"
+    lines = [head]
+    for key in sorted(set(a) | set(b)):
+        if key not in a or key not in b:
+            lines.append(f"  {key:40s} {a.get(key, '-')!s:>12} -> {b.get(key, '-')!s:>12}")
+            continue
+        pct = (b[key] - a[key]) / a[key] * 100 if a[key] else 0.0
+        lines.append(f"  {key:40s} {a[key]:12g} -> {b[key]:12g}  {pct:+7.1f}%")
+    return lines
+
+
+def print_results(results: Dict[str, Any]):
+    for name, res in results.items():
+        print(f"{name}:", file=sys.stderr)
+        for key, v in _flat(res).items():
+            print(f"  {key:32s} {v:g}", file=sys.stderr)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    names = args.benches or list(BENCHES)
+    size = int(args.size * 1024 ** 2)
+    results: Dict[str, Any] = {}
+
+    def record(name: str, fn: Callable[[], Dict[str, Any]]):
+        if name not in names:
+            return
+        if not args.quiet:
+            print(f"... {name}", file=sys.stderr, flush=True)
+        try:
+            res = fn()
+        except Exception as ex:
+            res = {"error": str(ex)}
+        res["rss_mb"] = _round(rss_mb())
+        res["peak_rss_mb"] = _round(peak_rss_mb())
+        results[name] = res
+
+    with MockServer(args.latency / 1000, parse_rate(args.bandwidth)) as srv:
+        record("analyze", lambda: bench_analyze(srv, args.entries))
+        record("download", lambda: bench_download(srv, args.files, size, args.jobs))
+    # ölçekleme: bağlantı başına sınır + gecikme olmadan paralellik bir şey kazandırmaz
+    with MockServer(max(args.latency, 20) / 1000, parse_rate(args.scale_bandwidth)) as srv:
+        record("scale", lambda: bench_scale(
+            srv, args.files, size, [int(n) for n in args.scale.split(",") if n.strip()],
+        ))
+    record("list", lambda: bench_list(args.entries))
+    return {"meta": _meta(args), "results": results}
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="bench", description="media-downloader benchmarks (local mock server)")
+    ap.add_argument("benches", nargs="*", metavar="BENCH", help=f"{', '.join(BENCHES)} (varsayılan: hepsi)")
+    ap.add_argument("--out", help="sonuçları JSON olarak yaz")
+    ap.add_argument("--compare", nargs="+", metavar="JSON", help="eski sonuç (ve isteğe bağlı yeni sonuç) dosyası")
+    ap.add_argument("--entries", type=int, default=10000, help="playlist / liste girdi sayısı")
+    ap.add_argument("--files", type=int, default=8, help="indirme ölçümünde dosya sayısı")
+    ap.add_argument("--size", type=float, default=8, help="dosya boyutu (MB)")
+    ap.add_argument("--jobs", type=int, default=4, help="indirme ölçümünde eşzamanlı iş")
+    ap.add_argument("--scale", default="1,2,4,8", help="ölçekleme ölçümünde iş sayıları")
+    ap.add_argument("--latency", type=float, default=0.0, help="istek başına gecikme (ms)")
+    ap.add_argument("--bandwidth", default="0", help="bağlantı başına hız, ör. 2M (0 = sınırsız)")
+    ap.add_argument("--scale-bandwidth", default="4M", help="ölçekleme ölçümünde bağlantı başına hız")
+    ap.add_argument("--serve", action="store_true", help="sadece sahte sunucuyu çalıştır")
+    ap.add_argument("-q", "--quiet", action="store_true")
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    unknown = [b for b in args.benches if b not in BENCHES]
+    if unknown:
+        ap.error(f"unknown benchmark: {', '.join(unknown)} (choose from {', '.join(BENCHES)})")
+    try:
+        parse_rate(args.bandwidth)
+        parse_rate(args.scale_bandwidth)
+    except ValueError as ex:
+        print(f"bench: {ex}", file=sys.stderr)
+        return 2
+
+    if args.serve:
+        with MockServer(args.latency / 1000, parse_rate(args.bandwidth)) as srv:
+            print(f"mock server: {srv.url}", file=sys.stderr)
+            print(f"  {srv.media('demo', 8 * 1024 ** 2)}", file=sys.stderr)
+            print(f"  {srv.hls('demo', 20, 256 * 1024)}", file=sys.stderr)
+            print(f"  {srv.dash('demo', 20, 256 * 1024)}", file=sys.stderr)
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                return 0
+
+    if args.compare and len(args.compare) >= 2:
+        for line in compare(_load(args.compare[0]), _load(args.compare[1])):
+            print(line)
+        return 0
+
+    report = run(args)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    if not args.quiet:
+        print_results(report["results"])
+    if args.compare:
+        for line in compare(_load(args.compare[0]), report):
+            print(line)
+    return 1 if any("error" in r for r in report["results"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+# Başsız (headless) mod — PyQt6 import edilmez.
+#   python -m cli download --format MP3 --quality 320 URL...
+#   python -m cli enqueue  --format MP4 --quality 1080p URL...
+#   python -m cli download -a links.txt      # .txt / .csv, "-" => stdin
+#   python -m cli daemon   # kuyruktaki partileri sırayla indirir
+#   python -m cli serve    # yerel HTTP/JSON iş API'si (api.py)
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from typing import List, Optional
+
+from core import (
+    expand_urls, parse_urls, read_url_file,
+    DownloadScheduler, QueueItem, AUDIO_FORMATS, VIDEO_FORMATS,
+    DEFAULT_JOBS, FRAGMENTS_AUTO, FRAGMENT_LEVELS,
+)
+import metrics
+from bandwidth import parse_rate, parse_schedule
+from batch import DownloadBatch
+from api import ApiServer, API_HOST, api_port
+from progress import ProgressTracker, Aggregate, human_mb, human_speed, human_eta
+from store import DownloadIndex, QueueStore
+
+
+STATUS_INTERVAL = 1.0
+DAEMON_POLL = 5.0
+RC_CRASHED = 2  # batch.run() istisna fırlattı (öğe hatası değil)
+
+
+def log(msg: str):
+    print(msg, file=sys.stderr, flush=True)
+
+
+def source_urls(args) -> List[str]:
+    # komut satırı + -a dosyaları (tekrarlar atılır)
+    urls = list(args.urls)
+    for path in args.batch_file or ():
+        try:
+            urls += parse_urls(sys.stdin.read()) if path == "-" else read_url_file(path)
+        except OSError as ex:
+            log(f"! {path}: {ex}")
+    return list(dict.fromkeys(urls))
+
+
+def expand(args) -> List[QueueItem]:
+    urls = source_urls(args)
+    if not urls:
+        log("no URLs (give URL... or -a FILE)")
+        return []
+    if len(urls) > 1:
+        log(f"analyzing {len(urls)} URLs")
+    items = expand_urls(urls, on_error=lambda url, ex: log(f"! {url}: {ex}"), jobs=args.analyze_jobs)
+    log(f"+ {len(items)} items")
+    return items
+
+
+def fmt_aggregate(a: Aggregate) -> str:
+    pct = a.percent
+    return (
+        f"[{pct if pct is not None else '?'}%] {a.done}/{a.items}"
+        f"  err {a.failed}" + (f"  retry {a.retrying}" if a.retrying else "") + f"  {human_mb(a.done_b)}"
+        f"  {human_speed(a.speed)}  ETA {human_eta(a.eta)}"
+    )
+
+
+def run_batch(batch: DownloadBatch, quiet: bool = False) -> int:
+    # batch.run() ayrı thread'de; ana thread durum yazar ve sinyalleri yakalar
+    crash: List[BaseException] = []
+
+    def run():
+        try:
+            batch.run()
+        except Exception as ex:
+            crash.append(ex)
+
+    t = threading.Thread(target=run, name="batch", daemon=True)
+    t.start()
+    try:
+        while t.is_alive():
+            t.join(STATUS_INTERVAL)
+            if not quiet:
+                log(fmt_aggregate(batch.tracker.aggregate()))
+    except KeyboardInterrupt:
+        log("stopping…")
+        batch.stop()
+        t.join()
+
+    if crash:
+        log(f"! batch failed: {crash[0]!r}")
+        return RC_CRASHED
+
+    a = batch.tracker.aggregate()
+    r = batch.report()
+    log(f"done: {a.done}/{a.items}  skipped {len(batch.skipped)}  err {a.failed}  retried {r.retried}"
+        f"  {human_mb(a.done_b)}  Ø {human_speed(a.avg_speed)}")
+    for kind, jobs in sorted(r.failed.items()):
+        log(f"{kind}: {len(jobs)}")
+        for job in jobs:
+            log(f"! [{kind}] {job.url}: {job.error}")
+    if batch.stopped:
+        return 130
+    return 1 if batch.errors else 0
+
+
+def new_scheduler(args) -> DownloadScheduler:
+    if args.trace:
+        metrics.open_trace(args.trace)
+    scheduler = DownloadScheduler(max_jobs=args.jobs, transcode_jobs=args.convert_jobs)
+    if args.retries is not None:
+        scheduler.retry.attempts = max(0, args.retries)
+    # env (MEDIA_DL_RATE_LIMIT / MEDIA_DL_BW_SCHEDULE) yerine komut satırı
+    if args.limit_rate is not None:
+        scheduler.limiter.set_rate(args.limit_rate)
+    if args.bw_schedule is not None:
+        scheduler.limiter.set_schedule(args.bw_schedule)
+    return scheduler
+
+
+def _new_batch(
+    args, items: List[QueueItem], scheduler: DownloadScheduler,
+    out_dir: str, fmt_text: str, q_text: str, frag_mode: str, **kw,
+) -> DownloadBatch:
+    return DownloadBatch(
+        items=items,
+        out_dir=out_dir,
+        fmt_text=fmt_text,
+        q_text=q_text,
+        frag_mode=frag_mode,
+        ffmpeg_bin=args.ffmpeg,
+        scheduler=scheduler,
+        tracker=ProgressTracker(),
+        index=None if args.no_index else DownloadIndex(),
+        priority=getattr(args, "priority", 0),
+        **kw,
+    )
+
+
+# ----------------------------
+# Commands
+# ----------------------------
+
+def cmd_download(args) -> int:
+    items = expand(args)
+    if not items:
+        log("nothing to download")
+        return 1
+    scheduler = new_scheduler(args)
+    try:
+        return run_batch(
+            _new_batch(args, items, scheduler, args.out, args.format, args.quality, args.fragments),
+            quiet=args.quiet,
+        )
+    finally:
+        scheduler.shutdown()
+
+
+def cmd_enqueue(args) -> int:
+    items = expand(args)
+    if not items:
+        log("nothing to enqueue")
+        return 1
+    bid = QueueStore().create_batch(items, args.out, args.format, args.quality, args.fragments)
+    log(f"batch {bid}: {len(items)} items")
+    return 0
+
+
+def cmd_daemon(args) -> int:
+    # kapanmamış partileri eskiden yeniye işler; SIGTERM => bitir, kuyruğu açık bırak
+    store = QueueStore()
+    scheduler = new_scheduler(args)
+    current: List[Optional[DownloadBatch]] = [None]
+    quit_ = threading.Event()
+
+    def on_term(*_):
+        quit_.set()
+        if current[0]:
+            current[0].abandon()
+
+    signal.signal(signal.SIGTERM, on_term)
+    log(f"daemon: {store.path}")
+    try:
+        while not quit_.is_set():
+            batches = store.open_batches()
+            if not batches:
+                if args.once:
+                    break
+                quit_.wait(DAEMON_POLL)
+                continue
+
+            b = batches[-1]  # en eski
+            log(f"batch {b.id}: {len(b.items)} items -> {b.out_dir}")
+            batch = _new_batch(
+                args, b.items, scheduler,
+                out_dir=b.out_dir, fmt_text=b.fmt, q_text=b.quality, frag_mode=b.frag_mode,
+                queue_store=store, batch_id=b.id,
+            )
+            current[0] = batch
+            rc = run_batch(batch, quiet=args.quiet)
+            current[0] = None
+            if rc == 130 and not quit_.is_set():
+                # Ctrl+C: kullanıcı durdurdu
+                break
+            if rc == RC_CRASHED:
+                # aynı partiyi sıkı döngüde tekrar tekrar deneme: hatalı işaretle, bekle
+                store.fail_batch(b.id, "batch failed (see daemon log)")
+                quit_.wait(DAEMON_POLL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.shutdown()
+    return 0
+
+
+def cmd_serve(args) -> int:
+    scheduler = new_scheduler(args)
+    try:
+        server = ApiServer(
+            scheduler,
+            out_dir=lambda: args.out,
+            ffmpeg_bin=lambda: args.ffmpeg,
+            index=None if args.no_index else DownloadIndex(),
+            host=args.host,
+            port=args.port,
+        ).start()
+    except (OSError, ValueError) as ex:
+        log(f"api: {ex}")
+        scheduler.shutdown()
+        return 2
+    host, port = server.address
+    log(f"api: http://{host}:{port}/jobs")
+
+    done = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: done.set())
+    try:
+        done.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        scheduler.shutdown()
+    return 0
+
+
+# ----------------------------
+# Args
+# ----------------------------
+
+def _add_format_args(p: argparse.ArgumentParser):
+    p.add_argument("--format", default="MP4", type=str.upper, choices=AUDIO_FORMATS + VIDEO_FORMATS)
+    p.add_argument("--quality", default="", help="ör. 320, 192 (ses) / 1080p, 720p, En iyi (video)")
+    p.add_argument("--out", default=os.getcwd())
+    p.add_argument(
+        "--fragments", default=FRAGMENTS_AUTO,
+        choices=[FRAGMENTS_AUTO] + [str(n) for n in FRAGMENT_LEVELS],
+    )
+
+
+def _add_source_args(p: argparse.ArgumentParser):
+    p.add_argument("-a", "--batch-file", action="append", help="bağlantı listesi (.txt / .csv, satır başına ya da hücrelerde); - => stdin")
+    p.add_argument("--analyze-jobs", type=int, default=None, help="aynı anda analiz edilen URL (varsayılan: MEDIA_DL_ANALYZE_JOBS ya da 4)")
+    p.add_argument("urls", nargs="*")
+
+
+def _add_run_args(p: argparse.ArgumentParser):
+    p.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    p.add_argument("--limit-rate", type=parse_rate, default=None, help="toplam hız sınırı, ör. 2M, 500K (0 = sınırsız)")
+    p.add_argument("--bw-schedule", type=parse_schedule, default=None, help='saate göre sınır, ör. "07:00-22:00=2M,22:00-07:00=0"')
+    p.add_argument("--convert-jobs", type=int, default=None, help="eşzamanlı ffmpeg (varsayılan: çekirdek sayısı)")
+    p.add_argument("--ffmpeg", default=None, help="ffmpeg'in bulunduğu dizin")
+    p.add_argument("--retries", type=int, default=None, help="geçici hatada öğe başına yeniden deneme (varsayılan: MEDIA_DL_RETRIES ya da 4)")
+    p.add_argument("--no-index", action="store_true", help="indirilmişleri atlama")
+    p.add_argument("--trace", default=None, help="aşama süreleri ve öğe özetleri için JSONL dosyası (MEDIA_DL_TRACE)")
+    p.add_argument("-q", "--quiet", action="store_true")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="media-downloader", description="Headless media downloader")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("download", help="indir ve çık")
+    _add_format_args(p)
+    _add_run_args(p)
+    p.add_argument("--priority", type=int, default=0, help="yüksek => bant genişliğini önce alır")
+    _add_source_args(p)
+    p.set_defaults(func=cmd_download)
+
+    p = sub.add_parser("enqueue", help="kuyruğa ekle (daemon indirir)")
+    _add_format_args(p)
+    _add_source_args(p)
+    p.set_defaults(func=cmd_enqueue)
+
+    p = sub.add_parser("daemon", help="kuyruğu sürekli işle")
+    _add_run_args(p)
+    p.add_argument("--once", action="store_true", help="kuyruk boşalınca çık")
+    p.set_defaults(func=cmd_daemon)
+
+    p = sub.add_parser("serve", help="yerel HTTP/JSON API")
+    _add_run_args(p)
+    p.add_argument("--out", default=os.getcwd(), help="indirme kökü; istekteki 'out' bunun altında olmalı")
+    p.add_argument("--host", default=API_HOST)
+    p.add_argument("--port", type=int, default=api_port())
+    p.set_defaults(func=cmd_serve)
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1135 @@
+from __future__ import annotations
+
+import itertools
+import os
+import queue
+import re
+import socket
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import metrics
+from bandwidth import BandwidthLimiter, LIMIT_BLOCK
+from formats import format_selector, target_for
+from retry import RetryPolicy, classify
+from transcode import TranscodePool
+
+
+# ----------------------------
+# yt-dlp (lazy)
+# ----------------------------
+# yt_dlp import'u ve extractor kaydı ~200 ms; pencere açılmadan önce değil,
+# ilk ihtiyaçta (ya da warm_up ile arka planda) yüklenir.
+
+_ydl_lock = threading.Lock()
+_ydl_mod: Any = None
+_warm_thread: Optional[threading.Thread] = None
+
+
+def ydl_module() -> Any:
+    global _ydl_mod
+    if _ydl_mod is None:
+        with _ydl_lock:
+            if _ydl_mod is None:
+                import yt_dlp
+                import netpool
+                netpool.install_ydl_handler()  # bütün YoutubeDL'ler ortak bağlantı havuzu
+                _ydl_mod = yt_dlp
+    return _ydl_mod
+
+
+def warm_up():
+    # modül + extractor sınıfları (ilk analizde tekrar beklenmesin)
+    ydl_module()
+    try:
+        from yt_dlp.extractor import gen_extractor_classes
+        gen_extractor_classes()
+    except Exception:
+        pass
+
+
+def warm_up_async() -> threading.Thread:
+    global _warm_thread
+    with _ydl_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(target=warm_up, name="ydl-warmup", daemon=True)
+            _warm_thread.start()
+        return _warm_thread
+
+
+# ----------------------------
+# Analysis (Qt-free)
+# ----------------------------
+
+ANALYZE_OPTS: Dict[str, Any] = {
+    "quiet": True,
+    "no_warnings": True,
+    "extract_flat": "in_playlist",
+    "skip_download": True,
+}
+
+_MAX_REDIRECTS = 5
+_PAGE = 50
+ANALYZE_JOBS = 4  # çok URL'de aynı anda analiz edilen kaynak (MEDIA_DL_ANALYZE_JOBS)
+
+# yapıştırılan metin / .txt / .csv içindeki bağlantılar
+_URL_RE = re.compile(r"https?://[^\s,;\"'<>]+", re.I)
+
+
+def _fix_entry(e: Dict[str, Any]) -> Dict[str, Any]:
+    if not e.get("webpage_url"):
+        u = e.get("url")
+        if isinstance(u, str) and u.startswith("http"):
+            e["webpage_url"] = u
+    return e
+
+
+def _iter_lazy(entries: Any) -> Iterator[Any]:
+    # yt-dlp girdileri list / generator / LazyList / PagedList olabilir
+    if hasattr(entries, "getslice"):
+        start = 0
+        while True:
+            page = entries.getslice(start, start + _PAGE)
+            if not page:
+                return
+            yield from page
+            if len(page) < _PAGE:
+                return
+            start += _PAGE
+    else:
+        yield from entries
+
+
+def entry_url(e: Dict[str, Any]) -> str:
+    # "" => indirirken kullanıcının girdiği ana URL kullanılır
+    u = e.get("webpage_url")
+    if isinstance(u, str) and u.startswith("http"):
+        return u
+
+    u2 = e.get("url")
+    if isinstance(u2, str):
+        if u2.startswith("http"):
+            return u2
+        if re.fullmatch(r"[A-Za-z0-9_-]{8,}", u2):
+            return f"https://www.youtube.com/watch?v={u2}"
+    return ""
+
+
+def entry_extractor(e: Dict[str, Any]) -> str:
+    return str(e.get("extractor_key") or e.get("ie_key") or "")
+
+
+def fmt_duration(e: Dict[str, Any]) -> str:
+    dur = e.get("duration_string") or e.get("duration") or "?"
+    if isinstance(dur, (int, float)):
+        dur = f"{int(dur)}s"
+    return str(dur)
+
+
+def entry_thumb(e: Dict[str, Any]) -> str:
+    t = e.get("thumbnail")
+    if isinstance(t, str) and t:
+        return t
+    # flat playlist girdilerinde sadece "thumbnails" listesi olabiliyor
+    thumbs = e.get("thumbnails")
+    if isinstance(thumbs, list):
+        for th in reversed(thumbs):
+            u = th.get("url") if isinstance(th, dict) else None
+            if isinstance(u, str) and u:
+                return u
+    return ""
+
+
+# PlaylistModel'in kolonları (ve analiz önbelleğinin saklama biçimi)
+ROW_COLUMNS = ("titles", "durations", "urls", "ids", "thumbs", "extractors", "channels", "seconds")
+
+
+def entry_row(e: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        str(e.get("title") or "Unknown").strip(),
+        fmt_duration(e),
+        entry_url(e),
+        str(e.get("id") or ""),
+        entry_thumb(e),
+        entry_extractor(e),
+        str(e.get("channel") or e.get("uploader") or "").strip(),
+        entry_seconds(e),
+    )
+
+
+def entry_seconds(e: Dict[str, Any]) -> int:
+    d = e.get("duration")
+    return int(d) if isinstance(d, (int, float)) else 0
+
+
+def entry_key(e: Dict[str, Any]) -> str:
+    # PlaylistModel.row_key ile aynı (id, yoksa url)
+    return str(e.get("id") or "") or entry_url(e)
+
+
+def entry_dedup_key(e: Dict[str, Any]) -> str:
+    # kaynaklar arası tekilleştirme: aynı extractor + id => aynı içerik
+    # (generic'te id dosya adından gelir, farklı sitelerde çakışır => URL)
+    vid = str(e.get("id") or "")
+    ext = entry_extractor(e).lower()
+    if vid and ext not in ("", "generic"):
+        return f"{ext}:{vid}"
+    return entry_url(e) or vid
+
+
+def parse_urls(text: str) -> List[str]:
+    # satır satır, boşluk/virgülle ayrılmış ya da CSV hücrelerindeki bağlantılar;
+    # "#" ile başlayan satırlar yorum, tekrarlar atılır (sıra korunur)
+    found: List[str] = []
+    for line in (text or "").splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        found.extend(u.rstrip(").]") for u in _URL_RE.findall(line))
+    return list(dict.fromkeys(found))
+
+
+def read_url_file(path: str, max_bytes: int = 16 << 20) -> List[str]:
+    # yanlışlıkla bırakılan büyük (ör. video) dosyada tamamı okunmasın
+    with open(os.path.expanduser(path), encoding="utf-8-sig", errors="replace") as f:
+        return parse_urls(f.read(max_bytes))
+
+
+def analyze_jobs() -> int:
+    try:
+        n = int(os.environ.get("MEDIA_DL_ANALYZE_JOBS") or 0)
+    except ValueError:
+        n = 0
+    return max(1, n or ANALYZE_JOBS)
+
+
+def iter_entries(
+    url: str,
+    should_stop: Optional[Callable[[], bool]] = None,
+    ydl_opts: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    # Playlist girdilerini yt-dlp'nin tembel generator'ından geldikçe üretir
+    # (process=False => liste tamamen çözülmeden ilk girdiler gelir).
+    # "analyze" aşaması: sadece extractor'da geçen süre (tüketicinin işi hariç)
+    busy = 0.0
+    n = 0
+    t: Optional[float] = time.perf_counter()
+    try:
+        for e in _iter_entries(url, should_stop, ydl_opts):
+            busy += time.perf_counter() - t
+            t = None
+            n += 1
+            yield e
+            t = time.perf_counter()
+    finally:
+        if t is not None:
+            busy += time.perf_counter() - t
+        metrics.record("analyze", busy, key=url, entries=n)
+
+
+def _iter_entries(
+    url: str,
+    should_stop: Optional[Callable[[], bool]],
+    ydl_opts: Optional[Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    opts = dict(ANALYZE_OPTS)
+    if ydl_opts:
+        opts.update(ydl_opts)
+
+    with ydl_module().YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+
+        # kanal -> sekme gibi yönlendirmeleri takip et
+        hops = 0
+        while (
+            isinstance(info, dict)
+            and info.get("_type") in ("url", "url_transparent")
+            and hops < _MAX_REDIRECTS
+        ):
+            hops += 1
+            info = ydl.extract_info(
+                info["url"], download=False, ie_key=info.get("ie_key"), process=False
+            )
+
+        if not isinstance(info, dict):
+            return
+
+        if info.get("_type") in ("playlist", "multi_video") or "entries" in info:
+            for e in _iter_lazy(info.get("entries") or []):
+                if should_stop and should_stop():
+                    return
+                if isinstance(e, dict):
+                    yield _fix_entry(e)
+            return
+
+        yield _fix_entry(info)
+
+
+def iter_many(
+    urls: Iterable[str],
+    should_stop: Optional[Callable[[], bool]] = None,
+    jobs: Optional[int] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    on_source: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+    fetch: Optional[Callable[..., Iterable[Dict[str, Any]]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    # Çok kaynaklı analiz: en fazla `jobs` URL aynı anda çözülür, girdiler
+    # kaynak sırasıyla tek akışta birleşir (önceki kaynak bitmeden sonrakinin
+    # girdileri tamponda bekler) ve extractor + id ile tekilleştirilir.
+    # Bir kaynağın hatası diğerlerini durdurmaz: on_error(url, ex).
+    # on_source(url, girdiler): başarıyla biten kaynağın tüm girdileri (önbellek için).
+    # fetch(url, should_stop=...): iter_entries yerine (ör. önbellekten okuma).
+    # Geri çağrılar tüketicinin thread'inde çalışır.
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+    q: "queue.Queue[Tuple[Any, ...]]" = queue.Queue()
+    order = iter(range(len(urls)))
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def stopped() -> bool:
+        return stop.is_set() or bool(should_stop and should_stop())
+
+    def work():
+        while not stopped():
+            with lock:
+                i = next(order, None)
+            if i is None:
+                return
+            got: List[Dict[str, Any]] = []
+            err: Optional[Exception] = None
+            try:
+                for e in (fetch or iter_entries)(urls[i], should_stop=stopped):
+                    if not entry_url(e):
+                        e["webpage_url"] = urls[i]  # tek kaynaklıdaki "ana URL" karşılığı
+                    got.append(e)
+                    q.put(("e", i, e))
+            except Exception as ex:
+                err = ex
+            q.put(("end", i, got, err))
+
+    for n in range(min(jobs or analyze_jobs(), len(urls))):
+        threading.Thread(target=work, name=f"analyze-{n}", daemon=True).start()
+
+    seen: Set[str] = set()
+    held: Dict[int, List[Dict[str, Any]]] = {}
+    ended: Set[int] = set()
+    cur = 0
+    try:
+        while cur < len(urls):
+            if stopped():
+                return
+            try:
+                ev = q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if ev[0] == "e":
+                _, i, e = ev
+                if i != cur:
+                    held.setdefault(i, []).append(e)
+                    continue
+                out = [e]
+            else:
+                _, i, got, err = ev
+                if err is not None:
+                    if on_error:
+                        on_error(urls[i], err)
+                elif on_source and not stopped():
+                    on_source(urls[i], got)
+                ended.add(i)
+                out = []
+            # sıradaki kaynak(lar) bittiyse bekleyen girdilerini aktar
+            while cur in ended:
+                cur += 1
+                out.extend(held.pop(cur, ()))
+            for e in out:
+                k = entry_dedup_key(e)
+                if k:
+                    if k in seen:
+                        continue
+                    seen.add(k)
+                yield e
+    finally:
+        stop.set()
+
+
+def expand_urls(
+    urls: Iterable[str],
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    jobs: Optional[int] = None,
+) -> List["QueueItem"]:
+    # playlist URL'lerini tek tek indirme öğelerine açar (kaynaklar paralel
+    # analiz edilir; aynı içerik iki kez eklenmez)
+    items: List[QueueItem] = []
+    seen = set()
+    for e in iter_many(urls, should_stop=should_stop, jobs=jobs, on_error=on_error):
+        vid = str(e.get("id") or "")
+        u = entry_url(e)
+        key = vid or u or f"#{len(items)}"
+        if key in seen:
+            continue
+        seen.add(key)
+        items.append(QueueItem(key, u, entry_extractor(e), vid, str(e.get("title") or "")))
+    return items
+
+
+_END = object()
+
+
+def batched(
+    it: Iterable[Dict[str, Any]],
+    size: int = 50,
+    interval: float = 0.2,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[list]:
+    # `size` girdi dolunca ya da `interval` sn geçince eldekileri parti olarak ver.
+    # Üretici ayrı thread'de döner; yt-dlp bir sonraki sayfayı beklerken de
+    # biriken girdiler bekletilmez. should_stop: takılı bir extractor'ı beklemeden
+    # en geç `interval` içinde dön (üretici kendi should_stop'unda biter).
+    q: "queue.Queue[Any]" = queue.Queue()
+
+    def produce():
+        try:
+            for e in it:
+                q.put(e)
+        except BaseException as ex:  # hata tüketici tarafında yeniden fırlatılır
+            q.put(ex)
+        q.put(_END)
+
+    threading.Thread(target=produce, name="analyze-producer", daemon=True).start()
+
+    buf: list = []
+    deadline = time.monotonic() + interval
+    while True:
+        try:
+            item = q.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            if should_stop and should_stop():
+                return
+            if buf:
+                yield buf
+                buf = []
+            deadline = time.monotonic() + interval
+            continue
+
+        if item is _END:
+            break
+        if isinstance(item, BaseException):
+            if buf:
+                yield buf
+            raise item
+
+        buf.append(item)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+            deadline = time.monotonic() + interval
+
+    if buf:
+        yield buf
+
+
+# ----------------------------
+# Format / yt-dlp options (Qt-free)
+# ----------------------------
+
+FRAGMENTS_AUTO = "auto"
+FRAGMENT_LEVELS = (1, 2, 4, 8, 16)
+
+AUDIO_FORMATS = ("MP3", "M4A", "OPUS", "WAV", "FLAC", "ORIGINAL")  # ORIGINAL => kaynak codec, yeniden kodlama yok
+VIDEO_FORMATS = ("MP4", "WEBM")
+OUTTMPL = "%(title)s [%(id)s].%(ext)s"  # id => aynı başlıklı videolar birbirinin üstüne yazmaz
+
+
+def build_format(fmt_text: str, q_text: str, frag_mode: str = "auto") -> Tuple[Any, List[dict], Dict[str, Any]]:
+    post: List[dict] = []
+    extra: Dict[str, Any] = {}
+
+    t = (fmt_text or "").upper().strip()
+    q = (q_text or "").strip()
+
+    # DASH/HLS parçalarını paralel indir ("auto" => FragmentTuner karar verir)
+    fm = (frag_mode or FRAGMENTS_AUTO).strip().lower()
+    extra["concurrent_fragment_downloads"] = int(fm) if fm.isdigit() else FRAGMENTS_AUTO
+
+    # ---- AUDIO ----
+    if t in AUDIO_FORMATS:
+        # hedefle aynı codec'teki ses akışı tercih edilir (formats.py) => dönüştürme
+        # aşaması yeniden kodlamaz, sadece kap değiştirir (transcode.py)
+        container, _ = target_for(t, q)
+        fmt = format_selector(container)
+
+        # "320 kbps" -> "320"; "Orijinal" -> "" (kaynağın bit hızı)
+        m = re.search(r"(\d+)", q)
+        if t == "MP3":
+            quality = m.group(1) if m else "320"  # üst sınır: kaynak daha düşükse onunla eşleşir
+        elif t in ("M4A", "OPUS"):
+            quality = m.group(1) if m else ""
+        else:  # WAV / FLAC / ORIGINAL
+            quality = "0"
+
+        post = [{
+            "key": "FFmpegExtractAudio",
+            "preferredcodec": "best" if t == "ORIGINAL" else t.lower(),
+            "preferredquality": quality,
+        }]
+        return fmt, post, extra
+
+    # ---- VIDEO ----
+    # sabit seçici yerine girdinin format listesinden seçim (formats.py):
+    # çözünürlük sınırı + yeniden kodlamadan kopyalanabilen codec (MP4: avc1+m4a, WEBM: vp9/av1+opus)
+    container, max_h = target_for(t if t in VIDEO_FORMATS else "MP4", q)
+    fmt = format_selector(container, max_h)
+
+    if t == "MP4":
+        extra["merge_output_format"] = "mp4"
+    elif t == "WEBM":
+        extra["merge_output_format"] = "webm"
+
+    return fmt, post, extra
+
+
+def build_ydl_opts(
+    out_dir: str,
+    fmt_text: str,
+    q_text: str,
+    frag_mode: str = "auto",
+    ffmpeg_bin: Optional[str] = None,
+) -> Dict[str, Any]:
+    fmt, post, extra = build_format(fmt_text, q_text, frag_mode)
+    opts: Dict[str, Any] = {
+        "format": fmt,
+        "outtmpl": os.path.join(out_dir, OUTTMPL),
+        "postprocessors": post,
+        "noplaylist": False,
+        "quiet": True,
+        "no_warnings": True,
+        "nocolor": True,
+        "continuedl": True,  # yarım .part dosyalarından devam
+    }
+    opts.update(extra)
+    if ffmpeg_bin:
+        opts["ffmpeg_location"] = ffmpeg_bin
+    return opts
+
+
+# ----------------------------
+# Download scheduler (Qt-free)
+# ----------------------------
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+PAUSED = "paused"  # iptal gibi durur ama .part dosyaları kalır; resume() ile kaldığı yerden
+
+DEFAULT_JOBS = 3
+PER_HOST_MAX = 4  # aynı site/extractor için aynı anda en fazla bu kadar iş (rate limit)
+
+_HOST_ALIASES = {
+    "youtu.be": "youtube.com",
+    "youtube-nocookie.com": "youtube.com",
+}
+
+
+def host_key(url: str) -> str:
+    try:
+        h = (urlsplit(url).hostname or "").lower()
+    except Exception:
+        return ""
+    for pfx in ("www.", "m.", "music.", "mobile."):
+        if h.startswith(pfx):
+            h = h[len(pfx):]
+            break
+    return _HOST_ALIASES.get(h, h)
+
+
+@dataclass
+class QueueItem:
+    key: str  # playlist öğesi kimliği (id, yoksa url)
+    url: str
+    extractor: str = ""
+    video_id: str = ""
+    title: str = ""
+
+
+class UserStop(Exception):
+    def __init__(self):
+        super().__init__("USER_STOP")
+
+
+_job_ids = itertools.count(1)
+
+
+@dataclass(eq=False)
+class DownloadJob:
+    url: str
+    opts: Dict[str, Any]
+    on_progress: Optional[Callable[["DownloadJob", Dict[str, Any]], None]] = None
+    on_finish: Optional[Callable[["DownloadJob"], None]] = None
+    on_retry: Optional[Callable[["DownloadJob"], None]] = None  # geçici hata: bekleyip kuyruğa döndü
+
+    id: int = field(default_factory=lambda: next(_job_ids))
+    key: str = ""  # playlist öğesi kimliği (ilerleme takibi için)
+    host: str = ""
+    fragments: int = 1
+    extractor: str = ""  # biliniyorsa analizden, yoksa indirme sonrası info_dict'ten
+    video_id: str = ""
+    priority: int = 0  # yüksek => önce başlar, bant genişliğini önce alır
+    path: str = ""  # son çıktı dosyası
+    acodec: str = ""  # indirilen ses akışı (dönüştürme planı için)
+    abr: float = 0.0
+    state: str = QUEUED
+    error: str = ""
+    error_kind: str = ""  # retry.TRANSIENT / PERMANENT / AUTH
+    attempts: int = 0  # yapılan yeniden deneme sayısı
+    not_before: float = 0.0  # monotonic; geri çekilme bitmeden başlamaz
+    timings: Dict[str, float] = field(default_factory=dict)  # aşama -> toplam sn (bütün denemeler)
+    bytes: int = 0  # ağdan okunan (bütün denemeler)
+    paused: bool = False
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    # iptalde hemen kesilecekler: açık HTTP yanıtları ve yt-dlp'nin bu iş için başlattığı alt süreçler
+    _conns: "weakref.WeakSet[Any]" = field(default_factory=weakref.WeakSet, repr=False)
+    _procs: "weakref.WeakSet[Any]" = field(default_factory=weakref.WeakSet, repr=False)
+    _io_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _phase: str = field(default="", repr=False)  # "extract" / "download": connect sadece indirmede sayılır
+    _queued_at: float = field(default=0.0, repr=False)
+
+    def __post_init__(self):
+        if not self.key:
+            self.key = self.url
+        if not self.host:
+            self.host = host_key(self.url)
+
+    def cancel(self):
+        self._cancel.set()
+        self.abort()
+
+    def pause(self):
+        self.paused = True
+        self.cancel()
+
+    def reset(self):
+        # duraklatılmış işi yeniden kuyruğa koymadan önce
+        self._cancel = threading.Event()
+        self.paused = False
+        self.error = ""
+        self.error_kind = ""
+        self.attempts = 0
+        self.not_before = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def stage(self, name: str, seconds: float, **attrs: Any):
+        with self._io_lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        metrics.record(name, seconds, key=self.key, job=self.id, **attrs)
+
+    def track(self, resp: Any):
+        with self._io_lock:
+            self._conns.add(resp)
+        if self.cancelled:
+            self.abort()  # iptal, yanıt kaydedilmeden hemen önce geldiyse
+
+    def track_proc(self, proc: Any):
+        with self._io_lock:
+            self._procs.add(proc)
+        if self.cancelled:
+            self.abort()  # iptal, süreç başlarken geldiyse
+
+    def abort(self):
+        # hook'un bir sonraki çağrısını beklemeden: takılı soket okumaları ve
+        # yt-dlp'nin başlattığı ffmpeg (birleştirme / fixup / ffmpeg indirici) hemen biter
+        with self._io_lock:
+            conns = list(self._conns)
+            procs = list(self._procs)
+        for resp in conns:
+            sock = socket_of(resp)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)  # recv() hemen döner; fd'yi kapatmak okuyan thread'in işi
+                except OSError:
+                    pass
+        for proc in procs:
+            try:
+                if proc.poll() is None:
+                    proc.kill()  # Windows: TerminateProcess
+            except OSError:
+                pass
+
+
+# ----------------------------
+# Fragment parallelism (DASH/HLS)
+# ----------------------------
+
+class FragmentTuner:
+    # "auto" modunda host başına eşzamanlı parça sayısını ölçülen hıza göre
+    # büyütüp küçültür (basit tepe tırmanma). yt-dlp sayıyı indirme başında
+    # sabitlediği için ayar bir sonraki öğede geçerli olur.
+
+    def __init__(self, start: int = 4):
+        self._lock = threading.Lock()
+        self._start = FRAGMENT_LEVELS.index(start) if start in FRAGMENT_LEVELS else 2
+        self._idx: Dict[str, int] = {}
+        self._rates: Dict[str, Dict[int, float]] = {}
+
+    def pick(self, host: str) -> int:
+        with self._lock:
+            return FRAGMENT_LEVELS[self._idx.setdefault(host, self._start)]
+
+    def report(self, host: str, n: int, rate: float):
+        if rate <= 0:
+            return
+        with self._lock:
+            idx = self._idx.setdefault(host, self._start)
+            rates = self._rates.setdefault(host, {})
+            old = rates.get(n)
+            rates[n] = rate if old is None else (old + rate) / 2  # yumuşatılmış
+
+            if n != FRAGMENT_LEVELS[idx]:
+                return  # eski ayarla başlamış bir işin raporu
+
+            cur = rates[n]
+            lower = rates.get(FRAGMENT_LEVELS[idx - 1]) if idx > 0 else None
+            higher = rates.get(FRAGMENT_LEVELS[idx + 1]) if idx + 1 < len(FRAGMENT_LEVELS) else None
+
+            if higher is not None and higher > cur * 1.05:
+                idx += 1
+            elif lower is not None and lower >= cur * 0.95:
+                idx -= 1  # daha fazla bağlantı kazandırmıyor
+            elif higher is None and idx + 1 < len(FRAGMENT_LEVELS) and (lower is None or cur > lower * 1.1):
+                idx += 1  # hâlâ kazanç var, yukarıyı dene
+            self._idx[host] = idx
+
+
+# ----------------------------
+# Cancellation
+# ----------------------------
+
+_SOCKET_ATTRS = ("fp", "_fp", "raw", "_sock", "sock", "_connection")
+
+
+def socket_of(obj: Any, depth: int = 0) -> Optional[socket.socket]:
+    # yt-dlp Response -> http.client / urllib3 yanıtı -> dosya -> socket
+    if isinstance(obj, socket.socket):
+        return obj
+    if obj is None or depth > 6:
+        return None
+    for name in _SOCKET_ATTRS:
+        try:
+            sock = socket_of(getattr(obj, name, None), depth + 1)
+        except Exception:
+            continue
+        if sock is not None:
+            return sock
+    return None
+
+
+_proc_owner = threading.local()
+
+# JobYoutubeDL.download() çalışırken başlayan alt süreçler o işe kaydedilir.
+# yt-dlp ffmpeg'i (birleştirme / fixup / ses çıkarma, ffmpeg ve harici
+# indiriciler) bu modüllerin içe aktardığı utils.Popen ile başlatır; sadece bu
+# modüllerdeki ad alt sınıfa bağlanır (analiz, çerezler, güncelleme vb. etkilenmez).
+# Kontrol edilen sürüm: yt-dlp 2026.08.19; gereken tek şey bu modüllerin
+# "from ..utils import Popen" ile alması ve Popen.run'ın cls(...) kullanması.
+# Ad bulunamazsa o modül atlanır: iptal yine çalışır, ffmpeg'in bitmesi beklenir.
+_POPEN_MODULES = (
+    "yt_dlp.postprocessor.ffmpeg",
+    "yt_dlp.postprocessor.embedthumbnail",
+    "yt_dlp.downloader.external",
+    "yt_dlp.downloader.rtmp",
+)
+
+
+def _install_job_popen(mod: Any):
+    import importlib
+
+    base = getattr(mod.utils, "Popen", None)
+    if base is None:
+        return
+
+    class JobPopen(base):  # type: ignore[misc, valid-type]
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            job = getattr(_proc_owner, "job", None)
+            if job is not None:
+                job.track_proc(self)  # iptal tutamacı doğrudan öldürür (her platformda)
+
+    for name in _POPEN_MODULES:
+        try:
+            m = importlib.import_module(name)
+        except ImportError:
+            continue
+        if getattr(m, "Popen", None) is base:
+            m.Popen = JobPopen
+
+
+_job_ydl: Any = None
+
+
+def job_ydl_class() -> Any:
+    # YoutubeDL + iptal: urlopen'dan dönen her yanıt işe kaydedilir (extractor,
+    # HTTP indirici ve parçalı indiricilerin hepsi bu yoldan geçer)
+    global _job_ydl
+    if _job_ydl is None:
+        mod = ydl_module()
+        _install_job_popen(mod)
+        base = mod.YoutubeDL
+
+        class JobYoutubeDL(base):  # type: ignore[misc, valid-type]
+            def __init__(self, params: Optional[Dict[str, Any]] = None, job: Optional[DownloadJob] = None, **kw):
+                self.job = job
+                super().__init__(params, **kw)
+
+            def download(self, url_list):
+                # postprocessor'lar ve indiriciler bu thread'de çalışır
+                _proc_owner.job = self.job
+                try:
+                    return super().download(url_list)
+                finally:
+                    _proc_owner.job = None
+
+            def urlopen(self, req):
+                job = self.job
+                if job is not None and job.cancelled:
+                    raise UserStop()
+                t0 = time.perf_counter()
+                resp = super().urlopen(req)
+                if job is not None:
+                    if job._phase == "download":
+                        # istek => yanıt başlıkları (bağlantı + TLS + ilk bayt)
+                        job.stage("connect", time.perf_counter() - t0, host=host_key(resp.url or ""))
+                    job.track(resp)
+                return resp
+
+        _job_ydl = JobYoutubeDL
+    return _job_ydl
+
+
+# yt-dlp postprocessor adı -> aşama (diğerleri "postprocess")
+_PP_STAGES = {"Merger": "merge", "MoveFiles": "move"}
+
+
+def run_job(
+    job: DownloadJob,
+    tuner: Optional[FragmentTuner] = None,
+    limiter: Optional[BandwidthLimiter] = None,
+):
+    # Her iş kendi YoutubeDL örneğiyle çalışır (YoutubeDL thread-safe değil).
+    opts = dict(job.opts)
+    if limiter and limiter.configured:
+        # sabit küçük okuma bloğu => sınır düzgün (patlamasız) uygulanır
+        opts.setdefault("buffersize", LIMIT_BLOCK)
+        opts.setdefault("noresizebuffer", True)
+
+    frags = opts.get("concurrent_fragment_downloads")
+    auto = frags == FRAGMENTS_AUTO
+    if auto:
+        frags = tuner.pick(job.host) if tuner else 1
+        opts["concurrent_fragment_downloads"] = frags
+    job.fragments = int(frags or 1)
+
+    t_start = time.perf_counter()
+    job._phase = "extract"
+
+    def extracted():
+        # extractor bitti (format seçimi ya da ilk indirme anı)
+        if job._phase == "extract":
+            job._phase = "download"
+            job.stage("extract", time.perf_counter() - t_start, extractor=job.extractor)
+
+    select = opts.get("format")
+    if callable(select):
+        def timed_select(ctx: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+            extracted()
+            t0 = time.perf_counter()
+            picked = list(select(ctx))
+            job.stage("format", time.perf_counter() - t0, formats=len(ctx.get("formats") or []))
+            yield from picked
+
+        timed_select.__name__ = select.__name__
+        opts["format"] = timed_select
+
+    sample = {"t0": 0.0, "frag": False}
+    seen: Dict[str, int] = {}  # dosya -> bildirilen (limiter / metrikler) bayt
+    seen_lock = threading.Lock()
+    started: Dict[str, float] = {}  # dosya -> aktarımın başladığı an
+    pp_started: Dict[str, float] = {}
+
+    def hook(d: Dict[str, Any]):
+        if job.cancelled:
+            raise UserStop()
+
+        st = d.get("status")
+        if st == "downloading":
+            # parçalı indirmede hook birden çok thread'den gelir
+            name = str(d.get("tmpfilename") or d.get("filename") or "")
+            cur = int(d.get("downloaded_bytes") or 0)
+            with seen_lock:
+                delta = cur - seen.get(name, 0)
+                seen[name] = max(cur, seen.get(name, 0))
+                started.setdefault(str(d.get("filename") or name), time.perf_counter())
+                if delta > 0:
+                    job.bytes += delta
+            if job._phase == "extract":
+                extracted()
+            if delta > 0:
+                metrics.add_bytes(delta)
+                if limiter:
+                    limiter.consume(delta, job.priority, should_stop=lambda: job.cancelled)
+                    if job.cancelled:
+                        raise UserStop()
+        elif st == "finished":
+            with seen_lock:
+                t0 = started.pop(str(d.get("filename") or ""), None)
+            if t0 is not None:
+                size = int(d.get("downloaded_bytes") or d.get("total_bytes") or 0)
+                job.stage("transfer", time.perf_counter() - t0, bytes=size, frags=job.fragments)
+        if d.get("fragment_count"):
+            sample["frag"] = True
+            d["concurrent_fragments"] = job.fragments
+        if st == "finished" and d.get("filename"):
+            job.path = str(d["filename"])  # postprocessor varsa pp_hook son yolu yazar
+            info = d.get("info_dict") or {}
+            job.acodec = str(info.get("acodec") or job.acodec)
+            job.abr = float(info.get("abr") or info.get("tbr") or job.abr or 0)
+        if st == "downloading" and not sample["t0"]:
+            sample["t0"] = time.monotonic()
+        elif st == "finished" and sample["t0"]:
+            # parçalı dosya bitti: hızını tuner'a bildir
+            if sample["frag"] and tuner and auto:
+                dt = time.monotonic() - sample["t0"]
+                size = d.get("downloaded_bytes") or d.get("total_bytes") or 0
+                if dt > 0.5 and size:
+                    tuner.report(job.host, job.fragments, size / dt)
+            sample["t0"] = 0.0
+            sample["frag"] = False
+
+        if job.on_progress:
+            job.on_progress(job, d)
+
+    def pp_hook(d: Dict[str, Any]):
+        info = d.get("info_dict") or {}
+        pp = str(d.get("postprocessor") or "")
+        if d.get("status") == "started":
+            pp_started[pp] = time.perf_counter()
+            if job.cancelled:
+                raise UserStop()
+            return
+        if d.get("status") != "finished":
+            return
+        t0 = pp_started.pop(pp, None)
+        if t0 is not None:
+            job.stage(_PP_STAGES.get(pp, "postprocess"), time.perf_counter() - t0, pp=pp)
+        job.path = info.get("filepath") or job.path
+        job.extractor = info.get("extractor_key") or job.extractor
+        job.video_id = str(info.get("id") or job.video_id)
+
+    opts["progress_hooks"] = [hook] + list(opts.get("progress_hooks") or [])
+    opts["postprocessor_hooks"] = [pp_hook] + list(opts.get("postprocessor_hooks") or [])
+
+    try:
+        with job_ydl_class()(opts, job=job) as ydl:
+            ydl.download([job.url])
+    finally:
+        if job._phase == "extract":  # extractor'da başarısız / iptal: harcanan süre yine görünsün
+            job._phase = ""
+            job.stage("extract", time.perf_counter() - t_start, extractor=job.extractor, failed=True)
+
+
+class DownloadScheduler:
+    # Uzun ömürlü iş kuyruğu: en fazla `max_jobs` iş paralel, host başına
+    # en fazla `per_host`. Bir iş takılırsa diğerleri beklemez.
+    # Ses dönüştürme ayrı aşama: `transcoder` (CPU çekirdeği kadar ffmpeg).
+    # Bütün işler tek `limiter`'dan (global hız sınırı) harcar; kuyrukta
+    # yüksek öncelikli iş önce başlar.
+    # Geçici hatalar (429/5xx, zaman aşımı) `retry` politikasıyla bekleyip
+    # kuyruğun sonuna döner; kalıcı / giriş gerektiren hatalar hemen biter.
+
+    def __init__(
+        self,
+        max_jobs: int = DEFAULT_JOBS,
+        per_host: int = PER_HOST_MAX,
+        transcode_jobs: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        self.max_jobs = max(1, max_jobs)
+        self.per_host = max(1, per_host)
+        self.frag_tuner = FragmentTuner()
+        self.transcoder = TranscodePool(transcode_jobs)
+        self.limiter = BandwidthLimiter.from_env()
+        self.retry = retry or RetryPolicy.from_env()
+        self._metrics()
+
+        self._cond = threading.Condition()
+        self._queue: Deque[DownloadJob] = deque()
+        self._active: Dict[str, int] = {}
+        self._running = 0
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+    def set_max_jobs(self, n: int):
+        with self._cond:
+            self.max_jobs = max(1, n)
+            self._spawn()
+            self._cond.notify_all()
+
+    def _metrics(self):
+        # /metrics okunurken hesaplanır (son oluşturulan scheduler)
+        metrics.gauge("media_dl_jobs_running", lambda: self._running, "Download jobs running")
+        metrics.gauge("media_dl_jobs_queued", lambda: len(self._queue), "Download jobs waiting (incl. retry backoff)")
+        metrics.gauge("media_dl_transcode_pending", self.transcoder.pending, "Audio conversions queued or running")
+
+    def submit(self, job: DownloadJob) -> DownloadJob:
+        with self._cond:
+            job.state = QUEUED
+            job._queued_at = time.perf_counter()
+            self._queue.append(job)
+            self._spawn()
+            self._cond.notify_all()
+        return job
+
+    def cancel(self, job: DownloadJob):
+        job.cancel()
+        self._drop(job)
+
+    def pause(self, job: DownloadJob):
+        # çalışıyorsa bağlantısı kesilir; .part kalır, submit() ile devam eder
+        job.pause()
+        self._drop(job)
+
+    def _drop(self, job: DownloadJob):
+        with self._cond:
+            if job in self._queue:
+                self._queue.remove(job)
+            else:
+                return  # çalışıyorsa thread bitirir
+        self._finish(job, PAUSED if job.paused else CANCELLED)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue) + self._running
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            jobs = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        for j in jobs:
+            j.cancel()
+            self._finish(j, CANCELLED)
+        self.transcoder.shutdown()
+
+    # ---- internals ----
+
+    def _spawn(self):
+        # lock altında
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.max_jobs:
+            t = threading.Thread(target=self._loop, name=f"dl-{len(self._threads)}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _next(self) -> Tuple[Optional[DownloadJob], Optional[float]]:
+        # lock altında: kapasitesi olan host'ların hazır işlerinden en yüksek
+        # öncelikli (eşitse en eski); yoksa en yakın geri çekilmenin bitişine kalan süre
+        if self._running >= self.max_jobs:
+            return None, None
+        now = time.monotonic()
+        best: Optional[DownloadJob] = None
+        wake: Optional[float] = None
+        for job in self._queue:
+            if job.not_before > now:
+                left = job.not_before - now
+                wake = left if wake is None else min(wake, left)
+                continue
+            if self._active.get(job.host, 0) < self.per_host and (best is None or job.priority > best.priority):
+                best = job
+        if best is not None:
+            self._queue.remove(best)
+        return best, wake
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                job, wake = self._next()
+                while job is None:
+                    if self._closed:
+                        return
+                    self._cond.wait(wake)
+                    job, wake = self._next()
+                self._running += 1
+                self._active[job.host] = self._active.get(job.host, 0) + 1
+                job.state = RUNNING
+            if job._queued_at:
+                job.stage("queue", time.perf_counter() - job._queued_at, attempt=job.attempts)
+
+            state = DONE
+            try:
+                if job.cancelled:
+                    raise UserStop()
+                run_job(job, self.frag_tuner, self.limiter)
+            except Exception as ex:
+                if job.cancelled or isinstance(ex, UserStop):
+                    state = PAUSED if job.paused else CANCELLED
+                else:
+                    state = ERROR
+                    job.error = str(ex)
+                    job.error_kind = classify(ex)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._active[job.host] -= 1
+                    if not self._active[job.host]:
+                        del self._active[job.host]
+                    self._cond.notify_all()
+
+            if state == DONE:
+                job.error = job.error_kind = ""  # önceki denemelerin hatası
+            elif state == ERROR:
+                if self._requeue(job):
+                    continue
+                if job.cancelled:  # bekleme kararı verilirken iptal/duraklatma geldi
+                    state = PAUSED if job.paused else CANCELLED
+            self._finish(job, state)
+
+    def _requeue(self, job: DownloadJob) -> bool:
+        # geçici hata: jitter'lı üstel bekleme, sonra kuyruğun sonuna
+        if not self.retry.should_retry(job.error_kind, job.attempts):
+            return False
+        delay = self.retry.delay(job.attempts)
+        with self._cond:
+            if self._closed or job.cancelled:
+                return False
+            job.attempts += 1
+            job.not_before = time.monotonic() + delay
+            job.state = QUEUED
+            job._queued_at = time.perf_counter()
+            self._queue.append(job)
+            self._cond.notify_all()
+        metrics.count("media_dl_retries_total", kind=job.error_kind)
+        if job.on_retry:
+            try:
+                job.on_retry(job)
+            except Exception:
+                pass
+        return True
+
+    def _finish(self, job: DownloadJob, state: str):
+        job.state = state
+        if job.on_finish:
+            try:
+                job.on_finish(job)
+            except Exception:
+                pass
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+# İndirme öncesi toplam boyut tahmini.
+# Düz (flat) analizde format listesi yok; her girdiyi tek tek çözmek büyük
+# listelerde çok pahalı. Bu yüzden listeye yayılmış küçük bir örnek arka
+# planda çözülür (formats.probe); seçili girdilerin toplamı örneklerin
+# gerçek seçimi + geri kalanlar için örneklerin bayt/saniye oranı × süre.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, pyqtSlot
+
+from formats import estimate_bytes, probe
+
+
+ESTIMATE_SAMPLE = 24  # çözülecek en fazla girdi (liste boyunca eşit aralıklı)
+ESTIMATE_WORKERS = 4
+
+Probe = Tuple[List[dict], float]  # (formatlar, süre sn)
+
+
+@dataclass
+class SizeEstimate:
+    total: float  # bayt
+    exact: int  # gerçek format listesinden hesaplanan girdi sayısı
+    items: int  # indirilecek (seçili, indekste olmayan) girdi sayısı
+
+    @property
+    def extrapolated(self) -> bool:
+        return self.exact < self.items
+
+
+def estimate_total(
+    keys: Sequence[str],
+    seconds: Sequence[int],
+    selected: Sequence[bool],
+    probes: Dict[str, Probe],
+    container: str,
+    max_height: int,
+) -> Optional[SizeEstimate]:
+    sizes: Dict[str, float] = {}
+    for key, (fmts, dur) in probes.items():
+        b = estimate_bytes(fmts, dur, container, max_height)
+        if b > 0:
+            sizes[key] = b
+    if not sizes:
+        return None
+
+    # örneklerden bayt/sn ve girdi başına ortalama
+    timed = [(sizes[k], probes[k][1]) for k in sizes if probes[k][1] > 0]
+    rate = sum(b for b, _ in timed) / sum(d for _, d in timed) if timed else 0.0
+    avg = sum(sizes.values()) / len(sizes)
+
+    total = 0.0
+    exact = items = 0
+    for key, sec, sel in zip(keys, seconds, selected):
+        if not sel:
+            continue
+        items += 1
+        b = sizes.get(key)
+        if b is not None:
+            total += b
+            exact += 1
+        else:
+            total += rate * sec if rate and sec else avg
+    return SizeEstimate(total, exact, items)
+
+
+class SizeEstimator(QObject):
+    # Örnek girdileri arka planda çözer; her sonuçta sig_changed.
+    # cancel() => yeni liste: eski sonuçlar ve uçuştakiler yok sayılır.
+
+    sig_changed = pyqtSignal()
+    _sig_result = pyqtSignal(int, str, object)
+
+    def __init__(self, workers: int = ESTIMATE_WORKERS, parent=None):
+        super().__init__(parent)
+        self.probes: Dict[str, Probe] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="estimate")
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._asked: set = set()
+        self._sig_result.connect(self._on_result, Qt.ConnectionType.QueuedConnection)
+
+    def sample(self, rows: Sequence[Tuple[str, str]], n: int = ESTIMATE_SAMPLE):
+        # rows: (key, url); listeye eşit aralıklı en fazla `n` tanesi (sorulmamış olanlar)
+        if not rows:
+            return
+        step = max(1, len(rows) / max(1, n))
+        picked = [rows[int(i * step)] for i in range(min(n, len(rows)))]
+        with self._lock:
+            gen = self._gen
+            todo = [(k, u) for k, u in picked if u and k not in self._asked]
+            self._asked.update(k for k, _ in todo)
+        for key, url in todo:
+            try:
+                self._pool.submit(self._work, gen, key, url)
+            except RuntimeError:
+                return  # havuz kapatıldı
+
+    def seed(self, probes: Dict[str, Probe]):
+        # önbellekten gelen örnekler: tekrar çözülmez
+        if not probes:
+            return
+        with self._lock:
+            self._asked.update(probes)
+        self.probes.update(probes)
+        self.sig_changed.emit()
+
+    def cancel(self):
+        with self._lock:
+            self._gen += 1
+            self._asked.clear()
+        self.probes.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _work(self, gen: int, key: str, url: str):
+        if gen != self._gen:
+            return
+        try:
+            res: Optional[Probe] = probe(url)
+        except Exception:
+            res = None  # tahmin için önemsiz: örnekten düşer
+        if res and res[0]:
+            self._sig_result.emit(gen, key, res)
+
+    @pyqtSlot(int, str, object)
+    def _on_result(self, gen: int, key: str, res: object):
+        if gen != self._gen:
+            return
+        self.probes[key] = res  # type: ignore[assignment]
+        self.sig_changed.emit()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+# Format seçimi (Qt-free). Sabit "bestvideo[height<=1080]+bestaudio" yerine
+# girdinin gerçek format listesine bakılır:
+#   1. çözünürlük sınırı içindeki en yüksek çözünürlük
+#   2. aynı çözünürlükte yeniden kodlamadan kopyalanabilen codec (MP4 => avc1 + m4a, WEBM => vp9/av1 + opus)
+#      sadece seste de aynısı: M4A => aac, OPUS => opus (bit hızından önce)
+#   3. sonra fps, bit hızı; eşitlikte yt-dlp'nin kendi sıralaması
+# yt-dlp'ye `format` olarak çağrılabilir (callable) bir seçici verilir; aynı
+# seçim boyut tahmininde de kullanılır.
+
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from metrics import span
+
+# container -> (video codec önekleri, ses codec önekleri)
+COPYABLE: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "mp4": (("avc1", "avc3", "h264"), ("mp4a", "aac")),
+    "webm": (("vp9", "vp09", "av01"), ("opus", "vorbis")),
+    # sadece ses: aynı codec => transcode.py yeniden kodlamadan kopyalar
+    "m4a": ((), ("mp4a", "aac")),
+    "opus": ((), ("opus",)),
+    "mp3": ((), ("mp3",)),
+}
+
+# boyut tahmini / seçim için saklanan alanlar (probe sonucu küçük kalsın)
+FORMAT_KEYS = (
+    "format_id", "format", "ext", "protocol", "vcodec", "acodec",
+    "height", "width", "fps", "tbr", "vbr", "abr", "asr", "audio_channels",
+    "filesize", "filesize_approx", "language",
+)
+
+
+def target_for(fmt_text: str, q_text: str) -> Tuple[str, int]:
+    # ("MP4", "1080p") => ("mp4", 1080); ("OPUS", ..) => ("opus", 0); WAV/FLAC/ORIGINAL => ("", 0)
+    t = (fmt_text or "").strip().lower()
+    if t not in COPYABLE:
+        return "", 0
+    if audio_only(t):
+        return t, 0
+    m = re.search(r"(\d{3,4})p", q_text or "")
+    return t, int(m.group(1)) if m else 0
+
+
+def audio_only(container: str) -> bool:
+    return not COPYABLE.get(container, ((), ()))[0]
+
+
+def _codec(f: Dict[str, Any], kind: str) -> str:
+    return str(f.get(kind) or "").lower()
+
+
+def has_video(f: Dict[str, Any]) -> bool:
+    # codec bilinmiyorsa (None) yt-dlp gibi "var" say
+    return f.get("vcodec") != "none"
+
+
+def has_audio(f: Dict[str, Any]) -> bool:
+    return f.get("acodec") != "none"
+
+
+def copyable(f: Dict[str, Any], container: str, kind: str) -> bool:
+    prefixes = COPYABLE.get(container, ((), ()))[0 if kind == "vcodec" else 1]
+    return _codec(f, kind).startswith(prefixes)
+
+
+def format_bytes(f: Dict[str, Any], duration: float = 0) -> float:
+    size = f.get("filesize") or f.get("filesize_approx")
+    if size:
+        return float(size)
+    tbr = f.get("tbr") or (f.get("vbr") or 0) + (f.get("abr") or 0)
+    return float(tbr) * 1000 / 8 * duration if tbr and duration else 0.0
+
+
+def _num(v: Any) -> float:
+    return float(v) if isinstance(v, (int, float)) else 0.0
+
+
+def _pick_video(videos: List[Tuple[int, Dict[str, Any]]], container: str, max_h: int) -> Optional[Dict[str, Any]]:
+    if not videos:
+        return None
+    fit = [(i, f) for i, f in videos if not max_h or not f.get("height") or f["height"] <= max_h]
+    if not fit:
+        # sınırın altında yok: en küçük çözünürlük
+        low = min(_num(f.get("height")) for _, f in videos)
+        fit = [(i, f) for i, f in videos if _num(f.get("height")) == low]
+    return max(
+        fit,
+        key=lambda t: (
+            _num(t[1].get("height")), copyable(t[1], container, "vcodec"),
+            _num(t[1].get("fps")), _num(t[1].get("tbr")), t[0],
+        ),
+    )[1]
+
+
+def _pick_audio(audios: List[Tuple[int, Dict[str, Any]]], container: str) -> Optional[Dict[str, Any]]:
+    if not audios:
+        return None
+    return max(
+        audios,
+        key=lambda t: (
+            copyable(t[1], container, "acodec") if container else False,
+            _num(t[1].get("abr") or t[1].get("tbr")), t[0],
+        ),
+    )[1]
+
+
+def choose(formats: List[Dict[str, Any]], container: str = "", max_height: int = 0) -> List[Dict[str, Any]]:
+    # container "" / m4a / opus / mp3 => sadece ses; dönen liste: [video, ses] / [birleşik] / [ses]
+    indexed = list(enumerate(formats or []))  # yt-dlp sırası: kötüden iyiye
+    audios = [(i, f) for i, f in indexed if has_audio(f) and not has_video(f)]
+    if audio_only(container):
+        a = _pick_audio(audios, container) or _pick_video([(i, f) for i, f in indexed if has_audio(f)], "", 0)
+        return [a] if a else []
+
+    videos = [(i, f) for i, f in indexed if has_video(f) and not has_audio(f)]
+    v = _pick_video(videos, container, max_height)
+    a = _pick_audio(audios, container)
+    if v and a:
+        return [v, a]
+    both = [(i, f) for i, f in indexed if has_video(f) and has_audio(f)]
+    single = _pick_video(both, container, max_height) or v or a
+    return [single] if single else []
+
+
+def merged(pair: List[Dict[str, Any]], container: str) -> Dict[str, Any]:
+    # yt-dlp'nin kendi "v+a" birleştirmesiyle aynı alanlar
+    from yt_dlp.utils import determine_protocol
+
+    v, a = pair
+    return {
+        "requested_formats": pair,
+        "format": "+".join(str(f.get("format") or f.get("format_id")) for f in pair),
+        "format_id": "+".join(str(f.get("format_id")) for f in pair),
+        "ext": container,
+        "protocol": "+".join(f.get("protocol") or determine_protocol(f) for f in pair),
+        "filesize_approx": sum(f.get("filesize") or f.get("filesize_approx") or 0 for f in pair) or None,
+        "tbr": sum(_num(f.get("tbr")) for f in pair),
+        "width": v.get("width"),
+        "height": v.get("height"),
+        "fps": v.get("fps"),
+        "vcodec": v.get("vcodec"),
+        "vbr": v.get("vbr"),
+        "acodec": a.get("acodec"),
+        "abr": a.get("abr"),
+        "asr": a.get("asr"),
+        "audio_channels": a.get("audio_channels"),
+    }
+
+
+def format_selector(container: str, max_height: int = 0) -> Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+    # yt-dlp `format` seçeneği için
+    def select(ctx: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        formats = ctx.get("formats") or []
+        picked = choose(formats, container, max_height)
+        if len(picked) == 2:
+            yield merged(picked, container)
+        elif picked:
+            yield picked[0]
+        elif formats:
+            yield formats[-1]
+
+    select.__name__ = f"select_{container or 'audio'}_{max_height or 'best'}"
+    return select
+
+
+def estimate_bytes(formats: List[Dict[str, Any]], duration: float, container: str = "", max_height: int = 0) -> float:
+    return sum(format_bytes(f, duration) for f in choose(formats, container, max_height))
+
+
+def compact(info: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float]:
+    # tam info_dict => (küçültülmüş format listesi, süre)
+    fmts = [
+        {k: f[k] for k in FORMAT_KEYS if f.get(k) is not None}
+        for f in info.get("formats") or [info]
+        if isinstance(f, dict)
+    ]
+    return fmts, _num(info.get("duration"))
+
+
+PROBE_OPTS: Dict[str, Any] = {
+    "quiet": True,
+    "no_warnings": True,
+    "skip_download": True,
+    "noplaylist": True,
+}
+
+
+def probe(url: str) -> Tuple[List[Dict[str, Any]], float]:
+    # tek girdinin format listesi (ağ isteği; worker thread'de çağrılır)
+    from core import ydl_module
+
+    with span("probe", key=url) as attrs, ydl_module().YoutubeDL(dict(PROBE_OPTS)) as ydl:
+        info = ydl.extract_info(url, download=False)
+        res = compact(info if isinstance(info, dict) else {})
+        attrs["formats"] = len(res[0])
+    return res
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core import ROW_COLUMNS, entry_row
+from paths import cache_dir
+
+
+DEFAULT_TTL = 6 * 3600  # bu süreden eski sonuçlar yeniden doğrulanır
+
+# aynı içerik için farklı görünen URL'ler (paylaşım/izleme parametreleri)
+_DROP_PARAMS = {"si", "feature", "pp", "fbclid", "gclid", "igshid", "ab_channel"}
+_HOST_PREFIXES = ("www.", "m.", "mobile.")
+
+
+def norm_url(url: str) -> str:
+    u = urlsplit((url or "").strip())
+    host = (u.hostname or "").lower()
+    for p in _HOST_PREFIXES:
+        if host.startswith(p):
+            host = host[len(p):]
+            break
+    if u.port:
+        host = f"{host}:{u.port}"
+    q = sorted(
+        (k, v) for k, v in parse_qsl(u.query, keep_blank_values=True)
+        if k not in _DROP_PARAMS and not k.startswith("utm_")
+    )
+    path = u.path.rstrip("/") or "/"
+    return urlunsplit(((u.scheme or "https").lower(), host, path, urlencode(q), ""))
+
+
+@dataclass
+class CachedResult:
+    url: str
+    fetched: float
+    fresh: bool
+    columns: Dict[str, List[str]] = field(default_factory=dict)  # PlaylistModel kolonları
+
+    def __len__(self) -> int:
+        return len(self.columns.get("ids") or [])
+
+    def entries(self) -> List[Dict[str, Any]]:
+        # kolonlardan düz girdiler (entry_row aynı satırı üretir); çok kaynaklı analizde
+        n = len(self)
+        cols = {
+            name: col if isinstance(col, list) and len(col) == n else [0 if name == "seconds" else ""] * n
+            for name, col in ((name, self.columns.get(name)) for name in ROW_COLUMNS)
+        }
+        return [
+            {
+                "title": t, "duration_string": d, "webpage_url": u, "id": i, "thumbnail": th,
+                "ie_key": x, "channel": ch, "duration": sec,
+            }
+            for t, d, u, i, th, x, ch, sec in zip(*(cols[name] for name in ROW_COLUMNS))
+        ]
+
+
+class AnalysisCache:
+    # Düz analiz sonuçlarının kalıcı önbelleği (normalize URL => liste kolonları;
+    # girdiler ayrıştırılmış hâlde saklanır, yükleme toplu extend ile olur).
+    # TTL içinde sonuç doğrudan kullanılır; eskiyse önce gösterilir, sonra
+    # arka planda yeniden analiz edilip fark uygulanır (stale-while-revalidate).
+    # Boyut tahmini örnekleri (formats.probe) aynı anahtarla ayrı tabloda; taze
+    # sonuçta tahmin de ağa çıkmadan buradan gelir.
+
+    def __init__(self, path: Optional[Path] = None, ttl: Optional[float] = None):
+        if ttl is None:
+            try:
+                ttl = float(os.environ.get("MEDIA_DL_ANALYSIS_TTL") or DEFAULT_TTL)
+            except ValueError:
+                ttl = DEFAULT_TTL
+        self.ttl = max(0.0, ttl)
+        self.path = Path(path) if path else cache_dir("analysis") / "results.db"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, url TEXT, fetched REAL, n INTEGER, columns BLOB)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS probes (key TEXT PRIMARY KEY, data BLOB)")
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[CachedResult]:
+        key = norm_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, fetched, columns FROM results WHERE key=?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        src, fetched, blob = row
+        try:
+            cols = json.loads(zlib.decompress(blob))
+            if not isinstance(cols, dict):
+                raise ValueError
+        except (zlib.error, ValueError, TypeError):
+            self.drop(url)
+            return None
+        fetched = fetched or 0.0
+        return CachedResult(src or url, fetched, (time.time() - fetched) < self.ttl, cols)
+
+    def put(self, url: str, entries: List[Dict[str, Any]]):
+        rows = [entry_row(e) for e in entries if isinstance(e, dict)]
+        cols = {name: list(col) for name, col in zip(ROW_COLUMNS, zip(*rows))}
+        blob = zlib.compress(json.dumps(cols, separators=(",", ":")).encode("utf-8"), 6)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, url, fetched, n, columns) VALUES (?, ?, ?, ?, ?)",
+                (norm_url(url), url, time.time(), len(rows), blob),
+            )
+            self._db.commit()
+
+    def get_probes(self, url: str) -> Dict[str, Tuple[List[dict], float]]:
+        # girdi anahtarı => (formatlar, süre); SizeEstimator.probes ile aynı biçim
+        with self._lock:
+            row = self._db.execute("SELECT data FROM probes WHERE key=?", (norm_url(url),)).fetchone()
+        if not row:
+            return {}
+        try:
+            data = json.loads(zlib.decompress(row[0]))
+            return {
+                str(k): (list(v[0]), float(v[1] or 0.0))
+                for k, v in data.items() if isinstance(v, list) and len(v) == 2
+            }
+        except (zlib.error, ValueError, TypeError, AttributeError):
+            return {}
+
+    def put_probes(self, url: str, probes: Dict[str, Tuple[List[dict], float]]):
+        data = {k: [fmts, dur] for k, (fmts, dur) in probes.items()}
+        blob = zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), 6)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO probes (key, data) VALUES (?, ?)", (norm_url(url), blob))
+            self._db.commit()
+
+    def drop(self, url: str):
+        with self._lock:
+            self._db.execute("DELETE FROM results WHERE key=?", (norm_url(url),))
+            self._db.execute("DELETE FROM probes WHERE key=?", (norm_url(url),))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.execute("DELETE FROM probes")
+            self._db.commit()
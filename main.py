@@ -1,20 +1,40 @@
 # main.py (FULL FIXED) — Linux-only + title ellipsis + i18n + audio quality dropdown FIX
 from __future__ import annotations
 
+from startup import profile  # ilk import: --startup-profile diğer importları da ölçsün
+
 import os
-import re
 import shutil
-import urllib.request
+import sys
+import threading
+import time
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QSize
-from PyQt6.QtGui import QPixmap, QIcon
-from PyQt6.QtWidgets import QApplication, QMessageBox, QListWidgetItem, QListWidget
+from PyQt6.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal, QSize, QModelIndex
+from PyQt6.QtGui import QPixmap, QImage
+from PyQt6.QtWidgets import QApplication, QMessageBox, QListView, QMenu, QFileDialog
 
-import yt_dlp
 from ui import MediaDownloaderUI
+from core import (
+    iter_entries, iter_many, parse_urls, read_url_file, batched, warm_up_async,
+    DownloadScheduler, QueueItem, DEFAULT_JOBS, FRAGMENTS_AUTO,
+)
+from bandwidth import format_rate, parse_rate
+from estimate import SizeEstimator, estimate_total
+from formats import target_for
+from batch import BatchReport, DownloadBatch
+from thumbs import ThumbnailLoader
+from thumbcache import ThumbCache
+from infocache import AnalysisCache
+from store import DownloadIndex, QueueStore
+from playlist_model import PlaylistModel, PlaylistDelegate
+from progress import (
+    ProgressTracker, ItemProgress, human_mb, human_size, human_speed, human_eta,
+    P_QUEUED, P_POST, P_DONE, P_ERROR, P_CANCELLED, P_PAUSED, P_RETRYING, P_SKIPPED, FINAL_STATES,
+)
+from retry import AUTH
 
 
 # ----------------------------
@@ -54,38 +74,9 @@ def linux_install_hint(pkg_mgr: str) -> str:
     }.get(pkg_mgr, "ffmpeg kur (paket yöneticin bilinmiyor).")
 
 
-def human_mb(n: Optional[int]) -> str:
-    if not n:
-        return "0 MB"
-    return f"{n/(1024*1024):.1f} MB"
-
-
-def safe_percent(p: str) -> int:
-    s = (p or "").strip()
-    s = re.sub(r"\x1b\[[0-9;]*m", "", s)  # ANSI escape temizle
-    s = s.replace("%", "").strip()
-    try:
-        v = int(float(s))
-    except Exception:
-        v = 0
-    return max(0, min(100, v))
-
-
-def pct_from_bytes(done_b: int, total_b: int) -> Optional[int]:
-    if not total_b or total_b <= 0:
-        return None
-    try:
-        v = int((done_b / total_b) * 100)
-        return max(0, min(100, v))
-    except Exception:
-        return None
-
-
-def elide(text: str, max_chars: int = 70) -> str:
-    s = (text or "").strip()
-    if len(s) <= max_chars:
-        return s
-    return s[: max_chars - 1].rstrip() + "…"
+PROGRESS_INTERVAL_MS = 100  # GUI ilerleme yenileme aralığı (10 Hz)
+SEARCH_DEBOUNCE_MS = 80
+ESTIMATE_DEBOUNCE_MS = 150
 
 
 # ----------------------------
@@ -102,13 +93,33 @@ TR_BASE = {
     "title_warn": "Uyarı",
     "title_ok": "Tamam",
     "title_deps": "Gereksinimler",
+    "title_resume": "Devam et",
 
     "ready": "Hazır",
     "analyzing": "Analiz ediliyor...",
+    "analyzing_n": "Analiz ediliyor... {n} video",
     "found": "{n} video bulundu",
+    "found_cached": "{n} video (önbellekten)",
+    "revalidating": "{n} video (önbellekten) · güncelleniyor...",
+    "updated": "{n} video · +{a} / -{r}",
     "downloading": "İndiriliyor…",
     "stopping": "Durduruluyor...",
     "converting": "Dönüştürülüyor...",
+    "st_queued": "Sırada",
+    "st_done": "Bitti",
+    "st_error": "Hata",
+    "st_cancelled": "İptal",
+    "st_paused": "Duraklatıldı",
+    "st_retry": "Yeniden denenecek {n}/{max} · {eta}",
+    "kind_transient": "geçici",
+    "kind_permanent": "kalıcı",
+    "kind_auth": "giriş gerekli",
+    "item_pause": "Duraklat",
+    "item_resume": "Devam et",
+    "item_cancel": "İptal et",
+    "st_have": "Zaten var",
+    "frag_n": "{n}× parça",
+    "summary": "{done}/{total} bitti · {failed} hata | {mb} | {speed} | ETA: {eta}",
 
     "btn_start": "İndirmeye Başla",
     "btn_stop": "Durdur",
@@ -124,18 +135,40 @@ TR_BASE = {
 
     "done": "İndirme tamamlandı.",
     "dl_error": "İndirme hatası:\n{msg}",
+    "report": "{done} indirildi · {skipped} atlandı · {failed} başarısız · {retried} yeniden denendi",
+    "report_failed": "Başarısız öğeler:",
+    "report_auth": "Giriş gerektiren öğeler oturum açılmadan indirilemez.",
     "an_error": "Bağlantı analiz edilemedi:\n{msg}",
+    "resume_q": "Önceki oturumdan {n} tamamlanmamış indirme var. Kaldığı yerden devam edilsin mi?",
 
     "format_lbl": "Format:",
     "quality_lbl": "Kalite:",
     "audio_quality_lbl": "Ses Kalitesi:",
+    "jobs_lbl": "Eşzamanlı indirme:",
+    "frag_lbl": "Parça paralelliği:",
+    "frag_auto": "Otomatik",
+    "limit_lbl": "Hız sınırı:",
+    "limit_none": "Sınırsız",
+    "limit_tip": "Bütün indirmelerin toplam hızı (değişiklik anında uygulanır). Saate göre: MEDIA_DL_BW_SCHEDULE",
+    "fmt_original": "Orijinal (dönüştürmesiz)",
+    "fmt_tip": "Kaynak ses akışı olduğu gibi kaydedilir. M4A/OPUS/MP3: kaynak aynı codec'teyse yeniden kodlanmaz.",
+    "est_size": "≈ {size} indirilecek",
+    "est_tip": "Tahmin: {n}/{total} girdinin format listesinden, kalanlar süreye göre",
     "playlist_lbl": "Playlist / Videolar",
     "select_all": "Hepsini Seç",
     "check_btn": "Kontrol",
+    "import_btn": "Dosyadan...",
+    "import_title": "Bağlantı listesi aç",
+    "import_none": "Dosyada bağlantı bulunamadı.",
+    "url_tip": "Birden çok bağlantı yapıştırılabilir; .txt / .csv listesi buraya sürüklenebilir.",
+    "analyzing_multi": "{s} bağlantı analiz ediliyor... {n} video",
+    "found_multi": "{s} bağlantıdan {n} video",
+    "an_failed": "{f} bağlantı analiz edilemedi",
     "folder_btn": "Klasör Seç",
     "lang_lbl": "Dil:",
     "url_ph": "YouTube, Instagram, TikTok, X/Twitter vb. bağlantı yapıştır...",
     "search_ph": "Listede ara...",
+    "search_tip": "Filtreler: dur:<5m, dur:>1h, dur:3m-10m, channel:ad",
     "folder_lbl": "Klasör: {path}",
 }
 
@@ -146,12 +179,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "Warning",
         "title_ok": "OK",
         "title_deps": "Requirements",
+        "title_resume": "Resume",
         "ready": "Ready",
         "analyzing": "Analyzing...",
+        "analyzing_n": "Analyzing... {n} videos",
         "found": "Found {n} videos",
+        "found_cached": "{n} videos (cached)",
+        "revalidating": "{n} videos (cached) · refreshing...",
+        "updated": "{n} videos · +{a} / -{r}",
         "downloading": "Downloading…",
         "stopping": "Stopping...",
         "converting": "Converting...",
+        "st_queued": "Queued",
+        "st_done": "Done",
+        "st_error": "Failed",
+        "st_cancelled": "Cancelled",
+        "st_paused": "Paused",
+        "st_retry": "Retrying {n}/{max} in {eta}",
+        "kind_transient": "transient",
+        "kind_permanent": "permanent",
+        "kind_auth": "login required",
+        "item_pause": "Pause",
+        "item_resume": "Resume",
+        "item_cancel": "Cancel",
+        "st_have": "Already have",
+        "frag_n": "{n}× frag",
+        "summary": "{done}/{total} done · {failed} failed | {mb} | {speed} | ETA: {eta}",
         "btn_start": "Start Download",
         "btn_stop": "Stop",
         "no_url": "Please enter a URL!",
@@ -163,17 +216,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "Later",
         "done": "Download finished.",
         "dl_error": "Download error:\n{msg}",
+        "report": "{done} downloaded · {skipped} skipped · {failed} failed · {retried} retried",
+        "report_failed": "Failed items:",
+        "report_auth": "Items that require login cannot be downloaded without signing in.",
         "an_error": "Could not analyze link:\n{msg}",
+        "resume_q": "There are {n} unfinished downloads from the last session. Resume where they left off?",
         "format_lbl": "Format:",
         "quality_lbl": "Quality:",
         "audio_quality_lbl": "Audio Quality:",
+        "jobs_lbl": "Parallel downloads:",
+        "frag_lbl": "Fragment parallelism:",
+        "frag_auto": "Auto",
+        "limit_lbl": "Speed limit:",
+        "limit_none": "Unlimited",
+        "limit_tip": "Total speed of all downloads (applies immediately). By time of day: MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "Original (no conversion)",
+        "fmt_tip": "Saves the source audio stream as is. M4A/OPUS/MP3: no re-encoding when the source already uses that codec.",
+        "est_size": "≈ {size} to download",
+        "est_tip": "Estimate: format lists of {n}/{total} entries, the rest by duration",
         "playlist_lbl": "Playlist / Videos",
         "select_all": "Select All",
         "check_btn": "Check",
+        "import_btn": "Import...",
+        "import_title": "Open link list",
+        "import_none": "No links found in the file.",
+        "url_tip": "Paste several links at once, or drop a .txt / .csv list here.",
+        "analyzing_multi": "Analyzing {s} links... {n} videos",
+        "found_multi": "Found {n} videos from {s} links",
+        "an_failed": "{f} links could not be analyzed",
         "folder_btn": "Choose Folder",
         "lang_lbl": "Language:",
         "url_ph": "Paste a link (YouTube, Instagram, TikTok, X/Twitter etc.)...",
         "search_ph": "Search in list...",
+        "search_tip": "Filters: dur:<5m, dur:>1h, dur:3m-10m, channel:name",
         "folder_lbl": "Folder: {path}",
     },
     "de": {
@@ -181,12 +256,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "Warnung",
         "title_ok": "OK",
         "title_deps": "Voraussetzungen",
+        "title_resume": "Fortsetzen",
         "ready": "Bereit",
         "analyzing": "Analysiere...",
+        "analyzing_n": "Analysiere... {n} Videos",
         "found": "{n} Videos gefunden",
+        "found_cached": "{n} Videos (Cache)",
+        "revalidating": "{n} Videos (Cache) · wird aktualisiert...",
+        "updated": "{n} Videos · +{a} / -{r}",
         "downloading": "Wird heruntergeladen…",
         "stopping": "Wird angehalten...",
         "converting": "Wird konvertiert...",
+        "st_queued": "In Warteschlange",
+        "st_done": "Fertig",
+        "st_error": "Fehlgeschlagen",
+        "st_cancelled": "Abgebrochen",
+        "st_paused": "Pausiert",
+        "st_retry": "Neuer Versuch {n}/{max} in {eta}",
+        "kind_transient": "vorübergehend",
+        "kind_permanent": "dauerhaft",
+        "kind_auth": "Anmeldung nötig",
+        "item_pause": "Pausieren",
+        "item_resume": "Fortsetzen",
+        "item_cancel": "Abbrechen",
+        "st_have": "Bereits vorhanden",
+        "frag_n": "{n}× Fragm.",
+        "summary": "{done}/{total} fertig · {failed} Fehler | {mb} | {speed} | ETA: {eta}",
         "btn_start": "Download starten",
         "btn_stop": "Stopp",
         "no_url": "Bitte eine URL eingeben!",
@@ -198,17 +293,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "Später",
         "done": "Download abgeschlossen.",
         "dl_error": "Download-Fehler:\n{msg}",
+        "report": "{done} geladen · {skipped} übersprungen · {failed} fehlgeschlagen · {retried} wiederholt",
+        "report_failed": "Fehlgeschlagene Einträge:",
+        "report_auth": "Einträge mit Anmeldepflicht können ohne Anmeldung nicht geladen werden.",
         "an_error": "Link konnte nicht analysiert werden:\n{msg}",
+        "resume_q": "Aus der letzten Sitzung sind {n} Downloads unvollständig. Dort fortsetzen?",
         "format_lbl": "Format:",
         "quality_lbl": "Qualität:",
         "audio_quality_lbl": "Audioqualität:",
+        "jobs_lbl": "Parallele Downloads:",
+        "frag_lbl": "Parallele Fragmente:",
+        "frag_auto": "Automatisch",
+        "limit_lbl": "Tempolimit:",
+        "limit_none": "Unbegrenzt",
+        "limit_tip": "Gesamtgeschwindigkeit aller Downloads (gilt sofort). Nach Uhrzeit: MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "Original (ohne Konvertierung)",
+        "fmt_tip": "Speichert den Quell-Audiostream unverändert. M4A/OPUS/MP3: keine Neukodierung, wenn die Quelle bereits diesen Codec nutzt.",
+        "est_size": "≈ {size} zum Herunterladen",
+        "est_tip": "Schätzung: Formatlisten von {n}/{total} Einträgen, der Rest nach Dauer",
         "playlist_lbl": "Playlist / Videos",
         "select_all": "Alle auswählen",
         "check_btn": "Prüfen",
+        "import_btn": "Importieren...",
+        "import_title": "Linkliste öffnen",
+        "import_none": "Keine Links in der Datei gefunden.",
+        "url_tip": "Mehrere Links auf einmal einfügen oder eine .txt- / .csv-Liste hierher ziehen.",
+        "analyzing_multi": "Analysiere {s} Links... {n} Videos",
+        "found_multi": "{n} Videos aus {s} Links gefunden",
+        "an_failed": "{f} Links konnten nicht analysiert werden",
         "folder_btn": "Ordner wählen",
         "lang_lbl": "Sprache:",
         "url_ph": "Link einfügen (YouTube, Instagram, TikTok, X usw.)...",
         "search_ph": "In Liste suchen...",
+        "search_tip": "Filter: dur:<5m, dur:>1h, dur:3m-10m, channel:Name",
         "folder_lbl": "Ordner: {path}",
     },
     "es": {
@@ -216,12 +333,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "Aviso",
         "title_ok": "OK",
         "title_deps": "Requisitos",
+        "title_resume": "Reanudar",
         "ready": "Listo",
         "analyzing": "Analizando...",
+        "analyzing_n": "Analizando... {n} vídeos",
         "found": "Se encontraron {n} vídeos",
+        "found_cached": "{n} vídeos (caché)",
+        "revalidating": "{n} vídeos (caché) · actualizando...",
+        "updated": "{n} vídeos · +{a} / -{r}",
         "downloading": "Descargando…",
         "stopping": "Deteniendo...",
         "converting": "Convirtiendo...",
+        "st_queued": "En cola",
+        "st_done": "Hecho",
+        "st_error": "Error",
+        "st_cancelled": "Cancelado",
+        "st_paused": "En pausa",
+        "st_retry": "Reintento {n}/{max} en {eta}",
+        "kind_transient": "temporal",
+        "kind_permanent": "permanente",
+        "kind_auth": "requiere inicio de sesión",
+        "item_pause": "Pausar",
+        "item_resume": "Reanudar",
+        "item_cancel": "Cancelar",
+        "st_have": "Ya descargado",
+        "frag_n": "{n}× frag.",
+        "summary": "{done}/{total} hechos · {failed} errores | {mb} | {speed} | ETA: {eta}",
         "btn_start": "Iniciar descarga",
         "btn_stop": "Detener",
         "no_url": "¡Introduce una URL!",
@@ -233,17 +370,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "Más tarde",
         "done": "Descarga finalizada.",
         "dl_error": "Error de descarga:\n{msg}",
+        "report": "{done} descargados · {skipped} omitidos · {failed} fallidos · {retried} reintentados",
+        "report_failed": "Elementos fallidos:",
+        "report_auth": "Los elementos que requieren inicio de sesión no se pueden descargar sin iniciar sesión.",
         "an_error": "No se pudo analizar el enlace:\n{msg}",
+        "resume_q": "Hay {n} descargas sin terminar de la última sesión. ¿Reanudar donde se quedaron?",
         "format_lbl": "Formato:",
         "quality_lbl": "Calidad:",
         "audio_quality_lbl": "Calidad de audio:",
+        "jobs_lbl": "Descargas simultáneas:",
+        "frag_lbl": "Fragmentos en paralelo:",
+        "frag_auto": "Automático",
+        "limit_lbl": "Límite de velocidad:",
+        "limit_none": "Sin límite",
+        "limit_tip": "Velocidad total de todas las descargas (se aplica al instante). Por hora: MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "Original (sin conversión)",
+        "fmt_tip": "Guarda el audio de origen tal cual. M4A/OPUS/MP3: sin recodificar si el origen ya usa ese códec.",
+        "est_size": "≈ {size} por descargar",
+        "est_tip": "Estimación: listas de formatos de {n}/{total} entradas, el resto por duración",
         "playlist_lbl": "Lista / Vídeos",
         "select_all": "Seleccionar todo",
         "check_btn": "Comprobar",
+        "import_btn": "Importar...",
+        "import_title": "Abrir lista de enlaces",
+        "import_none": "No se encontraron enlaces en el archivo.",
+        "url_tip": "Pega varios enlaces a la vez o arrastra aquí una lista .txt / .csv.",
+        "analyzing_multi": "Analizando {s} enlaces... {n} videos",
+        "found_multi": "{n} videos encontrados en {s} enlaces",
+        "an_failed": "No se pudieron analizar {f} enlaces",
         "folder_btn": "Elegir carpeta",
         "lang_lbl": "Idioma:",
         "url_ph": "Pega un enlace (YouTube, Instagram, TikTok, X, etc.)...",
         "search_ph": "Buscar en la lista...",
+        "search_tip": "Filtros: dur:<5m, dur:>1h, dur:3m-10m, channel:nombre",
         "folder_lbl": "Carpeta: {path}",
     },
     "fr": {
@@ -251,12 +410,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "Avertissement",
         "title_ok": "OK",
         "title_deps": "Prérequis",
+        "title_resume": "Reprendre",
         "ready": "Prêt",
         "analyzing": "Analyse...",
+        "analyzing_n": "Analyse... {n} vidéos",
         "found": "{n} vidéos trouvées",
+        "found_cached": "{n} vidéos (cache)",
+        "revalidating": "{n} vidéos (cache) · actualisation...",
+        "updated": "{n} vidéos · +{a} / -{r}",
         "downloading": "Téléchargement…",
         "stopping": "Arrêt...",
         "converting": "Conversion...",
+        "st_queued": "En attente",
+        "st_done": "Terminé",
+        "st_error": "Échec",
+        "st_cancelled": "Annulé",
+        "st_paused": "En pause",
+        "st_retry": "Nouvel essai {n}/{max} dans {eta}",
+        "kind_transient": "temporaire",
+        "kind_permanent": "définitive",
+        "kind_auth": "connexion requise",
+        "item_pause": "Pause",
+        "item_resume": "Reprendre",
+        "item_cancel": "Annuler",
+        "st_have": "Déjà présent",
+        "frag_n": "{n}× frag.",
+        "summary": "{done}/{total} terminés · {failed} échecs | {mb} | {speed} | ETA : {eta}",
         "btn_start": "Démarrer",
         "btn_stop": "Arrêter",
         "no_url": "Entrez une URL !",
@@ -268,17 +447,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "Plus tard",
         "done": "Téléchargement terminé.",
         "dl_error": "Erreur de téléchargement :\n{msg}",
+        "report": "{done} téléchargés · {skipped} ignorés · {failed} en échec · {retried} réessayés",
+        "report_failed": "Éléments en échec :",
+        "report_auth": "Les éléments nécessitant une connexion ne peuvent pas être téléchargés sans se connecter.",
         "an_error": "Impossible d’analyser le lien :\n{msg}",
+        "resume_q": "{n} téléchargements de la dernière session sont inachevés. Les reprendre ?",
         "format_lbl": "Format :",
         "quality_lbl": "Qualité :",
         "audio_quality_lbl": "Qualité audio :",
+        "jobs_lbl": "Téléchargements simultanés :",
+        "frag_lbl": "Fragments parallèles :",
+        "frag_auto": "Auto",
+        "limit_lbl": "Limite de débit :",
+        "limit_none": "Illimité",
+        "limit_tip": "Débit total de tous les téléchargements (appliqué immédiatement). Selon l'heure : MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "Original (sans conversion)",
+        "fmt_tip": "Enregistre le flux audio source tel quel. M4A/OPUS/MP3 : pas de réencodage si la source utilise déjà ce codec.",
+        "est_size": "≈ {size} à télécharger",
+        "est_tip": "Estimation : listes de formats de {n}/{total} entrées, le reste selon la durée",
         "playlist_lbl": "Playlist / Vidéos",
         "select_all": "Tout sélectionner",
         "check_btn": "Vérifier",
+        "import_btn": "Importer...",
+        "import_title": "Ouvrir une liste de liens",
+        "import_none": "Aucun lien trouvé dans le fichier.",
+        "url_tip": "Collez plusieurs liens à la fois ou déposez ici une liste .txt / .csv.",
+        "analyzing_multi": "Analyse de {s} liens... {n} vidéos",
+        "found_multi": "{n} vidéos trouvées dans {s} liens",
+        "an_failed": "{f} liens n'ont pas pu être analysés",
         "folder_btn": "Choisir dossier",
         "lang_lbl": "Langue :",
         "url_ph": "Collez un lien (YouTube, Instagram, TikTok, X, etc.)...",
         "search_ph": "Rechercher dans la liste...",
+        "search_tip": "Filtres : dur:<5m, dur:>1h, dur:3m-10m, channel:nom",
         "folder_lbl": "Dossier : {path}",
     },
     "it": {
@@ -286,12 +487,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "Avviso",
         "title_ok": "OK",
         "title_deps": "Requisiti",
+        "title_resume": "Riprendi",
         "ready": "Pronto",
         "analyzing": "Analisi...",
+        "analyzing_n": "Analisi... {n} video",
         "found": "Trovati {n} video",
+        "found_cached": "{n} video (cache)",
+        "revalidating": "{n} video (cache) · aggiornamento...",
+        "updated": "{n} video · +{a} / -{r}",
         "downloading": "Download…",
         "stopping": "Interruzione...",
         "converting": "Conversione...",
+        "st_queued": "In coda",
+        "st_done": "Fatto",
+        "st_error": "Errore",
+        "st_cancelled": "Annullato",
+        "st_paused": "In pausa",
+        "st_retry": "Nuovo tentativo {n}/{max} tra {eta}",
+        "kind_transient": "temporaneo",
+        "kind_permanent": "permanente",
+        "kind_auth": "accesso richiesto",
+        "item_pause": "Pausa",
+        "item_resume": "Riprendi",
+        "item_cancel": "Annulla",
+        "st_have": "Già presente",
+        "frag_n": "{n}× framm.",
+        "summary": "{done}/{total} fatti · {failed} errori | {mb} | {speed} | ETA: {eta}",
         "btn_start": "Avvia download",
         "btn_stop": "Stop",
         "no_url": "Inserisci un URL!",
@@ -303,17 +524,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "Più tardi",
         "done": "Download completato.",
         "dl_error": "Errore di download:\n{msg}",
+        "report": "{done} scaricati · {skipped} saltati · {failed} non riusciti · {retried} ritentati",
+        "report_failed": "Elementi non riusciti:",
+        "report_auth": "Gli elementi che richiedono l'accesso non possono essere scaricati senza accedere.",
         "an_error": "Impossibile analizzare il link:\n{msg}",
+        "resume_q": "Ci sono {n} download incompleti dall'ultima sessione. Riprendere da dove erano?",
         "format_lbl": "Formato:",
         "quality_lbl": "Qualità:",
         "audio_quality_lbl": "Qualità audio:",
+        "jobs_lbl": "Download paralleli:",
+        "frag_lbl": "Frammenti paralleli:",
+        "frag_auto": "Automatico",
+        "limit_lbl": "Limite velocità:",
+        "limit_none": "Illimitato",
+        "limit_tip": "Velocità totale di tutti i download (applicata subito). Per fascia oraria: MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "Originale (senza conversione)",
+        "fmt_tip": "Salva l'audio sorgente così com'è. M4A/OPUS/MP3: nessuna ricodifica se la sorgente usa già quel codec.",
+        "est_size": "≈ {size} da scaricare",
+        "est_tip": "Stima: elenchi formati di {n}/{total} voci, il resto in base alla durata",
         "playlist_lbl": "Playlist / Video",
         "select_all": "Seleziona tutto",
         "check_btn": "Controlla",
+        "import_btn": "Importa...",
+        "import_title": "Apri elenco di link",
+        "import_none": "Nessun link trovato nel file.",
+        "url_tip": "Incolla più link insieme o trascina qui un elenco .txt / .csv.",
+        "analyzing_multi": "Analisi di {s} link... {n} video",
+        "found_multi": "{n} video trovati da {s} link",
+        "an_failed": "Impossibile analizzare {f} link",
         "folder_btn": "Scegli cartella",
         "lang_lbl": "Lingua:",
         "url_ph": "Incolla un link (YouTube, Instagram, TikTok, X, ecc.)...",
         "search_ph": "Cerca nella lista...",
+        "search_tip": "Filtri: dur:<5m, dur:>1h, dur:3m-10m, channel:nome",
         "folder_lbl": "Cartella: {path}",
     },
     "ja": {
@@ -321,12 +564,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "警告",
         "title_ok": "OK",
         "title_deps": "要件",
+        "title_resume": "再開",
         "ready": "準備完了",
         "analyzing": "解析中...",
+        "analyzing_n": "解析中... {n} 件",
         "found": "{n} 件の動画",
+        "found_cached": "{n} 件 (キャッシュ)",
+        "revalidating": "{n} 件 (キャッシュ) · 更新中...",
+        "updated": "{n} 件 · +{a} / -{r}",
         "downloading": "ダウンロード中…",
         "stopping": "停止中...",
         "converting": "変換中...",
+        "st_queued": "待機中",
+        "st_done": "完了",
+        "st_error": "失敗",
+        "st_cancelled": "キャンセル",
+        "st_paused": "一時停止中",
+        "st_retry": "再試行 {n}/{max}（{eta}後）",
+        "kind_transient": "一時的",
+        "kind_permanent": "恒久的",
+        "kind_auth": "ログインが必要",
+        "item_pause": "一時停止",
+        "item_resume": "再開",
+        "item_cancel": "キャンセル",
+        "st_have": "取得済み",
+        "frag_n": "{n}× 分割",
+        "summary": "{done}/{total} 完了 · 失敗 {failed} | {mb} | {speed} | 残り: {eta}",
         "btn_start": "ダウンロード開始",
         "btn_stop": "停止",
         "no_url": "URLを入力して！",
@@ -338,17 +601,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "後で",
         "done": "完了しました。",
         "dl_error": "エラー:\n{msg}",
+        "report": "{done} 件完了 · {skipped} 件スキップ · {failed} 件失敗 · {retried} 件再試行",
+        "report_failed": "失敗した項目:",
+        "report_auth": "ログインが必要な項目はサインインしないとダウンロードできません。",
         "an_error": "リンクを解析できません:\n{msg}",
+        "resume_q": "前回のセッションで未完了のダウンロードが {n} 件あります。再開しますか？",
         "format_lbl": "形式:",
         "quality_lbl": "品質:",
         "audio_quality_lbl": "音質:",
+        "jobs_lbl": "同時ダウンロード:",
+        "frag_lbl": "並列フラグメント:",
+        "frag_auto": "自動",
+        "limit_lbl": "速度制限:",
+        "limit_none": "無制限",
+        "limit_tip": "全ダウンロードの合計速度（すぐに反映）。時間帯別: MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "オリジナル（変換なし）",
+        "fmt_tip": "元の音声ストリームをそのまま保存します。M4A/OPUS/MP3: 元が同じコーデックなら再エンコードしません。",
+        "est_size": "ダウンロード量 ≈ {size}",
+        "est_tip": "推定: {n}/{total} 件のフォーマット一覧から、残りは長さから算出",
         "playlist_lbl": "プレイリスト / 動画",
         "select_all": "すべて選択",
         "check_btn": "確認",
+        "import_btn": "インポート...",
+        "import_title": "リンク一覧を開く",
+        "import_none": "ファイルにリンクが見つかりません。",
+        "url_tip": "複数のリンクをまとめて貼り付けるか、.txt / .csv の一覧をここへドロップできます。",
+        "analyzing_multi": "{s} 件のリンクを解析中... {n} 本",
+        "found_multi": "{s} 件のリンクから {n} 本の動画",
+        "an_failed": "{f} 件のリンクを解析できませんでした",
         "folder_btn": "フォルダ選択",
         "lang_lbl": "言語:",
         "url_ph": "リンクを貼り付け（YouTube/Instagram/TikTok/Xなど）...",
         "search_ph": "リスト内検索...",
+        "search_tip": "フィルター: dur:<5m, dur:>1h, dur:3m-10m, channel:名前",
         "folder_lbl": "フォルダ: {path}",
     },
     "zh": {
@@ -356,12 +641,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "警告",
         "title_ok": "好",
         "title_deps": "依赖",
+        "title_resume": "继续",
         "ready": "就绪",
         "analyzing": "正在解析...",
+        "analyzing_n": "正在解析... {n} 个视频",
         "found": "找到 {n} 个视频",
+        "found_cached": "{n} 个视频 (缓存)",
+        "revalidating": "{n} 个视频 (缓存) · 正在刷新...",
+        "updated": "{n} 个视频 · +{a} / -{r}",
         "downloading": "下载中…",
         "stopping": "正在停止...",
         "converting": "转换中...",
+        "st_queued": "排队中",
+        "st_done": "完成",
+        "st_error": "失败",
+        "st_cancelled": "已取消",
+        "st_paused": "已暂停",
+        "st_retry": "将重试 {n}/{max}（{eta}后）",
+        "kind_transient": "临时",
+        "kind_permanent": "永久",
+        "kind_auth": "需要登录",
+        "item_pause": "暂停",
+        "item_resume": "继续",
+        "item_cancel": "取消",
+        "st_have": "已下载",
+        "frag_n": "{n}× 分片",
+        "summary": "{done}/{total} 完成 · {failed} 失败 | {mb} | {speed} | 剩余: {eta}",
         "btn_start": "开始下载",
         "btn_stop": "停止",
         "no_url": "请输入 URL！",
@@ -373,17 +678,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "稍后",
         "done": "下载完成。",
         "dl_error": "下载错误:\n{msg}",
+        "report": "{done} 个已下载 · {skipped} 个已跳过 · {failed} 个失败 · {retried} 个已重试",
+        "report_failed": "失败的项目：",
+        "report_auth": "需要登录的项目在未登录时无法下载。",
         "an_error": "无法解析链接:\n{msg}",
+        "resume_q": "上次会话有 {n} 个未完成的下载。是否继续？",
         "format_lbl": "格式:",
         "quality_lbl": "清晰度:",
         "audio_quality_lbl": "音频质量:",
+        "jobs_lbl": "并行下载:",
+        "frag_lbl": "并行分片:",
+        "frag_auto": "自动",
+        "limit_lbl": "限速:",
+        "limit_none": "不限",
+        "limit_tip": "所有下载的总速度（立即生效）。按时段: MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "原始（不转换）",
+        "fmt_tip": "按原样保存源音频流。M4A/OPUS/MP3：源已是该编码时不重新编码。",
+        "est_size": "约 {size} 待下载",
+        "est_tip": "估算：{n}/{total} 项的格式列表，其余按时长推算",
         "playlist_lbl": "播放列表 / 视频",
         "select_all": "全选",
         "check_btn": "检查",
+        "import_btn": "导入...",
+        "import_title": "打开链接列表",
+        "import_none": "文件中未找到链接。",
+        "url_tip": "可一次粘贴多个链接，或将 .txt / .csv 列表拖到这里。",
+        "analyzing_multi": "正在分析 {s} 个链接... {n} 个视频",
+        "found_multi": "从 {s} 个链接中找到 {n} 个视频",
+        "an_failed": "{f} 个链接无法分析",
         "folder_btn": "选择文件夹",
         "lang_lbl": "语言:",
         "url_ph": "粘贴链接（YouTube/Instagram/TikTok/X 等）...",
         "search_ph": "列表内搜索...",
+        "search_tip": "筛选: dur:<5m, dur:>1h, dur:3m-10m, channel:名称",
         "folder_lbl": "文件夹: {path}",
     },
     "ru": {
@@ -391,12 +718,32 @@ T: Dict[str, Dict[str, str]] = {
         "title_warn": "Предупреждение",
         "title_ok": "ОК",
         "title_deps": "Требования",
+        "title_resume": "Продолжить",
         "ready": "Готово",
         "analyzing": "Анализ...",
+        "analyzing_n": "Анализ... видео: {n}",
         "found": "Найдено видео: {n}",
+        "found_cached": "Видео: {n} (из кэша)",
+        "revalidating": "Видео: {n} (из кэша) · обновление...",
+        "updated": "Видео: {n} · +{a} / -{r}",
         "downloading": "Загрузка…",
         "stopping": "Остановка...",
         "converting": "Конвертация...",
+        "st_queued": "В очереди",
+        "st_done": "Готово",
+        "st_error": "Ошибка",
+        "st_cancelled": "Отменено",
+        "st_paused": "Пауза",
+        "st_retry": "Повтор {n}/{max} через {eta}",
+        "kind_transient": "временная",
+        "kind_permanent": "постоянная",
+        "kind_auth": "нужен вход",
+        "item_pause": "Приостановить",
+        "item_resume": "Продолжить",
+        "item_cancel": "Отменить",
+        "st_have": "Уже есть",
+        "frag_n": "{n}× фрагм.",
+        "summary": "{done}/{total} готово · ошибок: {failed} | {mb} | {speed} | ETA: {eta}",
         "btn_start": "Начать загрузку",
         "btn_stop": "Стоп",
         "no_url": "Введите URL!",
@@ -408,17 +755,39 @@ T: Dict[str, Dict[str, str]] = {
         "later": "Позже",
         "done": "Загрузка завершена.",
         "dl_error": "Ошибка загрузки:\n{msg}",
+        "report": "Загружено: {done} · пропущено: {skipped} · ошибок: {failed} · повторов: {retried}",
+        "report_failed": "Неудачные элементы:",
+        "report_auth": "Элементы, требующие входа, нельзя загрузить без авторизации.",
         "an_error": "Не удалось проанализировать ссылку:\n{msg}",
+        "resume_q": "С прошлого сеанса осталось незавершённых загрузок: {n}. Продолжить?",
         "format_lbl": "Формат:",
         "quality_lbl": "Качество:",
         "audio_quality_lbl": "Качество аудио:",
+        "jobs_lbl": "Параллельные загрузки:",
+        "frag_lbl": "Параллельные фрагменты:",
+        "frag_auto": "Авто",
+        "limit_lbl": "Ограничение скорости:",
+        "limit_none": "Без ограничений",
+        "limit_tip": "Общая скорость всех загрузок (применяется сразу). По времени суток: MEDIA_DL_BW_SCHEDULE",
+        "fmt_original": "Оригинал (без конвертации)",
+        "fmt_tip": "Сохраняет исходный аудиопоток как есть. M4A/OPUS/MP3: без перекодирования, если источник уже в этом кодеке.",
+        "est_size": "≈ {size} к загрузке",
+        "est_tip": "Оценка: списки форматов {n}/{total} записей, остальные по длительности",
         "playlist_lbl": "Плейлист / Видео",
         "select_all": "Выбрать все",
         "check_btn": "Проверить",
+        "import_btn": "Импорт...",
+        "import_title": "Открыть список ссылок",
+        "import_none": "В файле не найдено ссылок.",
+        "url_tip": "Можно вставить сразу несколько ссылок или перетащить сюда список .txt / .csv.",
+        "analyzing_multi": "Анализ {s} ссылок... {n} видео",
+        "found_multi": "Найдено {n} видео из {s} ссылок",
+        "an_failed": "Не удалось проанализировать ссылок: {f}",
         "folder_btn": "Выбрать папку",
         "lang_lbl": "Язык:",
         "url_ph": "Вставьте ссылку (YouTube, Instagram, TikTok, X и т. д.)...",
         "search_ph": "Поиск по списку...",
+        "search_tip": "Фильтры: dur:<5m, dur:>1h, dur:3m-10m, channel:имя",
         "folder_lbl": "Папка: {path}",
     },
 }
@@ -437,179 +806,87 @@ def tr(lang: str, key: str, **kwargs) -> str:
 # ----------------------------
 
 class AnalyzeWorker(QObject):
-    sig_entries = pyqtSignal(list)
+    sig_batch = pyqtSignal(list)
+    sig_done = pyqtSignal(int)
     sig_error = pyqtSignal(str)
+    sig_source_error = pyqtSignal(str, str)  # çok kaynaklı: url, hata (analiz sürer)
 
-    def __init__(self, url: str):
+    def __init__(self, urls: List[str], cache: Optional[AnalysisCache] = None):
         super().__init__()
-        self.url = url
+        self.urls = urls
+        self.cache = cache  # sadece çok kaynaklıda; tek URL'nin önbelleğini pencere yönetir
+        self._cached: set = set()
+        self._stop = False
 
-    def run(self):
-        try:
-            ydl_opts = {
-                "quiet": True,
-                "no_warnings": True,
-                "extract_flat": "in_playlist",
-                "skip_download": True,
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(self.url, download=False)
-
-            if isinstance(info, dict) and info.get("entries"):
-                entries = [e for e in info["entries"] if e]
-            else:
-                entries = [info]
+    def stop(self):
+        self._stop = True
 
-            for e in entries:
-                if isinstance(e, dict) and not e.get("webpage_url"):
-                    u = e.get("url")
-                    if isinstance(u, str) and u.startswith("http"):
-                        e["webpage_url"] = u
+    def fetch(self, url: str, should_stop=None):
+        # taze önbellek => ağa çıkma; eskimiş sonuç yeniden analiz edilir
+        try:
+            cached = self.cache.get(url) if self.cache else None
+        except Exception:
+            cached = None
+        if cached and cached.fresh and len(cached):
+            self._cached.add(url)
+            return iter(cached.entries())
+        return iter_entries(url, should_stop=should_stop)
+
+    def store(self, url: str, entries: List[Dict[str, Any]]):
+        if self.cache and entries and url not in self._cached:
+            try:
+                self.cache.put(url, entries)
+            except Exception:
+                pass
+
+    def entries(self):
+        should_stop = lambda: self._stop
+        if len(self.urls) == 1:
+            return iter_entries(self.urls[0], should_stop=should_stop)
+        return iter_many(
+            self.urls, should_stop=should_stop, fetch=self.fetch, on_source=self.store,
+            on_error=lambda url, ex: self.sig_source_error.emit(url, str(ex)),
+        )
 
-            self.sig_entries.emit(entries)
+    def run(self):
+        n = 0
+        try:
+            for batch in batched(self.entries(), size=50, interval=0.2, should_stop=lambda: self._stop):
+                if self._stop:
+                    break
+                n += len(batch)
+                self.sig_batch.emit(batch)
+            self.sig_done.emit(n)
         except Exception as ex:
             self.sig_error.emit(str(ex))
 
 
 class DownloadWorker(QObject):
-    sig_progress = pyqtSignal(int, str)  # percent: -1 => indeterminate
-    sig_done = pyqtSignal()
+    # DownloadBatch'i (Qt-free) bir QThread'de çalıştırır.
+    # ilerleme sinyalle değil, tracker üzerinden akar (GUI timer ile okur)
+    # öğe hataları partiyi bitirmez: sonunda sig_done(BatchReport)
+    sig_done = pyqtSignal(object)
     sig_error = pyqtSignal(str)
 
-    def __init__(
-        self,
-        urls: List[str],
-        out_dir: str,
-        fmt_text: str,
-        q_text: str,
-        ffmpeg_bin: Optional[str],
-        lang: str,
-    ):
+    def __init__(self, batch: DownloadBatch):
         super().__init__()
-        self.urls = urls
-        self.out_dir = out_dir
-        self.fmt_text = fmt_text
-        self.q_text = q_text
-        self.ffmpeg_bin = ffmpeg_bin
-        self.lang = lang
-        self._stop = False
+        self.batch = batch
 
     def stop(self):
-        self._stop = True
-
-    def _build(self) -> Tuple[str, List[dict], Dict[str, Any]]:
-        post: List[dict] = []
-        extra: Dict[str, Any] = {}
-
-        t = (self.fmt_text or "").upper().strip()
-        q = (self.q_text or "").strip()
-
-        # ---- AUDIO ----
-        if t in ("MP3", "WAV", "FLAC"):
-            fmt = "bestaudio/best"
-
-            if t == "MP3":
-                # "320 kbps" -> "320"
-                m = re.search(r"(\d+)", q)
-                br = m.group(1) if m else "320"
-                post = [{
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": br,  # yt-dlp: 0(best) .. 9(worst) OR bitrate string; pratikte "320" çalışıyor
-                }]
-            elif t == "WAV":
-                post = [{
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "wav",
-                    "preferredquality": "0",
-                }]
-            else:  # FLAC
-                post = [{
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "flac",
-                    "preferredquality": "0",
-                }]
-
-            return fmt, post, extra
-
-        # ---- VIDEO ----
-        if "2160" in q:
-            fmt = "bestvideo[height<=2160]+bestaudio/best"
-        elif "1440" in q:
-            fmt = "bestvideo[height<=1440]+bestaudio/best"
-        elif "1080" in q:
-            fmt = "bestvideo[height<=1080]+bestaudio/best"
-        elif "720" in q:
-            fmt = "bestvideo[height<=720]+bestaudio/best"
-        elif "480" in q:
-            fmt = "bestvideo[height<=480]+bestaudio/best"
-        elif "360" in q:
-            fmt = "bestvideo[height<=360]+bestaudio/best"
-        else:
-            fmt = "bestvideo+bestaudio/best"
+        self.batch.stop()
 
-        if t == "MP4":
-            extra["merge_output_format"] = "mp4"
-        elif t == "WEBM":
-            extra["merge_output_format"] = "webm"
-
-        return fmt, post, extra
+    def abandon(self):
+        self.batch.abandon()
 
     def run(self):
         try:
-            fmt, post, extra = self._build()
+            self.batch.run()
 
-            def hook(d: Dict[str, Any]):
-                if self._stop:
-                    raise Exception("USER_STOP")
-
-                st = d.get("status")
-
-                if st == "downloading":
-                    done_b = int(d.get("downloaded_bytes") or 0)
-                    total_b = int(d.get("total_bytes") or d.get("total_bytes_estimate") or 0)
-
-                    pct = None
-                    if d.get("_percent_str"):
-                        pct = safe_percent(d.get("_percent_str", "0"))
-
-                    if pct is None:
-                        pct = pct_from_bytes(done_b, total_b)
-
-                    if pct is None:
-                        self.sig_progress.emit(-1, f"{human_mb(done_b)} / ? | ETA: ?")
-                        return
-
-                    speed = d.get("speed")
-                    eta = d.get("eta")
-                    speed_s = f"{(speed/(1024*1024)):.2f} MB/s" if speed else "?"
-                    eta_s = f"{eta}s" if isinstance(eta, int) else "?"
-                    self.sig_progress.emit(
-                        pct,
-                        f"{human_mb(done_b)} / {human_mb(total_b)} | {speed_s} | ETA: {eta_s}",
-                    )
-
-                elif st == "finished":
-                    self.sig_progress.emit(100, tr(self.lang, "converting"))
-
-            ydl_opts: Dict[str, Any] = {
-                "format": fmt,
-                "outtmpl": os.path.join(self.out_dir, "%(title)s.%(ext)s"),
-                "progress_hooks": [hook],
-                "postprocessors": post,
-                "noplaylist": False,
-                "quiet": True,
-                "no_warnings": True,
-                "nocolor": True,
-            }
-            ydl_opts.update(extra)
-            if self.ffmpeg_bin:
-                ydl_opts["ffmpeg_location"] = self.ffmpeg_bin
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download(self.urls)
-
-            self.sig_done.emit()
+            if self.batch.stopped:
+                self.sig_error.emit("USER_STOP")
+                return
+
+            self.sig_done.emit(self.batch.report())
         except Exception as ex:
             if "USER_STOP" in str(ex):
                 self.sig_error.emit("USER_STOP")
@@ -625,7 +902,7 @@ class MediaDownloader(MediaDownloaderUI):
     def __init__(self):
         super().__init__()
 
-        self.host = detect_host()
+        self._host: Optional[HostInfo] = None  # ilk gerektiğinde (PATH taraması)
         self.ffmpeg_bin_dir: Optional[str] = None
 
         self.is_downloading = False
@@ -634,16 +911,86 @@ class MediaDownloader(MediaDownloaderUI):
         self.dl_thread: Optional[QThread] = None
         self.dl_worker: Optional[DownloadWorker] = None
 
+        # ---- Downloads (parallel, per-item jobs) ----
+        self.scheduler = DownloadScheduler(max_jobs=DEFAULT_JOBS)
+        self.tracker = ProgressTracker()
+        try:
+            self.index: Optional[DownloadIndex] = DownloadIndex()
+        except Exception:
+            self.index = None
+        try:
+            self.queue_store: Optional[QueueStore] = QueueStore()
+        except Exception:
+            self.queue_store = None
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(PROGRESS_INTERVAL_MS)
+        self.progress_timer.timeout.connect(self.poll_progress)
+        self.jobs_combo.setCurrentIndex(max(0, self.jobs_combo.findText(str(DEFAULT_JOBS))))
+        self.jobs_combo.currentIndexChanged.connect(self.on_jobs_changed)
+        self.select_limit(self.scheduler.limiter.rate)
+        self.limit_combo.currentIndexChanged.connect(self.on_limit_changed)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+
+        self.api = None  # ApiServer; pencere göründükten sonra başlar
+
+        # ---- Analysis cache (URL => düz girdiler) ----
+        try:
+            self.analysis_cache: Optional[AnalysisCache] = AnalysisCache()
+        except Exception:
+            self.analysis_cache = None
+        self._an_url = ""
+        self._an_entries: List[Dict[str, Any]] = []
+        self._revalidating = False
+        self._an_sources = 0  # >1 => çok kaynaklı analiz (yapıştırma / dosya / sürükle-bırak)
+        self._an_failed: List[Tuple[str, str]] = []
+        self._probes_saved = 0  # önbelleğe yazılmış tahmin örneği sayısı (_an_url için)
+
+        # ---- Size estimate (örnek girdiler arka planda çözülür) ----
+        self.estimator = SizeEstimator(parent=self)
+        self.estimator.sig_changed.connect(self.schedule_estimate)
+        self.estimate_timer = QTimer(self)
+        self.estimate_timer.setSingleShot(True)
+        self.estimate_timer.setInterval(ESTIMATE_DEBOUNCE_MS)
+        self.estimate_timer.timeout.connect(self.update_estimate)
+
+        # ---- Thumbnails (background) ----
+        try:
+            thumb_cache: Optional[ThumbCache] = ThumbCache()
+        except Exception:
+            thumb_cache = None  # önbellek dizini yazılamıyorsa sadece ağdan çalış
+        self.thumb_loader = ThumbnailLoader(cache=thumb_cache, parent=self)
+        self.thumb_loader.sig_ready.connect(self.on_thumb_ready)
+
         # ---- Quality options (video+audio) ----
         self._video_qualities = ["2160p", "1440p", "1080p", "720p", "480p", "360p"]
         self._mp3_qualities = ["320 kbps", "256 kbps", "192 kbps", "160 kbps", "128 kbps", "96 kbps"]
+        # "Original" => kaynak aynı codec'teyse kopya, değilse kaynağın bit hızıyla
+        self._lossy_qualities = ["Original", "256 kbps", "192 kbps", "160 kbps", "128 kbps", "96 kbps"]
+        self._original_qualities = ["Original"]
         self._flac_qualities = ["Lossless (FLAC)"]
         self._wav_qualities = ["PCM (WAV)"]
 
         # ---- LIST UI FIXES ----
-        self.playlist_list.setSelectionMode(QListWidget.SelectionMode.NoSelection)
+        self.playlist_model = PlaylistModel(self)
+        self.playlist_model.thumb_request = self.thumb_loader.request
+        self.playlist_model.progress = self.tracker
+        self.playlist_list.setModel(self.playlist_model)
+        self.playlist_model.modelReset.connect(self.schedule_estimate)
+        self.playlist_model.rowsInserted.connect(self.schedule_estimate)
+        self.playlist_model.rowsRemoved.connect(self.schedule_estimate)
+        self.playlist_model.dataChanged.connect(self.on_model_data_changed)
+        self.playlist_delegate = PlaylistDelegate(self.playlist_list)
+        self.playlist_delegate.status_text = self.item_status_text
+        self.playlist_list.setItemDelegate(self.playlist_delegate)
+        self.playlist_list.setSelectionMode(QListView.SelectionMode.NoSelection)
         self.playlist_list.setIconSize(QSize(96, 96))
-        self.playlist_list.itemClicked.connect(self.on_item_clicked_toggle_check)
+        self.playlist_list.clicked.connect(self.on_item_clicked_toggle_check)
+        self.playlist_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.playlist_list.customContextMenuRequested.connect(self.on_item_menu)
 
         self.lang = norm_lang(str(self.lang_combo.currentData() or "tr"))
 
@@ -653,23 +1000,75 @@ class MediaDownloader(MediaDownloaderUI):
 
         # Signals
         self.check_button.clicked.connect(self.analyze_link)
+        self.import_button.clicked.connect(self.import_links)
         self.url_input.returnPressed.connect(self.analyze_link)
+        # bırakılan metin / dosya giriş kutusuna yazılmasın, pencere toplasın
+        self.url_input.setAcceptDrops(False)
+        self.setAcceptDrops(True)
         self.download_button.clicked.connect(self.start_or_stop_download)
         self.select_all_cb.stateChanged.connect(self.toggle_select_all)
         self.playlist_search.textChanged.connect(self.filter_playlist)
         self.folder_selected.connect(self.update_save_path)
         self.format_combo.currentIndexChanged.connect(self.update_quality_options)
+        self.format_combo.currentIndexChanged.connect(lambda _: self.refresh_have(uncheck=False))
+        self.quality_combo.currentIndexChanged.connect(self.schedule_estimate)
         self.lang_combo.currentIndexChanged.connect(self.on_language_changed)
 
         self.apply_language_ui(force_info_ready=True)
         self.update_quality_options()
+        # pencere önce boyansın; gerisi event loop başlayınca
+        QTimer.singleShot(0, self.deferred_startup)
+
+    def deferred_startup(self):
+        profile.mark("event loop")
+        warm_up_async()
+        self.start_api()
         self.startup_check_requirements()
+        self.offer_resume()
+        profile.mark("deferred startup")
+
+    @property
+    def host(self) -> HostInfo:
+        if self._host is None:
+            self._host = detect_host()
+        return self._host
+
+    def start_api(self):
+        # yerel iş API'si: aynı scheduler, Qt event loop'u dışında
+        from api import ApiServer, api_enabled  # http.server açılışta yüklenmesin
+        if self.api or not api_enabled():
+            return
+        try:
+            self.api = ApiServer(
+                self.scheduler,
+                out_dir=lambda: self.download_folder,
+                ffmpeg_bin=lambda: self.ffmpeg_bin_dir,
+                index=self.index,
+            ).start()
+        except OSError:
+            self.api = None  # port meşgul (ör. ikinci pencere)
+
+    def on_item_clicked_toggle_check(self, index: QModelIndex):
+        self.playlist_model.toggle(index.row())
+
+    def on_item_menu(self, pos):
+        # indirme sürerken satıra sağ tık: duraklat / devam / iptal (sadece o öğe)
+        batch = self.dl_worker.batch if self.dl_worker else None
+        index = self.playlist_list.indexAt(pos)
+        key = self.playlist_model.key_at(index.row()) if index.isValid() else ""
+        if batch is None or not key:
+            return
+        p = self.tracker.get(key)
+        if p is None or p.state in FINAL_STATES or p.state == P_SKIPPED:
+            return
 
-    def on_item_clicked_toggle_check(self, item: QListWidgetItem):
-        cur = item.checkState()
-        item.setCheckState(
-            Qt.CheckState.Unchecked if cur == Qt.CheckState.Checked else Qt.CheckState.Checked
-        )
+        menu = QMenu(self)
+        if p.state == P_PAUSED:
+            menu.addAction(tr(self.lang, "item_resume"), lambda: batch.resume_item(key))
+        elif p.state != P_POST:
+            menu.addAction(tr(self.lang, "item_pause"), lambda: batch.pause_item(key))
+        menu.addAction(tr(self.lang, "item_cancel"), lambda: batch.cancel_item(key))
+        menu.exec(self.playlist_list.viewport().mapToGlobal(pos))
 
     def on_language_changed(self):
         self.lang = norm_lang(str(self.lang_combo.currentData() or "tr"))
@@ -679,17 +1078,28 @@ class MediaDownloader(MediaDownloaderUI):
     def apply_language_ui(self, force_info_ready: bool = False):
         self.url_input.setPlaceholderText(tr(self.lang, "url_ph"))
         self.playlist_search.setPlaceholderText(tr(self.lang, "search_ph"))
+        self.playlist_search.setToolTip(tr(self.lang, "search_tip"))
         self.select_all_cb.setText(tr(self.lang, "select_all"))
 
+        self.url_input.setToolTip(tr(self.lang, "url_tip"))
         self.check_button.setText(tr(self.lang, "check_btn"))
+        self.import_button.setText(tr(self.lang, "import_btn"))
         self.folder_button.setText(tr(self.lang, "folder_btn"))
         self.download_button.setText(
             tr(self.lang, "btn_stop") if self.is_downloading else tr(self.lang, "btn_start")
         )
 
         self.format_label.setText(tr(self.lang, "format_lbl"))
+        self.format_combo.setItemText(self.format_combo.findData("ORIGINAL"), tr(self.lang, "fmt_original"))
+        self.format_combo.setToolTip(tr(self.lang, "fmt_tip"))
+        self.jobs_label.setText(tr(self.lang, "jobs_lbl"))
+        self.frag_label.setText(tr(self.lang, "frag_lbl"))
+        self.frag_combo.setItemText(0, tr(self.lang, "frag_auto"))
+        self.limit_label.setText(tr(self.lang, "limit_lbl"))
+        self.limit_combo.setItemText(0, tr(self.lang, "limit_none"))
+        self.limit_combo.setToolTip(tr(self.lang, "limit_tip"))
         # quality label update_quality_options içinde format'a göre set edilecek
-        self.playlist_label.setText(tr(self.lang, "playlist_lbl"))
+        self.update_estimate()
         self.lang_label.setText(tr(self.lang, "lang_lbl"))
 
         self.folder_label.setText(tr(self.lang, "folder_lbl", path=self.download_folder))
@@ -720,12 +1130,40 @@ class MediaDownloader(MediaDownloaderUI):
         if box.clickedButton() == btn_install:
             QApplication.clipboard().setText(cmd)
 
+    def on_jobs_changed(self):
+        try:
+            n = int(self.jobs_combo.currentText())
+        except ValueError:
+            n = DEFAULT_JOBS
+        self.scheduler.set_max_jobs(n)
+
+    def select_limit(self, rate: int):
+        # env'den (MEDIA_DL_RATE_LIMIT) gelen değer listede yoksa eklenir
+        data = format_rate(rate)
+        idx = self.limit_combo.findData(data)
+        if idx < 0:
+            self.limit_combo.addItem(f"{human_mb(rate)}/s", data)
+            idx = self.limit_combo.count() - 1
+        self.limit_combo.setCurrentIndex(idx)
+
+    def on_limit_changed(self):
+        # çalışan işler yeniden başlamaz; sınır bir sonraki blokta geçerli
+        try:
+            rate = parse_rate(str(self.limit_combo.currentData() or "0"))
+        except ValueError:
+            rate = 0
+        self.scheduler.limiter.set_rate(rate)
+
     def update_save_path(self, path: str):
         self.download_folder = path
         self.folder_label.setText(tr(self.lang, "folder_lbl", path=path))
 
+    def format_code(self) -> str:
+        # combo metni çevrilebilir ("Orijinal"); kod item data'da
+        return str(self.format_combo.currentData() or self.format_combo.currentText() or "").upper().strip()
+
     def update_quality_options(self):
-        fmt = (self.format_combo.currentText() or "").upper().strip()
+        fmt = self.format_code()
 
         # preserve current choice when possible
         prev = self.quality_combo.currentText() if self.quality_combo.count() else ""
@@ -748,6 +1186,19 @@ class MediaDownloader(MediaDownloaderUI):
             idx = self.quality_combo.findText(prev) if prev else self.quality_combo.findText("320 kbps")
             self.quality_combo.setCurrentIndex(idx if idx >= 0 else self.quality_combo.findText("320 kbps"))
 
+        elif fmt in ("M4A", "OPUS"):
+            self.quality_label.setText(tr(self.lang, "audio_quality_lbl"))
+            self.quality_combo.addItems(self._lossy_qualities)
+            self.quality_combo.setEnabled(True)
+            idx = self.quality_combo.findText(prev) if prev else 0
+            self.quality_combo.setCurrentIndex(max(0, idx))
+
+        elif fmt == "ORIGINAL":
+            self.quality_label.setText(tr(self.lang, "audio_quality_lbl"))
+            self.quality_combo.addItems(self._original_qualities)
+            self.quality_combo.setEnabled(True)
+            self.quality_combo.setCurrentIndex(0)
+
         elif fmt == "FLAC":
             self.quality_label.setText(tr(self.lang, "audio_quality_lbl"))
             self.quality_combo.addItems(self._flac_qualities)
@@ -770,117 +1221,344 @@ class MediaDownloader(MediaDownloaderUI):
         self.quality_combo.blockSignals(False)
 
     def toggle_select_all(self, state: int):
-        checked = (state == Qt.CheckState.Checked.value)
-        for i in range(self.playlist_list.count()):
-            self.playlist_list.item(i).setCheckState(
-                Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
-            )
+        self.playlist_model.set_all_checked(state == Qt.CheckState.Checked.value)
 
-    def filter_playlist(self, text: str):
-        text = (text or "").lower().strip()
-        for i in range(self.playlist_list.count()):
-            item = self.playlist_list.item(i)
-            item.setHidden(text not in item.text().lower())
+    def filter_playlist(self, _text: str = ""):
+        # hızlı yazarken her tuşta değil, durunca (debounce) süz
+        self.search_timer.start()
+
+    def apply_filter(self):
+        self.playlist_model.set_filter(self.playlist_search.text())
 
     def analyze_link(self):
-        url = self.url_input.text().strip()
-        if not url:
+        text = self.url_input.text().strip()
+        if not text:
             QMessageBox.warning(self, tr(self.lang, "title_warn"), tr(self.lang, "no_url"))
             return
+        urls = parse_urls(text)
 
         self.info_label.setText(tr(self.lang, "analyzing"))
-        self.playlist_list.clear()
+        self.info_label.setToolTip("")
+        self.reset_thumbs()
+        self.estimator.cancel()
+        self.playlist_model.clear()
+        self.stop_analysis()
+
+        self._an_entries = []
+        self._an_failed = []
+        self._revalidating = False
+        self._probes_saved = 0
+        # Shift+Kontrol => önbelleği atla
+        force = bool(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier)
+
+        if len(urls) > 1:
+            # çok kaynaklı: bağlantılar paralel analiz edilir, tek listede birleşir
+            self._an_url = ""
+            self._an_sources = len(urls)
+            self.info_label.setText(tr(self.lang, "analyzing_multi", s=len(urls), n=0))
+            self.start_analysis(AnalyzeWorker(urls, cache=None if force else self.analysis_cache))
+            return
 
+        url = urls[0] if urls else text
+        self._an_url = url
+        self._an_sources = 1
+
+        # önbellek: taze => ağa hiç çıkma; eski => hemen göster, arkada yenile
+        cached = None
+        if self.analysis_cache and not force:
+            try:
+                cached = self.analysis_cache.get(url)
+            except Exception:
+                cached = None
+        if cached and len(cached):
+            self.playlist_model.append_columns(cached.columns, checked=self.select_all_cb.isChecked())
+            self.refresh_have()
+            n = self.playlist_model.source_count()
+            QTimer.singleShot(0, self.playlist_model.search.warm)
+            self.load_probes(url)
+            if cached.fresh:
+                self.info_label.setText(tr(self.lang, "found_cached", n=n))
+                return
+            self._revalidating = True
+            self.info_label.setText(tr(self.lang, "revalidating", n=n))
+
+        self.start_analysis(AnalyzeWorker([url]))
+
+    def start_analysis(self, worker: AnalyzeWorker):
         self.an_thread = QThread(self)
-        self.an_worker = AnalyzeWorker(url)
+        self.an_worker = worker
         self.an_worker.moveToThread(self.an_thread)
 
         self.an_thread.started.connect(self.an_worker.run)
-        self.an_worker.sig_entries.connect(self.on_entries_ready, Qt.ConnectionType.QueuedConnection)
+        self.an_worker.sig_batch.connect(self.on_entries_batch, Qt.ConnectionType.QueuedConnection)
+        self.an_worker.sig_done.connect(self.on_analyze_done, Qt.ConnectionType.QueuedConnection)
         self.an_worker.sig_error.connect(self.on_analyze_error, Qt.ConnectionType.QueuedConnection)
+        self.an_worker.sig_source_error.connect(self.on_source_error, Qt.ConnectionType.QueuedConnection)
 
-        self.an_worker.sig_entries.connect(self.an_thread.quit)
+        self.an_worker.sig_done.connect(self.an_thread.quit)
         self.an_worker.sig_error.connect(self.an_thread.quit)
         self.an_thread.finished.connect(self.an_worker.deleteLater)
         self.an_thread.finished.connect(self.an_thread.deleteLater)
 
         self.an_thread.start()
 
-    def on_analyze_error(self, msg: str):
-        QMessageBox.critical(self, tr(self.lang, "title_error"), tr(self.lang, "an_error", msg=msg))
-        self.info_label.setText(tr(self.lang, "ready"))
+    # ---- batch input (dosya / sürükle-bırak) ----
 
-    def on_entries_ready(self, entries: List[Dict[str, Any]]):
-        self.playlist_list.clear()
+    def import_links(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, tr(self.lang, "import_title"), self.download_folder,
+            "Text / CSV (*.txt *.csv *.tsv);;* (*)",
+        )
+        if not path:
+            return
+        try:
+            urls = read_url_file(path)
+        except OSError as ex:
+            QMessageBox.critical(self, tr(self.lang, "title_error"), str(ex))
+            return
+        self.add_links(urls)
 
-        for e in entries:
-            if not isinstance(e, dict):
-                continue
+    def add_links(self, urls: List[str]):
+        # girişteki bağlantılara eklenir; hepsi birlikte analiz edilir
+        # (önceki kaynaklar taze önbellekten gelir, ağa çıkılmaz)
+        if not urls:
+            QMessageBox.warning(self, tr(self.lang, "title_warn"), tr(self.lang, "import_none"))
+            return
+        merged = list(dict.fromkeys(parse_urls(self.url_input.text()) + urls))
+        self.url_input.setText(" ".join(merged))
+        if not self.is_downloading:
+            self.analyze_link()
 
-            title = elide(e.get("title") or "Unknown", 70)
-            dur = e.get("duration_string") or e.get("duration") or "?"
-            if isinstance(dur, (int, float)):
-                dur = f"{int(dur)}s"
+    def dragEnterEvent(self, event):
+        md = event.mimeData()
+        if md.hasUrls() or md.hasText():
+            event.acceptProposedAction()
 
-            it = QListWidgetItem(f"{title} [{dur}]")
-            it.setData(Qt.ItemDataRole.UserRole, e)
+    def dropEvent(self, event):
+        md = event.mimeData()
+        urls: List[str] = []
+        for u in md.urls() if md.hasUrls() else ():
+            if u.isLocalFile():
+                try:
+                    urls += read_url_file(u.toLocalFile())
+                except OSError:
+                    pass
+            elif u.scheme() in ("http", "https"):
+                urls.append(u.toString())
+        if not urls and md.hasText():
+            urls = parse_urls(md.text())
+        event.acceptProposedAction()
+        self.add_links(urls)
+
+    def stop_analysis(self):
+        # önceki analiz hâlâ sürüyorsa durdur, sonuçlarını listeye karıştırma ve
+        # thread'in bitmesini bekle (yenisiyle çakışmasın; kapanışta çalışırken yok edilmesin).
+        # run() en geç batched aralığında (0.2 sn) döner.
+        worker, thread = self.an_worker, self.an_thread
+        self.an_worker = None
+        self.an_thread = None
+        if worker:
+            try:
+                worker.stop()
+                worker.sig_batch.disconnect(self.on_entries_batch)
+                worker.sig_done.disconnect(self.on_analyze_done)
+                worker.sig_error.disconnect(self.on_analyze_error)
+                worker.sig_source_error.disconnect(self.on_source_error)
+            except (RuntimeError, TypeError):
+                pass  # worker zaten silinmiş
+        if thread:
+            try:
+                thread.quit()
+                thread.wait()
+            except RuntimeError:
+                pass  # thread bitip silinmiş
 
-            it.setFlags(it.flags() | Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-            it.setCheckState(Qt.CheckState.Checked)
+    def on_analyze_error(self, msg: str):
+        self.an_worker = None  # thread kendi kendine biter; kapanışta stop_analysis bekler
+        if self._revalidating:
+            # önbellekteki liste geçerli kalsın
+            self._revalidating = False
+            self.info_label.setText(tr(self.lang, "found_cached", n=self.playlist_model.source_count()))
+            return
+        QMessageBox.critical(self, tr(self.lang, "title_error"), tr(self.lang, "an_error", msg=msg))
+        self.info_label.setText(tr(self.lang, "ready"))
 
-            it.setSizeHint(QSize(0, 106))
+    def reset_thumbs(self):
+        self.thumb_loader.cancel()
 
-            thumb = e.get("thumbnail")
-            if thumb:
-                try:
-                    data = urllib.request.urlopen(thumb, timeout=4).read()
-                    pix = QPixmap()
-                    pix.loadFromData(data)
-                    if not pix.isNull():
-                        scaled = pix.scaled(
-                            96, 96,
-                            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                            Qt.TransformationMode.SmoothTransformation,
-                        )
-                        it.setIcon(QIcon(scaled))
-                except Exception:
-                    pass
+    def on_thumb_ready(self, url: str, img: QImage):
+        self.playlist_model.set_thumb(url, QPixmap.fromImage(img))
 
-            self.playlist_list.addItem(it)
+    def on_source_error(self, url: str, msg: str):
+        self._an_failed.append((url, msg))
 
-        self.select_all_cb.setChecked(True)
-        self.info_label.setText(tr(self.lang, "found", n=len(entries)))
+    def on_entries_batch(self, entries: List[Dict[str, Any]]):
+        n = self.playlist_model.source_count() + len(entries)
+        if self._an_sources > 1:
+            self.add_entries(entries)
+            self.info_label.setText(tr(self.lang, "analyzing_multi", s=self._an_sources, n=n))
+            return
+        self._an_entries.extend(entries)
+        if self._revalidating:
+            return  # bittiğinde fark olarak uygulanır
+        self.add_entries(entries)
+        self.info_label.setText(tr(self.lang, "analyzing_n", n=n))
+
+    def add_entries(self, entries: List[Dict[str, Any]]):
+        m = self.playlist_model
+        first = m.source_count()
+        m.append_entries(entries, checked=self.select_all_cb.isChecked())
+        self.refresh_have(first)
+
+    def refresh_have(self, first: int = 0, uncheck: bool = True):
+        # indekste bu formatta olan satırları "zaten var" işaretle
+        if not self.index or self.playlist_model.source_count() <= first:
+            return
+        try:
+            found = self.index.lookup(self.playlist_model.index_keys(first), self.format_code())
+        except Exception:
+            return
+        self.playlist_model.set_have(found, first, uncheck=uncheck)
+
+    def on_analyze_done(self, n: int):
+        self.an_worker = None  # thread kendi kendine biter; kapanışta stop_analysis bekler
+        if self.analysis_cache and self._an_entries:
+            # ayrıştırma + sıkıştırma GUI thread'ini bekletmesin
+            threading.Thread(
+                target=self.store_analysis, args=(self._an_url, self._an_entries), daemon=True
+            ).start()
+
+        m = self.playlist_model
+        QTimer.singleShot(0, m.search.warm)
+        self.estimator.sample(m.sample_rows())
+        if self._revalidating:
+            self._revalidating = False
+            added, removed = m.apply_diff(self._an_entries, checked=self.select_all_cb.isChecked())
+            self._an_entries = []
+            self.refresh_have(m.source_count() - added)
+            if not self.is_downloading:
+                self.info_label.setText(tr(self.lang, "updated", n=m.source_count(), a=added, r=removed))
+            return
 
-    def selected_urls(self) -> List[str]:
-        urls: List[str] = []
-        base_url = self.url_input.text().strip()
+        self._an_entries = []
+        if self.is_downloading:
+            return
+        if self._an_sources > 1:
+            text = tr(self.lang, "found_multi", n=m.source_count(), s=self._an_sources)
+            if self._an_failed:
+                text += "  ·  " + tr(self.lang, "an_failed", f=len(self._an_failed))
+                # ipucu: ilk hatalar (uzun listede pencere taşmasın)
+                self.info_label.setToolTip("\n".join(
+                    f"{url}\n    {msg.splitlines()[0] if msg else ''}" for url, msg in self._an_failed[:20]
+                ))
+            self.info_label.setText(text)
+            return
+        self.info_label.setText(tr(self.lang, "found", n=m.source_count()))
+
+    # ---- size estimate ----
+
+    def on_model_data_changed(self, _tl, _br, roles=()):
+        # ilerleme boyamaları (ProgressRole) tahmini etkilemez
+        if not roles or Qt.ItemDataRole.CheckStateRole in roles:
+            self.schedule_estimate()
+
+    def schedule_estimate(self, *_):
+        self.estimate_timer.start()
+
+    def update_estimate(self):
+        text = tr(self.lang, "playlist_lbl")
+        tip = ""
+        m = self.playlist_model
+        if m.source_count() and self.estimator.probes:
+            keys, seconds, selected = m.size_rows()
+            container, max_h = target_for(self.format_code(), self.quality_combo.currentText())
+            est = estimate_total(keys, seconds, selected, self.estimator.probes, container, max_h)
+            if est and est.items:
+                text += "  ·  " + tr(self.lang, "est_size", size=human_size(est.total))
+                tip = tr(self.lang, "est_tip", n=est.exact, total=est.items) if est.extrapolated else ""
+        self.playlist_label.setText(text)
+        self.playlist_label.setToolTip(tip)
+        self.store_probes()
+
+    def load_probes(self, url: str):
+        # önbellekteki tahmin örnekleri; taze sonuçta ağa çıkılmaz, yenilemede
+        # analiz bitince eksikler örneklenir (on_analyze_done)
+        try:
+            probes = self.analysis_cache.get_probes(url)
+        except Exception:
+            probes = {}
+        self._probes_saved = len(probes)
+        self.estimator.seed(probes)
+
+    def store_probes(self):
+        # yeni örnekler geldiyse (tek kaynaklı analiz) önbelleğe, GUI thread'i dışında
+        probes = self.estimator.probes
+        if not (self.analysis_cache and self._an_url) or len(probes) == self._probes_saved:
+            return
+        self._probes_saved = len(probes)
+        threading.Thread(
+            target=self._put_probes, args=(self._an_url, dict(probes)), daemon=True
+        ).start()
 
-        for i in range(self.playlist_list.count()):
-            item = self.playlist_list.item(i)
-            if item.checkState() != Qt.CheckState.Checked:
-                continue
+    def _put_probes(self, url: str, probes: Dict[str, Any]):
+        try:
+            self.analysis_cache.put_probes(url, probes)
+        except Exception:
+            pass
 
-            e = item.data(Qt.ItemDataRole.UserRole) or {}
-            if not isinstance(e, dict):
-                continue
+    def store_analysis(self, url: str, entries: List[Dict[str, Any]]):
+        try:
+            self.analysis_cache.put(url, entries)
+        except Exception:
+            pass
+
+    def selected_urls(self) -> List[str]:
+        return self.playlist_model.checked_urls(self.url_input.text().strip())
 
-            u = e.get("webpage_url")
-            if isinstance(u, str) and u.startswith("http"):
-                urls.append(u)
-                continue
+    def offer_resume(self):
+        # önceki oturumdan kapanmamış kuyruk varsa devam etmeyi öner
+        if not self.queue_store or self.is_downloading:
+            return
+        try:
+            batches = self.queue_store.open_batches()
+        except Exception:
+            return
+        if not batches:
+            return
 
-            u2 = e.get("url")
-            if isinstance(u2, str):
-                if u2.startswith("http"):
-                    urls.append(u2)
-                    continue
-                if re.fullmatch(r"[A-Za-z0-9_-]{8,}", u2):
-                    urls.append(f"https://www.youtube.com/watch?v={u2}")
-                    continue
+        latest, older = batches[0], batches[1:]
+        for b in older:
+            self.queue_store.close_batch(b.id)
 
-            urls.append(base_url)
+        ans = QMessageBox.question(
+            self,
+            tr(self.lang, "title_resume"),
+            tr(self.lang, "resume_q", n=len(latest.items)),
+        )
+        if ans != QMessageBox.StandardButton.Yes:
+            self.queue_store.close_batch(latest.id)
+            return
 
-        return urls
+        # ayarları partiyle aynı yap: aynı outtmpl/format => aynı .part dosyaları
+        if latest.out_dir and os.path.isdir(latest.out_dir):
+            self.update_save_path(latest.out_dir)
+        idx = self.format_combo.findData(latest.fmt)
+        if idx >= 0:
+            self.format_combo.setCurrentIndex(idx)
+        idx = self.quality_combo.findText(latest.quality)
+        if idx >= 0:
+            self.quality_combo.setCurrentIndex(idx)
+        idx = self.frag_combo.findData(latest.frag_mode)
+        if idx >= 0:
+            self.frag_combo.setCurrentIndex(idx)
+
+        self.reset_thumbs()
+        self.playlist_model.clear()
+        self.playlist_model.append_entries([
+            {"title": it.title, "id": it.video_id, "ie_key": it.extractor, "webpage_url": it.url}
+            for it in latest.items
+        ])
+        self.start_download(items=latest.items, batch_id=latest.id)
 
     def start_or_stop_download(self):
         if self.is_downloading:
@@ -891,12 +1569,12 @@ class MediaDownloader(MediaDownloaderUI):
             self.download_button.setText(tr(self.lang, "btn_start"))
             return
 
-        if self.playlist_list.count() == 0:
+        if self.playlist_model.source_count() == 0:
             self.analyze_link()
             return
 
-        urls = self.selected_urls()
-        if not urls:
+        items = self.playlist_model.checked_items(self.url_input.text().strip())
+        if not items:
             QMessageBox.warning(self, tr(self.lang, "title_warn"), tr(self.lang, "select_one"))
             return
 
@@ -904,6 +1582,9 @@ class MediaDownloader(MediaDownloaderUI):
             QMessageBox.warning(self, tr(self.lang, "title_warn"), tr(self.lang, "select_folder"))
             return
 
+        self.start_download(items)
+
+    def start_download(self, items: List[QueueItem], batch_id: Optional[int] = None):
         if not which_ffmpeg() and not self.ffmpeg_bin_dir:
             self.startup_check_requirements()
 
@@ -913,20 +1594,26 @@ class MediaDownloader(MediaDownloaderUI):
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
         self.info_label.setText(tr(self.lang, "downloading"))
+        self.tracker.reset([])
+        self.playlist_list.viewport().update()
 
         self.dl_thread = QThread(self)
-        self.dl_worker = DownloadWorker(
-            urls=urls,
+        self.dl_worker = DownloadWorker(DownloadBatch(
+            items=items,
             out_dir=self.download_folder,
-            fmt_text=self.format_combo.currentText(),
+            fmt_text=self.format_code(),
             q_text=self.quality_combo.currentText(),
+            frag_mode=str(self.frag_combo.currentData() or FRAGMENTS_AUTO),
             ffmpeg_bin=self.ffmpeg_bin_dir,
-            lang=self.lang,
-        )
+            scheduler=self.scheduler,
+            tracker=self.tracker,
+            index=self.index,
+            queue_store=self.queue_store,
+            batch_id=batch_id,
+        ))
         self.dl_worker.moveToThread(self.dl_thread)
 
         self.dl_thread.started.connect(self.dl_worker.run)
-        self.dl_worker.sig_progress.connect(self.on_dl_progress, Qt.ConnectionType.QueuedConnection)
         self.dl_worker.sig_done.connect(self.on_dl_done, Qt.ConnectionType.QueuedConnection)
         self.dl_worker.sig_error.connect(self.on_dl_error, Qt.ConnectionType.QueuedConnection)
 
@@ -936,17 +1623,69 @@ class MediaDownloader(MediaDownloaderUI):
         self.dl_thread.finished.connect(self.dl_thread.deleteLater)
 
         self.dl_thread.start()
-
-    def on_dl_progress(self, percent: int, text: str):
-        if percent < 0:
+        self.progress_timer.start()
+
+    def item_status_text(self, p: ItemProgress) -> str:
+        if p.state == P_QUEUED:
+            return tr(self.lang, "st_queued")
+        if p.state == P_POST:
+            return tr(self.lang, "converting")
+        if p.state == P_DONE:
+            return f"{tr(self.lang, 'st_done')} · {human_mb(p.done_b)}"
+        if p.state == P_SKIPPED:
+            return tr(self.lang, "st_have")
+        if p.state == P_ERROR:
+            if p.kind:
+                return f"{tr(self.lang, 'st_error')} ({tr(self.lang, 'kind_' + p.kind)})"
+            return tr(self.lang, "st_error")
+        if p.state == P_RETRYING:
+            return tr(
+                self.lang, "st_retry", n=p.attempt, max=self.scheduler.retry.attempts,
+                eta=human_eta(p.retry_at - time.monotonic()),
+            )
+        if p.state == P_CANCELLED:
+            return tr(self.lang, "st_cancelled")
+        if p.state == P_PAUSED:
+            total = human_mb(p.total_b) if p.total_b else "?"
+            return f"{tr(self.lang, 'st_paused')} · {human_mb(p.done_b)} / {total}"
+        total = human_mb(p.total_b) if p.total_b else "?"
+        text = f"{human_mb(p.done_b)} / {total} | {human_speed(p.speed)} | ETA: {human_eta(p.eta)}"
+        if p.frags:
+            text += f" | {tr(self.lang, 'frag_n', n=p.frags)}"
+        return text
+
+    def poll_progress(self):
+        # ~10 Hz: sadece değişen satırlar yenilenir; metinler boyanırken üretilir
+        # geri sayım: bekleyen yeniden denemeler de her turda yenilenir
+        dirty = self.tracker.take_dirty() | self.tracker.retrying_keys()
+        if not dirty:
+            return
+        for key in dirty:
+            self.playlist_model.refresh_key(key)
+        self.update_summary()
+
+    def update_summary(self, final: bool = False):
+        a = self.tracker.aggregate()
+        pct = a.percent
+        if pct is None:
             self.progress_bar.setRange(0, 0)
         else:
             if self.progress_bar.minimum() == 0 and self.progress_bar.maximum() == 0:
                 self.progress_bar.setRange(0, 100)
-            self.progress_bar.setValue(percent)
-        self.info_label.setText(text)
+            self.progress_bar.setValue(pct)
+
+        self.info_label.setText(tr(
+            self.lang, "summary",
+            done=a.done, total=a.items, failed=a.failed,
+            mb=f"{human_mb(a.done_b)} / {human_mb(a.total_b) if a.total_b else '?'}",
+            # bitince anlık hız yerine ortalama toplu hız (Ø) göster
+            speed=f"Ø {human_speed(a.avg_speed)}" if final else human_speed(a.speed),
+            eta=human_eta(a.elapsed if final else a.eta),
+        ))
 
     def finish_download_ui(self):
+        self.progress_timer.stop()
+        self.poll_progress()
         self.is_downloading = False
         self.download_button.setText(tr(self.lang, "btn_start"))
         self.progress_bar.setRange(0, 100)
@@ -955,9 +1694,41 @@ class MediaDownloader(MediaDownloaderUI):
         self.dl_worker = None
         self.dl_thread = None
 
-    def on_dl_done(self):
-        QMessageBox.information(self, tr(self.lang, "title_ok"), tr(self.lang, "done"))
+    def on_dl_done(self, report: BatchReport):
+        titles = {it.key: it.title for it in self.dl_worker.batch.items} if self.dl_worker else {}
         self.finish_download_ui()
+        self.update_summary(final=True)
+        self.progress_bar.setValue(0)
+        self.show_report(report, titles)
+
+    def show_report(self, report: BatchReport, titles: Dict[str, str]):
+        # modal değil: pencere kullanılmaya devam edebilir
+        text = tr(
+            self.lang, "report", done=report.done, skipped=report.skipped,
+            failed=report.failed_count, retried=report.retried,
+        )
+        box = QMessageBox(self)
+        box.setWindowModality(Qt.WindowModality.NonModal)
+        box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        if report.ok:
+            box.setIcon(QMessageBox.Icon.Information)
+            box.setWindowTitle(tr(self.lang, "title_ok"))
+            box.setText(f"{tr(self.lang, 'done')}\n{text}")
+        else:
+            box.setIcon(QMessageBox.Icon.Warning)
+            box.setWindowTitle(tr(self.lang, "title_error"))
+            kinds = " · ".join(
+                f"{tr(self.lang, 'kind_' + kind)}: {len(jobs)}" for kind, jobs in sorted(report.failed.items())
+            )
+            box.setText(f"{text}\n{kinds}")
+            if AUTH in report.failed:
+                box.setInformativeText(tr(self.lang, "report_auth"))
+            lines = [tr(self.lang, "report_failed")]
+            for kind, jobs in sorted(report.failed.items()):
+                for job in jobs:
+                    lines.append(f"[{tr(self.lang, 'kind_' + kind)}] {titles.get(job.key) or job.url}\n    {job.error}")
+            box.setDetailedText("\n".join(lines))
+        box.show()
 
     def on_dl_error(self, msg: str):
         if msg == "USER_STOP":
@@ -966,10 +1737,32 @@ class MediaDownloader(MediaDownloaderUI):
         QMessageBox.critical(self, tr(self.lang, "title_error"), tr(self.lang, "dl_error", msg=msg))
         self.finish_download_ui()
 
+    def closeEvent(self, event):
+        self.stop_analysis()
+        self.thumb_loader.shutdown()
+        self.estimator.shutdown()
+        if self.api:
+            self.api.shutdown()
+        if self.dl_worker and self.dl_thread:
+            # yarım kalan kuyruk bir sonraki açılışta devam ettirilebilsin
+            self.dl_worker.abandon()
+            self.dl_thread.quit()
+            self.dl_thread.wait(3000)
+        self.scheduler.shutdown()
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
-    app = QApplication([])
+    profile.mark("imports")
+    app = QApplication(sys.argv)
     app.setStyle("Fusion")
     win = MediaDownloader()
+    profile.mark("window created")
     win.show()
-    app.exec()
+    if profile.enabled:
+        # ilk boyama + event loop; ölçüm bitince çık
+        QTimer.singleShot(0, lambda: (warm_up_async().join(), profile.mark("yt-dlp ready"), app.quit()))
+        app.exec()
+        profile.dump()
+    else:
+        app.exec()
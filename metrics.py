@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+# Aşama süreleri, sayaçlar ve iz (trace) kaydı (Qt-free, sadece stdlib).
+#   aşamalar: queue, extract, format, connect, transfer, merge, postprocess, move
+#             (+ analyze / probe: liste analizi ve boyut tahmini)
+#   sayaçlar: bayt, öğe (duruma göre), hata / yeniden deneme (türe göre)
+# Prometheus metin biçimi: render() => API'de GET /metrics
+# JSONL iz: MEDIA_DL_TRACE=/yol/trace.jsonl (ya da cli --trace); her aşama ve
+# her bitmiş öğe bir satır => binlerce indirmede darboğaz sonradan aranabilir.
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+# ad -> (tür, açıklama)
+_HELP: Dict[str, Tuple[str, str]] = {
+    "media_dl_stage_seconds": ("histogram", "Time spent in each pipeline stage"),
+    "media_dl_bytes_total": ("counter", "Bytes downloaded"),
+    "media_dl_items_total": ("counter", "Finished items by final state"),
+    "media_dl_errors_total": ("counter", "Failed items by error kind"),
+    "media_dl_retries_total": ("counter", "Retries scheduled by error kind"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _num(v: float) -> str:
+    return repr(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        # stage -> [kova sayıları..., toplam, adet]
+        self._hist: Dict[Labels, List[float]] = {}
+        self._gauges: Dict[str, Tuple[str, str, Callable[[], float]]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, stage: str, seconds: float):
+        key = _labels({"stage": stage})
+        with self._lock:
+            h = self._hist.get(key)
+            if h is None:
+                h = self._hist[key] = [0.0] * (len(STAGE_BUCKETS) + 2)
+            for i, b in enumerate(STAGE_BUCKETS):
+                if seconds <= b:
+                    h[i] += 1
+            h[-2] += seconds
+            h[-1] += 1
+
+    def gauge(self, name: str, fn: Callable[[], float], help: str = "", kind: str = "gauge"):
+        # okunduğu anda hesaplanan değer (kuyruk uzunluğu, havuz istatistiği ...); aynı ad => yenisi geçerli
+        with self._lock:
+            self._gauges[name] = (kind, help, fn)
+
+    def snapshot(self) -> Dict[str, Any]:
+        # JSON (bench / hata ayıklama): aşama başına adet ve toplam süre, sayaçlar
+        with self._lock:
+            stages = {dict(k)["stage"]: {"count": int(h[-1]), "seconds": round(h[-2], 4)} for k, h in self._hist.items()}
+            counters = {
+                name: {",".join(f"{k}={v}" for k, v in key) or "": val for key, val in series.items()}
+                for name, series in self._counters.items()
+            }
+        return {"stages": stages, "counters": counters}
+
+    def render(self) -> str:
+        # Prometheus metin biçimi (0.0.4)
+        out: List[str] = []
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            hist = {k: list(h) for k, h in self._hist.items()}
+            gauges = dict(self._gauges)
+
+        name = "media_dl_stage_seconds"
+        out += [f"# HELP {name} {_HELP[name][1]}", f"# TYPE {name} histogram"]
+        for key in sorted(hist):
+            h = hist[key]
+            for i, b in enumerate(STAGE_BUCKETS):
+                out.append(f"{name}_bucket{_fmt_labels(key + (('le', f'{b:g}'),))} {_num(h[i])}")
+            out.append(f"{name}_bucket{_fmt_labels(key + (('le', '+Inf'),))} {_num(h[-1])}")
+            out.append(f"{name}_sum{_fmt_labels(key)} {_num(round(h[-2], 6))}")
+            out.append(f"{name}_count{_fmt_labels(key)} {_num(h[-1])}")
+
+        for name in sorted(set(counters) | {n for n, (t, _) in _HELP.items() if t == "counter"}):
+            kind, text = _HELP.get(name, ("counter", ""))
+            out += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+            series = counters.get(name) or ({(): 0} if name == "media_dl_bytes_total" else {})
+            for key in sorted(series):
+                out.append(f"{name}{_fmt_labels(key)} {_num(series[key])}")
+
+        for name in sorted(gauges):
+            kind, text, fn = gauges[name]
+            try:
+                v = float(fn())
+            except Exception:
+                continue
+            out += [f"# HELP {name} {text}", f"# TYPE {name} {kind}", f"{name} {_num(v)}"]
+        return "\n".join(out) + "\n"
+
+
+class Tracer:
+    # JSONL; yazılamazsa sessizce kapanır (indirme etkilenmez)
+
+    def __init__(self, path: str = ""):
+        self._lock = threading.Lock()
+        self._f: Any = None
+        self.path = ""
+        if path:
+            self.open(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._f is not None
+
+    def open(self, path: str):
+        path = os.path.expanduser(path)
+        with self._lock:
+            self.close_locked()
+            try:
+                self._f = open(path, "a", encoding="utf-8", buffering=1)
+                self.path = path
+            except OSError:
+                self._f = None
+
+    def close_locked(self):
+        if self._f is not None:
+            try:
+                self._f.close()
+            except OSError:
+                pass
+            self._f = None
+
+    def close(self):
+        with self._lock:
+            self.close_locked()
+
+    def emit(self, record: Dict[str, Any]):
+        if self._f is None:
+            return
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._f is None:
+                return
+            try:
+                self._f.write(line + "\n")
+            except (OSError, ValueError):
+                self.close_locked()
+
+
+METRICS = Metrics()
+TRACE = Tracer(os.environ.get("MEDIA_DL_TRACE", ""))
+
+
+def record(stage: str, seconds: float, key: str = "", job: int = 0, **attrs: Any):
+    METRICS.observe(stage, seconds)
+    if TRACE.enabled:
+        TRACE.emit({
+            "ts": round(time.time(), 3), "type": "stage", "stage": stage,
+            "dur": round(seconds, 6), "key": key, "job": job, **attrs,
+        })
+
+
+@contextmanager
+def span(stage: str, key: str = "", **attrs: Any) -> Iterator[Dict[str, Any]]:
+    # with span("probe", key=url) as a: ...; a["formats"] = n  (iz satırına eklenir)
+    t0 = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        record(stage, time.perf_counter() - t0, key=key, **attrs)
+
+
+def trace_item(record_: Dict[str, Any]):
+    # bitmiş öğe özeti (durum, bayt, deneme, aşama toplamları)
+    if TRACE.enabled:
+        TRACE.emit({"ts": round(time.time(), 3), "type": "item", **record_})
+
+
+def add_bytes(n: int):
+    if n > 0:
+        METRICS.inc("media_dl_bytes_total", n)
+
+
+def count(name: str, value: float = 1, **labels: Any):
+    METRICS.inc(name, value, **labels)
+
+
+def gauge(name: str, fn: Callable[[], float], help: str = "", kind: str = "gauge"):
+    METRICS.gauge(name, fn, help, kind)
+
+
+def render() -> str:
+    return METRICS.render()
+
+
+def snapshot() -> Dict[str, Any]:
+    return METRICS.snapshot()
+
+
+def open_trace(path: str):
+    TRACE.open(path)
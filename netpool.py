@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+# Paylaşılan keep-alive HTTP(S) bağlantı havuzu + DNS önbelleği.
+# Analiz, boyut tahmini, indirmeler (hepsi yt-dlp) ve thumbnail'lar aynı
+# havuzdan bağlantı alır: aynı CDN host'una her istekte yeni TCP + TLS el
+# sıkışması yapılmaz, host adı her bağlantıda yeniden çözülmez.
+# - urllib: urlopen() (PooledHTTPHandler / PooledHTTPSHandler)
+# - yt-dlp: install_ydl_handler() => UrllibRH'nin havuzlu türevi tercih edilir
+# HTTP/1.1 keep-alive; proxy (http/socks) kullanan istekler havuza girmez.
+# Ağır import'lar (ssl, http.client) burada: modül ilk ağ isteğinde yüklenir.
+
+import http.client
+import os
+import select
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import metrics
+
+POOL_PER_HOST = 8  # host başına boşta tutulan en fazla bağlantı
+POOL_IDLE = 50.0  # sn; daha uzun boşta kalan bağlantıyı sunucu büyük ihtimalle kapatmıştır
+DNS_TTL = 300.0  # sn; 0 => önbellek yok
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def pool_enabled() -> bool:
+    # MEDIA_DL_POOL=0 => eski davranış (her istek yeni bağlantı)
+    return os.environ.get("MEDIA_DL_POOL", "1") != "0"
+
+
+# ----------------------------
+# DNS
+# ----------------------------
+
+class DnsCache:
+    def __init__(self, ttl: float = DNS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> List[Any]:
+        key = (host, port)
+        now = time.monotonic()
+        if self.ttl > 0:
+            with self._lock:
+                hit = self._cache.get(key)
+                if hit and hit[0] > now:
+                    self.hits += 1
+                    return hit[1]
+        addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        with self._lock:
+            self.misses += 1
+            if self.ttl > 0 and addrs:
+                self._cache[key] = (now + self.ttl, addrs)
+        return addrs
+
+    def forget(self, host: str, port: int):
+        with self._lock:
+            self._cache.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+DNS = DnsCache(_env_float("MEDIA_DL_DNS_TTL", DNS_TTL))
+
+
+def create_connection(
+    address: Tuple[str, int],
+    timeout: Any = socket._GLOBAL_DEFAULT_TIMEOUT,  # type: ignore[attr-defined]
+    source_address: Optional[Tuple[str, int]] = None,
+) -> socket.socket:
+    # socket.create_connection gibi; çözümleme önbellekten. Hiçbir adrese
+    # bağlanılamazsa kayıt silinir (host taşınmış olabilir).
+    host, port = address
+    addrs = DNS.resolve(host, port)
+    if source_address is not None:
+        af = socket.AF_INET6 if ":" in source_address[0] else socket.AF_INET
+        addrs = [a for a in addrs if a[0] == af]
+    err: Optional[OSError] = None
+    for af, socktype, proto, _, sa in addrs:
+        sock = None
+        try:
+            sock = socket.socket(af, socktype, proto)
+            if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:  # type: ignore[attr-defined]
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sa)
+            return sock
+        except OSError as ex:
+            err = ex
+            if sock is not None:
+                sock.close()
+    DNS.forget(host, port)
+    raise err or OSError(f"no usable address for {host}")
+
+
+# ----------------------------
+# Pool
+# ----------------------------
+
+class _PooledResponse(http.client.HTTPResponse):
+    # gövde sonuna kadar okununca bağlantı havuza döner; yarıda kapatılırsa atılır
+    _release: Optional[Callable[[bool], None]] = None
+    _closing = False
+
+    def close(self):
+        self._closing = True
+        super().close()
+
+    def _close_conn(self):
+        super()._close_conn()
+        release, self._release = self._release, None
+        if release:
+            release(not self._closing and not self.will_close)
+
+
+PoolKey = Tuple[str, str, Any, Any]  # (şema, host:port, ssl context, kaynak adres)
+
+
+class ConnectionPool:
+    def __init__(self, per_host: int = POOL_PER_HOST, idle: float = POOL_IDLE):
+        self.per_host = max(1, per_host)
+        self.idle = idle
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, Deque[Tuple[float, http.client.HTTPConnection]]] = {}
+        self.opened = 0
+        self.reused = 0
+
+    def acquire(
+        self, key: PoolKey, factory: Callable[[], http.client.HTTPConnection]
+    ) -> Tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        stale: List[http.client.HTTPConnection] = []
+        conn = None
+        with self._lock:
+            q = self._idle.get(key)
+            while q:
+                t, c = q.pop()  # en son bırakılan (en sıcak)
+                if now - t < self.idle and _alive(c):
+                    conn = c
+                    self.reused += 1
+                    break
+                stale.append(c)
+            if conn is None:
+                self.opened += 1
+        for c in stale:
+            c.close()
+        if conn is not None:
+            return conn, True
+        return factory(), False
+
+    def release(self, key: PoolKey, conn: http.client.HTTPConnection, reuse: bool):
+        if not reuse or conn.sock is None:
+            conn.close()
+            return
+        drop = None
+        with self._lock:
+            q = self._idle.setdefault(key, deque())
+            q.append((time.monotonic(), conn))
+            if len(q) > self.per_host:
+                drop = q.popleft()[1]
+        if drop is not None:
+            drop.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            idle = sum(len(q) for q in self._idle.values())
+        return {
+            "opened": self.opened, "reused": self.reused, "idle": idle,
+            "dns_hits": DNS.hits, "dns_misses": DNS.misses,
+        }
+
+    def clear(self):
+        with self._lock:
+            conns = [c for q in self._idle.values() for _, c in q]
+            self._idle.clear()
+        for c in conns:
+            c.close()
+
+
+def _alive(conn: http.client.HTTPConnection) -> bool:
+    # boştaki bağlantı okunabilir görünüyorsa sunucu kapatmış (EOF) ya da beklenmedik veri var
+    sock = conn.sock
+    if sock is None:
+        return False
+    try:
+        r, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return False
+    return not r
+
+
+POOL = ConnectionPool(
+    int(_env_float("MEDIA_DL_POOL_PER_HOST", POOL_PER_HOST)),
+    _env_float("MEDIA_DL_POOL_IDLE", POOL_IDLE),
+)
+
+metrics.gauge("media_dl_http_connections_opened_total", lambda: POOL.opened, "HTTP connections opened", "counter")
+metrics.gauge("media_dl_http_connections_reused_total", lambda: POOL.reused, "Requests served on a kept-alive connection", "counter")
+metrics.gauge("media_dl_dns_cache_hits_total", lambda: DNS.hits, "Host lookups answered from the DNS cache", "counter")
+
+# boştaki bağlantı sunucu tarafından kapatılmışsa istek bir kez yeni bağlantıyla tekrarlanır
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+
+def open_pooled(
+    req: urllib.request.Request,
+    context: Optional[ssl.SSLContext] = None,
+    source_address: Optional[Tuple[str, int]] = None,
+    debuglevel: int = 0,
+    pool: Optional[ConnectionPool] = None,
+) -> http.client.HTTPResponse:
+    # urllib.request.AbstractHTTPHandler.do_open'ın keep-alive hali
+    pool = pool or POOL
+    host = req.host
+    if not host:
+        raise urllib.error.URLError("no host given")
+    https = req.type == "https"
+    key: PoolKey = (req.type, host, context if https else None, source_address)
+
+    def factory() -> http.client.HTTPConnection:
+        if https:
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(host, timeout=req.timeout, context=context)
+        else:
+            conn = http.client.HTTPConnection(host, timeout=req.timeout)
+        conn._create_connection = create_connection  # type: ignore[attr-defined]
+        conn.response_class = _PooledResponse
+        if source_address:
+            conn.source_address = source_address
+        conn.set_debuglevel(debuglevel)
+        return conn
+
+    headers = dict(req.unredirected_hdrs)
+    headers.update({k: v for k, v in req.headers.items() if k not in headers})
+    headers = {name.title(): val for name, val in headers.items()}
+    headers.pop("Connection", None)  # HTTP/1.1 varsayılanı keep-alive
+
+    for attempt in (0, 1):
+        conn, reused = pool.acquire(key, factory)
+        conn.timeout = req.timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(req.timeout)
+        try:
+            try:
+                conn.request(
+                    req.get_method(), req.selector, req.data, headers,
+                    encode_chunked=req.has_header("Transfer-encoding"),
+                )
+            except OSError as ex:
+                if reused and attempt == 0 and isinstance(ex, _STALE_ERRORS):
+                    conn.close()
+                    continue
+                raise urllib.error.URLError(ex)
+            r = conn.getresponse()
+        except _STALE_ERRORS:
+            conn.close()
+            if reused and attempt == 0:
+                continue
+            raise
+        except BaseException:
+            conn.close()
+            raise
+        break
+
+    r._release = lambda reuse, conn=conn: pool.release(key, conn, reuse)  # type: ignore[attr-defined]
+    r.url = req.get_full_url()
+    r.msg = r.reason  # type: ignore[assignment]
+    return r
+
+
+class PooledHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        if req.has_proxy():
+            return super().http_open(req)
+        return open_pooled(req, debuglevel=self._debuglevel)
+
+
+class PooledHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        if req._tunnel_host:
+            return super().https_open(req)
+        return open_pooled(req, self._context, debuglevel=self._debuglevel)
+
+
+_opener: Optional[urllib.request.OpenerDirector] = None
+_opener_lock = threading.Lock()
+
+
+def urlopen(req: Any, timeout: float = 10.0):
+    # urllib.request.urlopen yerine (thumbnail'lar vb.); tek SSL context, paylaşılan havuz
+    global _opener
+    if _opener is None:
+        with _opener_lock:
+            if _opener is None:
+                ctx = ssl.create_default_context()
+                _opener = urllib.request.build_opener(PooledHTTPHandler(), PooledHTTPSHandler(context=ctx))
+    if not pool_enabled():
+        return urllib.request.urlopen(req, timeout=timeout)
+    return _opener.open(req, timeout=timeout)
+
+
+# ----------------------------
+# yt-dlp
+# ----------------------------
+
+_ydl_installed = False
+
+
+def install_ydl_handler():
+    # yt_dlp import edildikten sonra, ilk YoutubeDL'den önce bir kez (core.ydl_module).
+    # yt-dlp'nin urllib işleyicisiyle aynı (başlıklar, gzip/br, çerez, yönlendirme),
+    # sadece bağlantılar havuzdan. SSL context'i seçenek başına bir tane: her
+    # YoutubeDL örneği ayrı context kursa havuz anahtarları hiç eşleşmezdi.
+    global _ydl_installed
+    with _opener_lock:
+        if _ydl_installed or not pool_enabled():
+            return
+        _ydl_installed = True
+
+    from yt_dlp.networking import _urllib as ydl_urllib
+    from yt_dlp.networking.common import register_preference, register_rh
+
+    class YdlPooledHTTPHandler(ydl_urllib.HTTPHandler):
+        def http_open(self, req):
+            if req.has_header("Ytdl-socks-proxy") or req.has_proxy():
+                return super().http_open(req)
+            return open_pooled(req, None, self._source_address, self._debuglevel)
+
+        def https_open(self, req):
+            if req.has_header("Ytdl-socks-proxy") or req._tunnel_host:
+                return super().https_open(req)
+            return open_pooled(req, self._context, self._source_address, self._debuglevel)
+
+    contexts: Dict[Any, ssl.SSLContext] = {}
+    ctx_lock = threading.Lock()
+
+    class PooledUrllibRH(ydl_urllib.UrllibRH):
+        RH_NAME = "urllib+pool"
+
+        def _make_sslcontext(self, legacy_ssl_support=None):
+            legacy = legacy_ssl_support if legacy_ssl_support is not None else self.legacy_ssl_support
+            key = (self.verify, bool(legacy), self.prefer_system_certs, tuple(sorted(self._client_cert.items())))
+            with ctx_lock:
+                ctx = contexts.get(key)
+                if ctx is None:
+                    ctx = contexts[key] = super()._make_sslcontext(legacy_ssl_support=legacy_ssl_support)
+            return ctx
+
+        def _create_instance(self, proxies, cookiejar, legacy_ssl_support=None):
+            base = super()._create_instance(proxies, cookiejar, legacy_ssl_support=legacy_ssl_support)
+            opener = urllib.request.OpenerDirector()
+            for h in list(base.handlers):
+                if type(h) is ydl_urllib.HTTPHandler:
+                    h = YdlPooledHTTPHandler(
+                        debuglevel=h._debuglevel, context=h._context, source_address=h._source_address,
+                    )
+                opener.add_handler(h)
+            opener.addheaders = []
+            return opener
+
+    register_rh(PooledUrllibRH)
+
+    @register_preference(PooledUrllibRH)
+    def _prefer_pool(rh, request):
+        return 200  # requests/urllib'den önce (onların bağlantıları YoutubeDL örneğine özel)
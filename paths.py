@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+APP_DIR_NAME = "media-downloader"
+
+
+def cache_dir(*parts: str) -> Path:
+    # $XDG_CACHE_HOME/media-downloader/... (varsayılan ~/.cache)
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    p = Path(base, APP_DIR_NAME, *parts)
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
+def data_dir(*parts: str) -> Path:
+    # $XDG_DATA_HOME/media-downloader/... (varsayılan ~/.local/share)
+    base = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    p = Path(base, APP_DIR_NAME, *parts)
+    p.mkdir(parents=True, exist_ok=True)
+    return p
@@ -0,0 +1,458 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QEvent, QRect
+from PyQt6.QtGui import QIcon, QPixmap, QColor
+from PyQt6.QtWidgets import QStyledItemDelegate
+
+from core import QueueItem, ROW_COLUMNS, entry_row, entry_key
+from search import SearchIndex
+from progress import ProgressTracker, ItemProgress, P_DONE, P_ERROR, P_CANCELLED, P_PAUSED, P_RETRYING, P_SKIPPED
+
+
+ROW_HEIGHT = 106
+ICON_CACHE_MAX = 512  # bellekte tutulan QIcon sayısı (görünür satırlar + biraz pay)
+
+UrlRole = Qt.ItemDataRole.UserRole + 1
+IdRole = Qt.ItemDataRole.UserRole + 2
+ThumbRole = Qt.ItemDataRole.UserRole + 3
+TitleRole = Qt.ItemDataRole.UserRole + 4
+ProgressRole = Qt.ItemDataRole.UserRole + 5
+
+
+def elide(text: str, max_chars: int = 70) -> str:
+    s = (text or "").strip()
+    if len(s) <= max_chars:
+        return s
+    return s[: max_chars - 1].rstrip() + "…"
+
+
+class PlaylistModel(QAbstractListModel):
+    # Playlist girdileri kolon bazlı saklanır; yt-dlp info dict'leri tutulmaz.
+    # Görünüm sadece ekrandaki satırlar için data() ister, bu yüzden thumbnail
+    # istekleri de tembel: ilk boyamada istenir.
+    # Arama filtresi model tarafında: görünür satırlar => kaynak satır listesi
+    # (setRowHidden yok). Aşağıdaki metotlar aksi belirtilmedikçe kaynak satır alır.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.titles: List[str] = []
+        self.durations: List[str] = []
+        self.urls: List[str] = []
+        self.ids: List[str] = []
+        self.thumbs: List[str] = []
+        self.extractors: List[str] = []
+        self.channels: List[str] = []
+        self.seconds: List[int] = []
+        self.checked = bytearray()
+        self.have = bytearray()  # indekste zaten var
+        self._key_rows: Dict[str, int] = {}
+
+        self.progress: Optional[ProgressTracker] = None
+        self.thumb_request: Optional[Callable[[str], None]] = None
+        self._icons: "OrderedDict[str, QIcon]" = OrderedDict()
+        self._requested: set = set()
+        self._thumb_rows: Dict[str, List[int]] = {}
+
+        self.search = SearchIndex()
+        self._query = ""
+        self._visible: Optional[List[int]] = None  # None => filtre yok
+        self._vpos: Optional[Dict[int, int]] = None  # kaynak => görünür (tembel)
+
+    # ---- Qt model API ----
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.titles) if self._visible is None else len(self._visible)
+
+    def source_count(self) -> int:
+        return len(self.titles)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        r = self._src(index.row())
+        if r < 0:
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{elide(self.titles[r], 70)} [{self.durations[r]}]"
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self.checked[r] else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon_for(self.thumbs[r])
+        if role == Qt.ItemDataRole.SizeHintRole:
+            return QSize(0, ROW_HEIGHT)
+        if role == UrlRole:
+            return self.urls[r]
+        if role == IdRole:
+            return self.ids[r]
+        if role == ThumbRole:
+            return self.thumbs[r]
+        if role == TitleRole:
+            return self.titles[r]
+        if role == ProgressRole:
+            p = self.progress.get(self.row_key(r)) if self.progress else None
+            if p is None and self.have[r]:
+                p = ItemProgress(self.row_key(r), state=P_SKIPPED)
+            return p
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        r = self._src(index.row())
+        if r < 0:
+            return False
+        v = value.value if isinstance(value, Qt.CheckState) else int(value)
+        self.checked[r] = 1 if v == Qt.CheckState.Checked.value else 0
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable
+
+    # ---- entries ----
+
+    def clear(self):
+        self.beginResetModel()
+        for name in ROW_COLUMNS:
+            getattr(self, name).clear()
+        self.checked = bytearray()
+        self.have = bytearray()
+        self._key_rows.clear()
+        self._icons.clear()
+        self._requested.clear()  # iptal edilen thumbnail istekleri yeniden istenebilsin
+        self._thumb_rows.clear()
+        self.search.clear()
+        self._set_visible(None if self.search.search(self._query) is None else [])
+        self.endResetModel()
+
+    def append_entries(self, entries: List[Dict[str, Any]], checked: bool = True):
+        rows = [e for e in entries if isinstance(e, dict)]
+        if not rows:
+            return
+        first = len(self.titles)
+        if self._visible is None:
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._store(rows, checked)
+            self.endInsertRows()
+        else:
+            self._store(rows, checked)
+            self._insert_matches(first)
+
+    def append_columns(self, cols: Dict[str, List[str]], checked: bool = True):
+        # önbellekten toplu yükleme: girdi başına ayrıştırma yok
+        n = len(cols.get("ids") or [])
+        if not n:
+            return
+        first = len(self.titles)
+        filtered = self._visible is not None
+        if not filtered:
+            self.beginInsertRows(QModelIndex(), first, first + n - 1)
+        for name in ROW_COLUMNS:
+            col = cols.get(name)
+            if not col or len(col) != n:
+                col = [0 if name == "seconds" else ""] * n  # eski önbellek kayıtlarında olmayan kolonlar
+            getattr(self, name).extend(col)
+        self.checked.extend(bytes([1 if checked else 0]) * n)
+        self.have.extend(bytes(n))
+        self._index_rows(first)
+        if filtered:
+            self._insert_matches(first)
+        else:
+            self.endInsertRows()
+
+    def _store(self, entries: List[Dict[str, Any]], checked: bool = True):
+        first = len(self.titles)
+        cols = [getattr(self, name) for name in ROW_COLUMNS]
+        for e in entries:
+            if not isinstance(e, dict):
+                continue
+            for col, v in zip(cols, entry_row(e)):
+                col.append(v)
+            self.checked.append(1 if checked else 0)
+            self.have.append(0)
+        self._index_rows(first)
+
+    def _index_rows(self, first: int):
+        # toplu: satır başına setdefault yerine dict birleştirme (önceki satırlar öncelikli)
+        n = len(self.titles)
+        self.search.extend(self.titles[first:], self.channels[first:], self.seconds[first:])
+        keys = [
+            i or u or f"#{r}"
+            for r, i, u in zip(range(first, n), self.ids[first:], self.urls[first:])
+        ]
+        rows = dict(zip(reversed(keys), range(n - 1, first - 1, -1)))
+        rows.update(self._key_rows)
+        self._key_rows = rows
+
+        thumb_rows = self._thumb_rows
+        for r, thumb in enumerate(self.thumbs[first:], first):
+            if thumb:
+                lst = thumb_rows.get(thumb)
+                if lst is None:
+                    thumb_rows[thumb] = [r]
+                else:
+                    lst.append(r)
+
+    def apply_diff(self, entries: List[Dict[str, Any]], checked: bool = True) -> Tuple[int, int]:
+        # yeniden analiz sonucu: kaybolan satırlar silinir, yeniler sona eklenir
+        # (mevcut satırların seçim/ikon durumu korunur)
+        new_keys = set()
+        for e in entries:
+            if isinstance(e, dict):
+                new_keys.add(entry_key(e))
+        gone = [r for r in range(len(self.titles)) if self.row_key(r) not in new_keys]
+        self.remove_rows(gone)
+
+        old_keys = set(self._key_rows)
+        added = [
+            e for e in entries
+            if isinstance(e, dict) and entry_key(e) not in old_keys
+        ]
+        self.append_entries(added, checked)
+        return len(added), len(gone)
+
+    def remove_rows(self, rows: List[int]):
+        if not rows:
+            return
+        # ardışık aralıklar sondan başa silinir
+        ranges: List[List[int]] = []
+        for r in sorted(set(rows)):
+            if ranges and ranges[-1][1] == r - 1:
+                ranges[-1][1] = r
+            else:
+                ranges.append([r, r])
+
+        filtered = self._visible is not None
+        if filtered:
+            self.beginResetModel()
+        for first, last in reversed(ranges):
+            if not filtered:
+                self.beginRemoveRows(QModelIndex(), first, last)
+            for name in ROW_COLUMNS:
+                del getattr(self, name)[first:last + 1]
+            del self.checked[first:last + 1]
+            del self.have[first:last + 1]
+            if not filtered:
+                self.endRemoveRows()
+        self._reindex()
+        if filtered:
+            self._set_visible(self.search.search(self._query))
+            self.endResetModel()
+
+    def _reindex(self):
+        self._key_rows.clear()
+        self._thumb_rows.clear()
+        self.search.clear()
+        self._index_rows(0)
+
+    # ---- filter ----
+
+    def set_filter(self, text: str):
+        # metin + dur:/channel: filtreleri (search.py)
+        self._query = text or ""
+        rows = self.search.search(self._query)
+        if rows is self._visible or (rows is not None and rows == self._visible):
+            return
+        self.beginResetModel()
+        self._set_visible(rows)
+        self.endResetModel()
+
+    def _set_visible(self, rows: Optional[List[int]]):
+        self._visible = None if rows is None else list(rows)
+        self._vpos = None
+
+    def _insert_matches(self, first: int):
+        # filtre açıkken eklenen satırlardan eşleşenler görünür listenin sonuna
+        rows = self.search.search(self._query) or []
+        new = rows[bisect_left(rows, first):]  # sonuçlar sıralı
+        if not new:
+            return
+        vis = self._visible
+        self.beginInsertRows(QModelIndex(), len(vis), len(vis) + len(new) - 1)
+        vis.extend(new)
+        self._vpos = None
+        self.endInsertRows()
+
+    def _src(self, vr: int) -> int:
+        vis = self._visible
+        if vis is None:
+            return vr if 0 <= vr < len(self.titles) else -1
+        return vis[vr] if 0 <= vr < len(vis) else -1
+
+    def _view_index(self, r: int) -> Optional[QModelIndex]:
+        if self._visible is None:
+            return self.index(r)
+        if self._vpos is None:
+            self._vpos = {sr: vr for vr, sr in enumerate(self._visible)}
+        vr = self._vpos.get(r)
+        return None if vr is None else self.index(vr)
+
+    def _emit_all(self, roles: List[int]):
+        n = self.rowCount()
+        if n:
+            self.dataChanged.emit(self.index(0), self.index(n - 1), roles)
+
+    def set_all_checked(self, checked: bool):
+        n = len(self.checked)
+        if not n:
+            return
+        self.checked = bytearray([1 if checked else 0]) * n
+        self._emit_all([Qt.ItemDataRole.CheckStateRole])
+
+    def toggle(self, view_row: int):
+        r = self._src(view_row)
+        if r >= 0:
+            self.checked[r] ^= 1
+            idx = self.index(view_row)
+            self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.CheckStateRole])
+
+    def row_key(self, r: int) -> str:
+        return self.ids[r] or self.urls[r] or f"#{r}"
+
+    def key_at(self, view_row: int) -> str:
+        r = self._src(view_row)
+        return self.row_key(r) if r >= 0 else ""
+
+    def checked_urls(self, base_url: str) -> List[str]:
+        return [self.urls[r] or base_url for r in range(len(self.urls)) if self.checked[r]]
+
+    def checked_items(self, base_url: str) -> List[QueueItem]:
+        return [
+            QueueItem(
+                self.row_key(r), self.urls[r] or base_url,
+                self.extractors[r], self.ids[r], self.titles[r],
+            )
+            for r in range(len(self.urls)) if self.checked[r]
+        ]
+
+    def size_rows(self) -> Tuple[List[str], List[int], List[bool]]:
+        # boyut tahmini: anahtar, süre, indirilecek mi (seçili ve indekste yok)
+        keys = [self.row_key(r) for r in range(len(self.ids))]
+        return keys, self.seconds, [bool(c and not h) for c, h in zip(self.checked, self.have)]
+
+    def sample_rows(self) -> List[Tuple[str, str]]:
+        return [(self.row_key(r), self.urls[r]) for r in range(len(self.urls))]
+
+    def index_keys(self, first: int = 0) -> List[Tuple[str, str]]:
+        return list(zip(self.extractors[first:], self.ids[first:]))
+
+    def set_have(self, found: set, first: int = 0, uncheck: bool = True):
+        # found: indeksteki (extractor, id) çiftleri (küçük harf extractor)
+        n = len(self.titles)
+        if first >= n:
+            return
+        for r in range(first, n):
+            h = 1 if (self.extractors[r].lower(), self.ids[r]) in found else 0
+            self.have[r] = h
+            if h and uncheck:
+                self.checked[r] = 0
+        if self._visible is None:
+            self.dataChanged.emit(
+                self.index(first), self.index(n - 1),
+                [Qt.ItemDataRole.CheckStateRole, ProgressRole],
+            )
+        else:
+            self._emit_all([Qt.ItemDataRole.CheckStateRole, ProgressRole])
+
+    def refresh_key(self, key: str):
+        r = self._key_rows.get(key)
+        idx = self._view_index(r) if r is not None else None
+        if idx is not None:
+            self.dataChanged.emit(idx, idx, [ProgressRole])
+
+    # ---- thumbnails ----
+
+    def _icon_for(self, thumb: str) -> Optional[QIcon]:
+        if not thumb:
+            return None
+        icon = self._icons.get(thumb)
+        if icon is not None:
+            self._icons.move_to_end(thumb)
+            return icon
+        if thumb not in self._requested and self.thumb_request:
+            self._requested.add(thumb)
+            self.thumb_request(thumb)
+        return None
+
+    def set_thumb(self, thumb: str, pix: QPixmap):
+        rows = self._thumb_rows.get(thumb)
+        if not rows:
+            return
+        self._icons[thumb] = QIcon(pix)
+        self._icons.move_to_end(thumb)
+        while len(self._icons) > ICON_CACHE_MAX:
+            old, _ = self._icons.popitem(last=False)
+            self._requested.discard(old)  # tekrar görünürse yeniden istenir (disk önbelleğinden)
+
+        for r in rows:
+            idx = self._view_index(r)
+            if idx is not None:
+                self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole])
+
+
+class PlaylistDelegate(QStyledItemDelegate):
+    # status_text: ItemProgress -> satırda gösterilecek metin (dil main'de)
+    status_text: Optional[Callable[[ItemProgress], str]] = None
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+
+        p = index.data(ProgressRole)
+        if p is None:
+            return
+
+        r = option.rect.adjusted(110, 0, -12, -10)
+        bar = QRect(r.left(), r.bottom() - 4, r.width(), 4)
+        pct = p.percent
+
+        if p.state == P_ERROR:
+            color = QColor("#e57373")
+        elif p.state in (P_CANCELLED, P_PAUSED):
+            color = QColor("#757575")
+        elif p.state == P_RETRYING:
+            color = QColor("#ffb74d")
+        elif p.state in (P_DONE, P_SKIPPED):
+            color = QColor("#81c784")
+        else:
+            color = QColor("#64b5f6")
+
+        painter.save()
+        painter.fillRect(bar, QColor("#2d2d2d"))
+        if pct is not None:
+            painter.fillRect(QRect(bar.left(), bar.top(), bar.width() * pct // 100, bar.height()), color)
+
+        if self.status_text:
+            painter.setPen(color)
+            f = painter.font()
+            f.setPointSizeF(max(7.0, f.pointSizeF() * 0.8))
+            painter.setFont(f)
+            text_rect = QRect(r.left(), bar.top() - 22, r.width(), 20)
+            painter.drawText(
+                text_rect,
+                int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter),
+                self.status_text(p),
+            )
+        painter.restore()
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        # fare tıklaması satırın kendisinde toggle ediliyor (clicked sinyali);
+        # checkbox'ın ikinci kez çevirmesini engelle, klavye (Space) çalışmaya devam etsin
+        if event.type() in (
+            QEvent.Type.MouseButtonPress,
+            QEvent.Type.MouseButtonRelease,
+            QEvent.Type.MouseButtonDblClick,
+        ):
+            return False
+        return super().editorEvent(event, model, option, index)
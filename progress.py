@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+
+# item states
+P_QUEUED = "queued"
+P_DOWNLOADING = "downloading"
+P_POST = "postprocessing"
+P_DONE = "done"
+P_ERROR = "error"
+P_CANCELLED = "cancelled"
+P_PAUSED = "paused"  # .part dosyası duruyor; devam edince kaldığı yerden
+P_SKIPPED = "skipped"  # indeks: zaten indirilmiş
+P_RETRYING = "retrying"  # geçici hata: geri çekilme süresi dolunca yeniden denenir
+
+FINAL_STATES = (P_DONE, P_ERROR, P_CANCELLED)
+
+
+def human_mb(n: Optional[int]) -> str:
+    if not n:
+        return "0 MB"
+    return f"{n/(1024*1024):.1f} MB"
+
+
+def human_size(n: Optional[float]) -> str:
+    if not n:
+        return "0 MB"
+    if n >= 1024 ** 3:
+        return f"{n / 1024 ** 3:.2f} GB"
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+def human_speed(bps: Optional[float]) -> str:
+    return f"{(bps/(1024*1024)):.2f} MB/s" if bps else "?"
+
+
+def human_eta(sec: Optional[float]) -> str:
+    if sec is None or sec < 0:
+        return "?"
+    sec = int(sec)
+    if sec >= 3600:
+        return f"{sec // 3600}h{(sec % 3600) // 60:02d}m"
+    if sec >= 60:
+        return f"{sec // 60}m{sec % 60:02d}s"
+    return f"{sec}s"
+
+
+@dataclass
+class ItemProgress:
+    key: str
+    state: str = P_QUEUED
+    done_b: int = 0
+    total_b: int = 0
+    speed: float = 0.0
+    eta: Optional[float] = None
+    error: str = ""
+    kind: str = ""  # hata türü (retry.TRANSIENT / PERMANENT / AUTH)
+    attempt: int = 0  # yapılan yeniden deneme sayısı
+    retry_at: float = 0.0  # monotonic; P_RETRYING iken
+    frags: int = 0  # parçalı (DASH/HLS) indirmede eşzamanlı parça sayısı
+    started: float = 0.0
+    finished: float = 0.0
+
+    # video+ses ayrı dosyalar olarak inebilir: bitmiş dosyaların baytları
+    _base_b: int = field(default=0, repr=False)
+    _file: str = field(default="", repr=False)
+
+    @property
+    def percent(self) -> Optional[int]:
+        if self.state in (P_DONE, P_SKIPPED):
+            return 100
+        if not self.total_b:
+            return None
+        return max(0, min(100, int(self.done_b * 100 / self.total_b)))
+
+
+@dataclass
+class Aggregate:
+    items: int = 0
+    done: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    paused: int = 0
+    retrying: int = 0
+    active: int = 0
+    done_b: int = 0
+    total_b: int = 0
+    speed: float = 0.0
+    eta: Optional[float] = None
+    elapsed: float = 0.0
+    units: float = 0.0  # biten öğeler + süren öğelerin tamamlanan kesri
+
+    @property
+    def percent(self) -> Optional[int]:
+        if not self.items:
+            return None
+        return max(0, min(100, int(self.units * 100 / self.items)))
+
+    @property
+    def avg_speed(self) -> float:
+        return self.done_b / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ProgressTracker:
+    # Öğe (item id) bazında ilerleme. Worker thread'leri sadece son durumu
+    # yazar (sinyal yok); GUI sabit aralıkla take_dirty() ile değişenleri çeker.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[str, ItemProgress] = {}
+        self._dirty: Set[str] = set()
+        self._t0 = 0.0
+
+    def reset(self, keys: List[str]):
+        with self._lock:
+            self._items = {k: ItemProgress(k) for k in keys}
+            self._dirty = set(keys)
+            self._t0 = time.monotonic()
+
+    def take_dirty(self) -> Set[str]:
+        with self._lock:
+            d, self._dirty = self._dirty, set()
+            return d
+
+    def get(self, key: str) -> Optional[ItemProgress]:
+        with self._lock:
+            return self._items.get(key)
+
+    def update(self, key: str, d: Dict[str, Any]):
+        # yt-dlp progress hook sözlüğünden
+        st = d.get("status")
+        fname = str(d.get("filename") or d.get("tmpfilename") or "")
+        with self._lock:
+            p = self._items.get(key)
+            if p is None:
+                p = self._items[key] = ItemProgress(key)
+            if not p.started:
+                p.started = time.monotonic()
+            self._dirty.add(key)
+
+            if fname and fname != p._file:
+                if p._file:
+                    p._base_b = p.done_b
+                p._file = fname
+
+            if st == "downloading":
+                cur = int(d.get("downloaded_bytes") or 0)
+                tot = int(d.get("total_bytes") or d.get("total_bytes_estimate") or 0)
+                p.state = P_DOWNLOADING
+                p.done_b = p._base_b + cur
+                p.total_b = p._base_b + tot if tot else 0
+                p.speed = float(d.get("speed") or 0.0)
+                p.frags = int(d.get("concurrent_fragments") or 0)
+                eta = d.get("eta")
+                p.eta = float(eta) if isinstance(eta, (int, float)) else None
+            elif st == "finished":
+                cur = int(d.get("downloaded_bytes") or d.get("total_bytes") or 0)
+                if cur:
+                    p.done_b = p._base_b + cur
+                p.total_b = max(p.total_b, p.done_b)
+                p.speed = 0.0
+                p.eta = None
+                p.state = P_POST
+            elif st == "error":
+                p.state = P_ERROR
+
+    def set_state(self, key: str, state: str, error: str = "", kind: str = ""):
+        with self._lock:
+            p = self._items.get(key)
+            if p is None:
+                p = self._items[key] = ItemProgress(key)
+            p.state = state
+            p.error = error
+            p.kind = kind
+            self._dirty.add(key)
+            if state in (P_QUEUED, P_RETRYING):
+                # devam ettirilen öğe: yt-dlp baytları .part'tan itibaren yeniden bildirir
+                p.done_b = p.total_b = p._base_b = 0
+                p._file = ""
+            if state in (P_PAUSED, P_RETRYING):
+                p.speed = 0.0
+                p.eta = None
+            if state in FINAL_STATES:
+                p.finished = time.monotonic()
+                p.speed = 0.0
+                p.eta = None
+                if state == P_DONE and p.total_b < p.done_b:
+                    p.total_b = p.done_b
+
+    def retrying(self, key: str, error: str, kind: str, attempt: int, at: float):
+        # at: monotonic; yeniden denemenin başlayacağı an
+        self.set_state(key, P_RETRYING, error, kind)
+        with self._lock:
+            p = self._items[key]
+            p.attempt = attempt
+            p.retry_at = at
+
+    def retrying_keys(self) -> Set[str]:
+        with self._lock:
+            return {k for k, p in self._items.items() if p.state == P_RETRYING}
+
+    def aggregate(self) -> Aggregate:
+        a = Aggregate()
+        with self._lock:
+            a.items = len(self._items)
+            a.elapsed = time.monotonic() - self._t0 if self._t0 else 0.0
+            unknown_left = False
+            for p in self._items.values():
+                a.done_b += p.done_b
+                if p.state == P_DONE:
+                    a.done += 1
+                elif p.state == P_ERROR:
+                    a.failed += 1
+                elif p.state == P_CANCELLED:
+                    a.cancelled += 1
+                elif p.state == P_PAUSED:
+                    a.paused += 1
+                elif p.state == P_RETRYING:
+                    a.retrying += 1
+                elif p.state in (P_DOWNLOADING, P_POST):
+                    a.active += 1
+
+                if p.total_b:
+                    a.total_b += p.total_b
+                elif p.state not in FINAL_STATES:
+                    unknown_left = True
+                if p.state == P_DOWNLOADING:
+                    a.speed += p.speed
+
+                if p.state in FINAL_STATES:
+                    a.units += 1.0
+                elif p.total_b:
+                    a.units += min(1.0, p.done_b / p.total_b)
+
+        if a.speed > 0 and a.total_b and not unknown_left:
+            a.eta = max(0.0, (a.total_b - a.done_b) / a.speed)
+        return a
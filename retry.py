@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+# Öğe bazında hata sınıflandırma ve yeniden deneme (Qt-free).
+#   transient  HTTP 429/5xx/408, zaman aşımı, bağlantı kopması => bekle, kuyruğun sonuna
+#   auth       giriş / çerez / yaş doğrulaması gerekiyor      => denenmez
+#   permanent  silinmiş, gizli, bölge engeli, 404 ...          => denenmez
+# Bekleme: üstel + jitter (aynı anda 429 alan işler aynı anda geri dönmesin).
+
+import os
+import random
+import re
+import socket
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+AUTH = "auth"
+
+RETRY_ATTEMPTS = 4  # ilk denemeden sonra en fazla bu kadar tekrar
+RETRY_BASE = 5.0  # sn; n. tekrarda üst sınır base * 2**n
+RETRY_CAP = 300.0
+
+# Önce HTTP durumu ve istisna türü (yt-dlp'nin networking / utils sınıfları, MRO ile);
+# metin kalıpları sadece bunlar bir şey söylemezse. Kalıplar yt-dlp'nin kendi hata
+# cümleleri: tek kelimelik terimler ("cookies", "ssl", "premium") sıradan hatalarda da geçer.
+# sıra önemli: auth önce
+_AUTH_RE = re.compile(
+    r"sign in to confirm|sign in if you.ve been granted access|use --cookies|--cookies-from-browser|"
+    r"login required|requires? (?:a )?login|you need to log in|unable to log in|log in to (?:view|watch|access)|"
+    r"only available (?:for|to) (?:registered|logged[- ]in) users|"
+    r"members[- ]only|join this channel|available to this channel.s members|"
+    r"only available to (?:\w+ )?premium members|requires? authentication|requires payment|"
+    r"age[- ]restricted|confirm your age|"
+    r"http error 40[17]",
+    re.I,
+)
+_PERMANENT_RE = re.compile(
+    r"private video|video unavailable|has been removed|no longer available|"
+    r"does not exist|not available in your country|geo[- ]?restrict|blocked it in your country|"
+    r"copyright|account (?:has been )?terminated|unsupported url|no video formats|requested format is not available|"
+    r"http error 404|http error 410|http error 451",
+    re.I,
+)
+_TRANSIENT_RE = re.compile(
+    r"http error (?:408|429|5\d\d)|too many requests|timed out|temporarily unavailable|try again later|"
+    r"connection (?:reset|refused|aborted)|remote end closed connection|broken pipe|incomplete ?read|"
+    r"got error:|network is unreachable|temporary failure in name resolution|"
+    r"eof occurred in violation of protocol",
+    re.I,
+)
+
+# tür adları (MRO): TransportError altındaki SSLError / ProxyError / IncompleteRead de geçici sayılır
+_TRANSIENT_TYPES = {"TransportError", "IncompleteRead", "ContentTooShortError", "timeout"}
+_PERMANENT_TYPES = {"GeoRestrictedError", "UnsupportedError", "UnavailableVideoError", "CertificateVerifyError"}
+
+
+def _chain(ex: BaseException) -> Iterator[BaseException]:
+    # DownloadError.exc_info / ExtractorError.cause / __cause__ / __context__
+    seen = set()
+    stack = [ex]
+    while stack:
+        e = stack.pop()
+        if e is None or id(e) in seen:
+            continue
+        seen.add(id(e))
+        yield e
+        exc_info = getattr(e, "exc_info", None)
+        if isinstance(exc_info, tuple) and len(exc_info) > 1 and isinstance(exc_info[1], BaseException):
+            stack.append(exc_info[1])
+        for attr in ("cause", "__cause__", "__context__"):
+            nxt = getattr(e, attr, None)
+            if isinstance(nxt, BaseException):
+                stack.append(nxt)
+
+
+def _status(e: BaseException) -> int:
+    st = getattr(e, "status", None)
+    if st is None:
+        st = getattr(e, "code", None)  # urllib.error.HTTPError
+    return st if isinstance(st, int) else 0
+
+
+def classify(ex: Any) -> str:
+    # istisna ya da hata metni => TRANSIENT / PERMANENT / AUTH
+    typed = ""
+    if isinstance(ex, BaseException):
+        names = set()
+        for e in _chain(ex):
+            names.update(c.__name__ for c in type(e).__mro__)
+            st = _status(e)
+            if st in (401, 407):
+                return AUTH
+            if st == 408 or st == 429 or 500 <= st < 600:
+                return TRANSIENT
+            if st in (404, 410, 451):
+                return PERMANENT
+        if names & _PERMANENT_TYPES:
+            return PERMANENT  # sertifika hatası da: tekrar denemek düzeltmez
+        if names & _TRANSIENT_TYPES or any(
+            isinstance(e, (socket.timeout, TimeoutError, ConnectionError)) for e in _chain(ex)
+        ):
+            typed = TRANSIENT
+        text = " ".join(str(e) for e in _chain(ex))
+    else:
+        text = str(ex or "")
+
+    if _AUTH_RE.search(text):
+        return AUTH  # ör. giriş sayfasına yönlendirip bağlantıyı kesen siteler
+    if typed:
+        return typed
+    if _PERMANENT_RE.search(text):
+        return PERMANENT
+    if _TRANSIENT_RE.search(text):
+        return TRANSIENT
+    return PERMANENT  # bilinmeyen hata: tekrar denemek büyük partiyi boşuna uzatır
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = RETRY_ATTEMPTS
+    base: float = RETRY_BASE
+    cap: float = RETRY_CAP
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        # MEDIA_DL_RETRIES=0 => yeniden deneme yok
+        return cls(attempts=max(0, _env_int("MEDIA_DL_RETRIES", RETRY_ATTEMPTS)))
+
+    def should_retry(self, kind: str, attempt: int) -> bool:
+        # attempt: şimdiye kadar yapılan tekrar sayısı
+        return kind == TRANSIENT and attempt < self.attempts
+
+    def delay(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        # "equal jitter": yarısı sabit (en az bu kadar beklenir), yarısı rastgele
+        span = min(self.cap, self.base * (2 ** attempt))
+        return span / 2 + (rng or random).uniform(0, span / 2)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# ----------------------------
+# Folding
+# ----------------------------
+
+@lru_cache(maxsize=4096)
+def _fold_char(c: str) -> str:
+    # "é" -> "e", "ş" -> "s", "ı" -> "i"; Latin dışı harfler (日本語, кириллица) aynen kalır
+    if c == "ı":
+        return "i"
+    return "".join(x for x in unicodedata.normalize("NFKD", c) if not unicodedata.combining(x))
+
+
+def fold(s: str) -> str:
+    s = (s or "").casefold()
+    if s.isascii():
+        return s
+    return "".join(c if c.isascii() else _fold_char(c) for c in s)
+
+
+# ----------------------------
+# Query
+# ----------------------------
+
+# dur:<5m  dur:>=1h  dur:3m-10m  dur:>4:30  channel:foo  ch:"foo bar"
+_FILTER_RE = re.compile(r'(?i)\b(dur|duration|ch|channel):("[^"]*"?|\S*)')
+
+
+def parse_seconds(s: str) -> Optional[int]:
+    s = (s or "").strip().lower()
+    if not s:
+        return None
+    if ":" in s:
+        try:
+            n = 0
+            for part in s.split(":"):
+                n = n * 60 + int(part or 0)
+            return n
+        except ValueError:
+            return None
+    m = re.fullmatch(r"(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?", s)
+    if not m or not any(m.groups()):
+        return None
+    h, mi, sec = (int(g) if g else 0 for g in m.groups())
+    return h * 3600 + mi * 60 + sec
+
+
+@dataclass(frozen=True)
+class Query:
+    terms: Tuple[str, ...] = ()
+    channel: str = ""
+    dur_min: Optional[int] = None
+    dur_max: Optional[int] = None
+
+    @property
+    def empty(self) -> bool:
+        return not self.terms and not self.channel and not self.timed
+
+    @property
+    def timed(self) -> bool:
+        return self.dur_min is not None or self.dur_max is not None
+
+
+def parse_query(text: str) -> Query:
+    channel = ""
+    dmin: Optional[int] = None
+    dmax: Optional[int] = None
+
+    for key, val in _FILTER_RE.findall(text or ""):
+        val = val.strip('"')
+        if key.lower() in ("ch", "channel"):
+            channel = fold(val).strip()
+            continue
+        # süre
+        if "-" in val and not val.startswith(("<", ">")):
+            lo, _, hi = val.partition("-")
+            dmin, dmax = parse_seconds(lo), parse_seconds(hi)
+        elif val.startswith(">"):
+            dmin = parse_seconds(val.lstrip(">="))
+        elif val.startswith("<"):
+            dmax = parse_seconds(val.lstrip("<="))
+        else:
+            # dur:5m => ±%10
+            n = parse_seconds(val)
+            if n is not None:
+                dmin, dmax = int(n * 0.9), int(n * 1.1) + 1
+
+    rest = _FILTER_RE.sub(" ", text or "")
+    return Query(tuple(fold(rest).split()), channel, dmin, dmax)
+
+
+# ----------------------------
+# Index
+# ----------------------------
+
+NARROW_RATIO = 8  # önceki sonuç satırların 1/8'inden azsa süz, değilse indeksten
+
+
+class SearchIndex:
+    # Satır başına katlanmış (casefold + aksansız) metin ve boşlukla ayrılmış
+    # token => satırlar indeksi. Bir terim (boşluk içermez) metnin alt dizisiyse
+    # mutlaka bir token'ın alt dizisidir: sözlükte eşleşen token'ların satır
+    # listelerinin birleşimi tam sonuçtur, satır taraması gerekmez. Süre
+    # filtresi süreye göre sıralı satırlarda bisect ile aralık olarak alınır.
+    # Sorgu uzadıkça (önceki sorgunun devamıysa) önceki sonuç küçükse sadece o
+    # süzülür; büyükse indeks daha ucuz (NARROW_RATIO).
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.channels: List[str] = []
+        self.seconds: List[int] = []
+        self._tokens: Dict[str, List[int]] = {}
+        self._by_sec: List[int] = []  # süresi bilinen satırlar, süreye göre sıralı
+        self._sec_keys: List[int] = []  # _by_sec'in süreleri (bisect için)
+        self._indexed = 0  # token indeksi tembel: ilk sorguda / sonraki sorgularda eksik kalan satırlar
+        self._last: Optional[Tuple[Query, int, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def clear(self):
+        self.texts.clear()
+        self.channels.clear()
+        self.seconds.clear()
+        self._tokens.clear()
+        self._by_sec = []
+        self._sec_keys = []
+        self._indexed = 0
+        self._last = None
+
+    def extend(self, titles: Iterable[str], channels: Iterable[str], seconds: Iterable[int]):
+        self.texts.extend(fold(t) for t in titles)
+        self.channels.extend(fold(c) for c in channels)
+        self.seconds.extend(int(s or 0) for s in seconds)
+
+    def rebuild(self, titles: List[str], channels: List[str], seconds: List[int]):
+        self.clear()
+        self.extend(titles, channels, seconds)
+
+    def warm(self):
+        # boşta çağrılır (QTimer) => ilk tuş vuruşu indeks kurulumunu beklemez
+        self._ensure()
+
+    def _ensure(self):
+        if self._indexed == len(self.texts):
+            return
+        tokens = self._tokens
+        for r in range(self._indexed, len(self.texts)):
+            for tok in set(self.texts[r].split()):
+                rows = tokens.get(tok)
+                if rows is None:
+                    tokens[tok] = [r]
+                else:
+                    rows.append(r)
+        secs = self.seconds
+        self._by_sec = sorted((r for r in range(len(secs)) if secs[r]), key=secs.__getitem__)
+        self._sec_keys = [secs[r] for r in self._by_sec]
+        self._indexed = len(self.texts)
+
+    def _dur_rows(self, q: Query) -> List[int]:
+        # süresi [dur_min, dur_max] aralığında olanlar (süresizler hiçbir süre filtresine uymaz)
+        keys = self._sec_keys
+        lo = bisect_left(keys, q.dur_min) if q.dur_min is not None else 0
+        hi = bisect_right(keys, q.dur_max) if q.dur_max is not None else len(keys)
+        return self._by_sec[lo:hi]
+
+    def _term_rows(self, term: str) -> set:
+        out: set = set()
+        for tok, rows in self._tokens.items():
+            if term in tok:
+                out.update(rows)
+        return out
+
+    def _filters_ok(self, r: int, q: Query) -> bool:
+        if q.channel and q.channel not in self.channels[r]:
+            return False
+        sec = self.seconds[r]
+        if q.dur_min is not None and (not sec or sec < q.dur_min):
+            return False
+        if q.dur_max is not None and (not sec or sec > q.dur_max):
+            return False
+        return True
+
+    def _ok(self, r: int, q: Query) -> bool:
+        text = self.texts[r]
+        return all(t in text for t in q.terms) and self._filters_ok(r, q)
+
+    def search(self, text: str) -> Optional[List[int]]:
+        # None => filtre yok (bütün satırlar)
+        q = parse_query(text)
+        n = len(self.texts)
+        if q.empty:
+            self._last = None
+            return None
+
+        last = self._last
+        if last and last[0] == q and last[1] == n:
+            return last[2]
+        if last and last[1] <= n and len(last[2]) * NARROW_RATIO <= n and _narrows(last[0], q):
+            # önceki (küçük) sonucun devamı: önceki eşleşmeler + sonradan eklenen satırlar
+            cand: Iterable[int] = last[2] + list(range(last[1], n))
+            rows = [r for r in cand if self._ok(r, q)]
+        else:
+            self._ensure()
+            sets = [self._term_rows(t) for t in q.terms]
+            if q.timed:
+                sets.append(set(self._dur_rows(q)))
+            if sets:
+                sets.sort(key=len)
+                hit = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+                if q.channel:
+                    chans = self.channels
+                    rows = sorted(r for r in hit if q.channel in chans[r])
+                else:
+                    rows = sorted(hit)
+            else:
+                rows = [r for r in range(n) if q.channel in self.channels[r]]
+
+        self._last = (q, n, rows)
+        return rows
+
+
+def _narrows(old: Query, new: Query) -> bool:
+    # yeni sorgunun eşleşmeleri eskinin alt kümesi mi?
+    if old.channel and old.channel not in new.channel:
+        return False
+    if old.dur_min is not None and (new.dur_min is None or new.dur_min < old.dur_min):
+        return False
+    if old.dur_max is not None and (new.dur_max is None or new.dur_max > old.dur_max):
+        return False
+    return all(any(o in t for t in new.terms) for o in old.terms)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+# Açılış süresi ölçümü (`--startup-profile`).
+#   python main.py --startup-profile            => tablo stderr'e
+#   python main.py --startup-profile=out.json   => JSON (regresyon takibi için)
+# Import süreleri `python -X importtime` gibi modül bazında (self / cumulative, µs)
+# toplanır; ek olarak açılış aşamaları mark() ile işaretlenir.
+# Bu modül sadece stdlib kullanır ve main.py'de ilk import edilmelidir.
+
+import importlib.abc
+import json
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+FLAG = "--startup-profile"
+TOP_IMPORTS = 25
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, prof: "StartupProfile", name: str, loader: Any):
+        self._prof = prof
+        self._name = name
+        self._loader = loader
+
+    # C eklentilerinde (PyQt6) asıl iş create_module'da (dlopen): ikisi birlikte ölçülür
+    def create_module(self, spec):
+        self._prof._enter()
+        self._t0 = time.perf_counter()
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._prof._leave(self._name, time.perf_counter() - self._t0)
+            raise
+
+    def exec_module(self, module):
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._prof._leave(self._name, time.perf_counter() - self._t0)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, prof: "StartupProfile"):
+        self._prof = prof
+        self._busy = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._busy, "on", False):
+            return None
+        self._busy.on = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._busy.on = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self._prof, fullname, spec.loader)
+        return spec
+
+
+class StartupProfile:
+    def __init__(self):
+        self.enabled = False
+        self.out: Optional[str] = None
+        self.t0 = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}  # modül -> (self, cumulative) sn
+        self._child: List[float] = []  # iç içe importlarda çocukların toplamı
+        self._finder: Optional[_TimingFinder] = None
+        self._lock = threading.Lock()
+
+    def enable(self, out: Optional[str] = None):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.out = out
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def mark(self, name: str):
+        if self.enabled:
+            with self._lock:
+                self.marks.append((name, time.perf_counter() - self.t0))
+
+    # ---- import timing (sadece ana thread'in import yığını izlenir) ----
+
+    def _enter(self):
+        if threading.current_thread() is threading.main_thread():
+            self._child.append(0.0)
+
+    def _leave(self, name: str, dt: float):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        children = self._child.pop() if self._child else 0.0
+        self.imports[name] = (dt - children, dt)
+        if self._child:
+            self._child[-1] += dt
+
+    # ---- report ----
+
+    def report(self) -> Dict[str, Any]:
+        top = sorted(self.imports.items(), key=lambda kv: kv[1][1], reverse=True)
+        return {
+            "marks_ms": {name: round(t * 1000, 1) for name, t in self.marks},
+            "imports_us": [
+                {"module": m, "self": int(s * 1e6), "cumulative": int(c * 1e6)}
+                for m, (s, c) in top
+            ],
+        }
+
+    def dump(self):
+        if not self.enabled:
+            return
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        rep = self.report()
+        if self.out:
+            with open(self.out, "w", encoding="utf-8") as f:
+                json.dump(rep, f, indent=1)
+            return
+        err = sys.stderr
+        print("startup:", file=err)
+        for name, ms in rep["marks_ms"].items():
+            print(f"  {ms:9.1f} ms  {name}", file=err)
+        print("imports (self | cumulative, µs):", file=err)
+        for row in rep["imports_us"][:TOP_IMPORTS]:
+            print(f"  {row['self']:9d} | {row['cumulative']:9d} | {row['module']}", file=err)
+
+
+def _from_argv() -> StartupProfile:
+    prof = StartupProfile()
+    for i, a in enumerate(list(sys.argv[1:]), 1):
+        if a == FLAG or a.startswith(FLAG + "="):
+            prof.enable(a.partition("=")[2] or None)
+            sys.argv.pop(i)  # Qt argümanlarına karışmasın
+            break
+    return prof
+
+
+profile = _from_argv()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core import QueueItem
+from paths import data_dir
+
+
+# ----------------------------
+# Download index (archive)
+# ----------------------------
+
+class DownloadIndex:
+    # (extractor, video id, format) => daha önce indirilmiş dosya.
+    # Kalite ve çıktı yolu da kaydedilir; dosya silinmişse kayıt yok sayılır.
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else data_dir() / "library.db"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS downloads ("
+            " extractor TEXT NOT NULL, video_id TEXT NOT NULL, fmt TEXT NOT NULL,"
+            " quality TEXT, path TEXT, ts REAL,"
+            " PRIMARY KEY (extractor, video_id, fmt))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS downloads_fmt_id ON downloads (fmt, video_id)")
+        self._db.commit()
+
+    @staticmethod
+    def norm(extractor: str, video_id: str) -> Tuple[str, str]:
+        return (extractor or "").strip().lower(), (video_id or "").strip()
+
+    def add(self, extractor: str, video_id: str, fmt: str, quality: str, path: str):
+        ex, vid = self.norm(extractor, video_id)
+        if not ex or not vid:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO downloads (extractor, video_id, fmt, quality, path, ts)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (ex, vid, (fmt or "").upper(), quality or "", path or "", time.time()),
+            )
+            self._db.commit()
+
+    def lookup(self, keys: Iterable[Tuple[str, str]], fmt: str) -> Set[Tuple[str, str]]:
+        # verilen (extractor, id) çiftlerinden bu formatta zaten olanlar
+        wanted = {((e or "").strip().lower(), (v or "").strip()) for e, v in keys}  # norm(), satır içi
+        wanted = {k for k in wanted if k[0] and k[1]}
+        if not wanted:
+            return set()
+
+        fmt = (fmt or "").upper()
+        found: Set[Tuple[str, str]] = set()
+        with self._lock:
+            (n_fmt,) = self._db.execute("SELECT COUNT(*) FROM downloads WHERE fmt=?", (fmt,)).fetchone()
+            if n_fmt <= len(wanted):
+                # kütüphane listeden küçükse tek taramada bitir (büyük playlist + az indirme)
+                rows = self._db.execute(
+                    "SELECT extractor, video_id, path FROM downloads WHERE fmt=?", (fmt,)
+                ).fetchall()
+            else:
+                rows = []
+                ids = sorted({v for _, v in wanted})
+                for i in range(0, len(ids), 500):
+                    chunk = ids[i:i + 500]
+                    q = ",".join("?" * len(chunk))
+                    rows += self._db.execute(
+                        f"SELECT extractor, video_id, path FROM downloads"
+                        f" WHERE fmt=? AND video_id IN ({q})",
+                        [fmt, *chunk],
+                    ).fetchall()
+        for ex, vid, path in rows:
+            if (ex, vid) in wanted and (not path or os.path.exists(path)):
+                found.add((ex, vid))
+        return found
+
+    def has(self, extractor: str, video_id: str, fmt: str) -> bool:
+        return bool(self.lookup([(extractor, video_id)], fmt))
+
+
+# ----------------------------
+# Resumable download queue
+# ----------------------------
+
+Q_PENDING = "pending"
+Q_RUNNING = "running"
+Q_DONE = "done"
+Q_ERROR = "error"
+
+
+@dataclass
+class QueueBatch:
+    id: int
+    out_dir: str
+    fmt: str
+    quality: str
+    frag_mode: str
+    created: float
+    items: List[QueueItem] = field(default_factory=list)
+    partials: Dict[str, str] = field(default_factory=dict)  # key -> .part dosyası
+
+
+class QueueStore:
+    # İndirme kuyruğu (ayarlar + öğe durumları + yarım dosyalar) adım adım
+    # sqlite'a yazılır; uygulama kapanır/çökerse bir sonraki açılışta devam edilir.
+    # Kullanıcı durdurursa ya da parti biterse batch kapatılır.
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else data_dir() / "library.db"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS batches ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, out_dir TEXT, fmt TEXT, quality TEXT,"
+            " frag_mode TEXT, created REAL, closed INTEGER DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS queue_items ("
+            " batch_id INTEGER NOT NULL, key TEXT NOT NULL, url TEXT, extractor TEXT,"
+            " video_id TEXT, title TEXT, state TEXT, partial TEXT, error TEXT, updated REAL,"
+            " pos INTEGER, PRIMARY KEY (batch_id, key));"
+        )
+        self._db.commit()
+
+    def create_batch(
+        self, items: List[QueueItem], out_dir: str, fmt: str, quality: str, frag_mode: str
+    ) -> int:
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO batches (out_dir, fmt, quality, frag_mode, created) VALUES (?, ?, ?, ?, ?)",
+                (out_dir, fmt, quality, frag_mode, now),
+            )
+            bid = int(cur.lastrowid)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO queue_items"
+                " (batch_id, key, url, extractor, video_id, title, state, partial, error, updated, pos)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, '', '', ?, ?)",
+                [
+                    (bid, it.key, it.url, it.extractor, it.video_id, it.title, Q_PENDING, now, i)
+                    for i, it in enumerate(items)
+                ],
+            )
+            self._db.commit()
+        return bid
+
+    def set_state(self, batch_id: int, key: str, state: str, error: str = ""):
+        with self._lock:
+            self._db.execute(
+                "UPDATE queue_items SET state=?, error=?, updated=? WHERE batch_id=? AND key=?",
+                (state, error or "", time.time(), batch_id, key),
+            )
+            self._db.commit()
+
+    def set_partial(self, batch_id: int, key: str, partial: str):
+        with self._lock:
+            self._db.execute(
+                "UPDATE queue_items SET state=?, partial=?, updated=? WHERE batch_id=? AND key=?",
+                (Q_RUNNING, partial or "", time.time(), batch_id, key),
+            )
+            self._db.commit()
+
+    def fail_batch(self, batch_id: int, error: str):
+        # parti bütünüyle çöktü: bitmemiş öğeler hata => open_batches bir daha döndürmez
+        # (kayıt silinmez, neyin kaldığı görülebilsin)
+        with self._lock:
+            self._db.execute(
+                "UPDATE queue_items SET state=?, error=?, updated=? WHERE batch_id=? AND state IN (?, ?)",
+                (Q_ERROR, error or "", time.time(), batch_id, Q_PENDING, Q_RUNNING),
+            )
+            self._db.commit()
+
+    def close_batch(self, batch_id: int):
+        with self._lock:
+            self._db.execute("UPDATE batches SET closed=1 WHERE id=?", (batch_id,))
+            self._db.execute("DELETE FROM queue_items WHERE batch_id=?", (batch_id,))
+            self._db.commit()
+
+    def open_batches(self) -> List[QueueBatch]:
+        # kapanmamış ve bitmemiş öğesi olan partiler (en yenisi önce)
+        out: List[QueueBatch] = []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, out_dir, fmt, quality, frag_mode, created FROM batches"
+                " WHERE closed=0 ORDER BY id DESC"
+            ).fetchall()
+            for bid, out_dir, fmt, quality, frag_mode, created in rows:
+                b = QueueBatch(bid, out_dir or "", fmt or "", quality or "", frag_mode or "", created or 0.0)
+                for key, url, ex, vid, title, partial in self._db.execute(
+                    "SELECT key, url, extractor, video_id, title, partial FROM queue_items"
+                    " WHERE batch_id=? AND state IN (?, ?) ORDER BY pos",
+                    (bid, Q_PENDING, Q_RUNNING),
+                ):
+                    b.items.append(QueueItem(key, url or "", ex or "", vid or "", title or ""))
+                    if partial:
+                        b.partials[key] = partial
+                if b.items:
+                    out.append(b)
+        return out
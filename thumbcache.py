@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from paths import cache_dir
+
+
+DEFAULT_BUDGET_MB = 64
+DEFAULT_MAX_AGE = 7 * 24 * 3600  # bu süreden eski kayıtlar ETag/Last-Modified ile yeniden doğrulanır
+ATIME_FLUSH_SECS = 30.0  # okumada güncellenen erişim zamanları en fazla bu aralıkla diske
+
+
+def thumb_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@dataclass
+class ThumbMeta:
+    key: str
+    size: int
+    atime: float
+    fetched: float
+    etag: str = ""
+    last_modified: str = ""
+
+
+class ThumbCache:
+    # Ölçeklenmiş thumbnail'ların disk önbelleği (URL hash'i ile adreslenir).
+    # Index sqlite'ta tutulur ve bellekte aynalanır; bütçe aşılınca en eski
+    # erişilenler (LRU) silinir. Okumada atime sadece bellekte güncellenir,
+    # diske toplu yazılır (put / revalidated / flush ya da ATIME_FLUSH_SECS'te bir).
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        budget_bytes: Optional[int] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        if budget_bytes is None:
+            try:
+                mb = float(os.environ.get("MEDIA_DL_THUMB_CACHE_MB") or DEFAULT_BUDGET_MB)
+            except ValueError:
+                mb = DEFAULT_BUDGET_MB
+            budget_bytes = int(mb * 1024 * 1024)
+
+        self.root = Path(root) if root else cache_dir("thumbs")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.budget = max(0, int(budget_bytes))
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS thumbs ("
+            " key TEXT PRIMARY KEY, size INTEGER, atime REAL, fetched REAL,"
+            " etag TEXT, last_modified TEXT)"
+        )
+        self._db.commit()
+
+        self._index: Dict[str, ThumbMeta] = {}
+        self._total = 0
+        self._touched: Set[str] = set()  # atime'ı diske yazılmamış kayıtlar
+        self._flushed = time.monotonic()
+        for key, size, atime, fetched, etag, lm in self._db.execute(
+            "SELECT key, size, atime, fetched, etag, last_modified FROM thumbs"
+        ):
+            self._index[key] = ThumbMeta(key, size or 0, atime or 0.0, fetched or 0.0, etag or "", lm or "")
+            self._total += size or 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.jpg"
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def meta(self, url: str) -> Optional[ThumbMeta]:
+        with self._lock:
+            return self._index.get(thumb_key(url))
+
+    def is_fresh(self, meta: ThumbMeta) -> bool:
+        return (time.time() - meta.fetched) < self.max_age
+
+    def read(self, url: str) -> Optional[bytes]:
+        key = thumb_key(url)
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            self._drop(key)
+            return None
+
+        with self._lock:
+            m = self._index.get(key)
+            if m:
+                m.atime = time.time()
+                self._touched.add(key)
+                if time.monotonic() - self._flushed >= ATIME_FLUSH_SECS:
+                    self._write_atimes()
+                    self._db.commit()
+        return data
+
+    def flush(self):
+        with self._lock:
+            if self._touched:
+                self._write_atimes()
+                self._db.commit()
+
+    def put(self, url: str, data: bytes, etag: str = "", last_modified: str = ""):
+        if not data or len(data) > self.budget:
+            return
+        key = thumb_key(url)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        now = time.time()
+        with self._lock:
+            old = self._index.get(key)
+            if old:
+                self._total -= old.size
+            self._index[key] = ThumbMeta(key, len(data), now, now, etag or "", last_modified or "")
+            self._total += len(data)
+            self._db.execute(
+                "INSERT OR REPLACE INTO thumbs (key, size, atime, fetched, etag, last_modified)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, len(data), now, now, etag or "", last_modified or ""),
+            )
+            self._touched.discard(key)
+            self._write_atimes()  # LRU sırası diskte de güncel kalsın (aynı commit)
+            self._evict()
+            self._db.commit()
+
+    def revalidated(self, url: str):
+        # 304 Not Modified => kayıt tazelendi
+        key = thumb_key(url)
+        now = time.time()
+        with self._lock:
+            m = self._index.get(key)
+            if not m:
+                return
+            m.fetched = now
+            m.atime = now
+            self._touched.discard(key)
+            self._db.execute("UPDATE thumbs SET fetched=?, atime=? WHERE key=?", (now, now, key))
+            self._write_atimes()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._index.keys()):
+                self._remove(key)
+            self._db.commit()
+
+    # ---- internals (lock altında) ----
+
+    def _write_atimes(self):
+        rows = [(self._index[k].atime, k) for k in self._touched if k in self._index]
+        if rows:
+            self._db.executemany("UPDATE thumbs SET atime=? WHERE key=?", rows)
+        self._touched.clear()
+        self._flushed = time.monotonic()
+
+    def _evict(self):
+        if self._total <= self.budget:
+            return
+        for m in sorted(self._index.values(), key=lambda x: x.atime):
+            if self._total <= self.budget:
+                break
+            self._remove(m.key)
+
+    def _remove(self, key: str):
+        self._touched.discard(key)
+        m = self._index.pop(key, None)
+        if m:
+            self._total -= m.size
+        self._db.execute("DELETE FROM thumbs WHERE key=?", (key,))
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _drop(self, key: str):
+        with self._lock:
+            self._remove(key)
+            self._db.commit()
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+from PyQt6.QtCore import Qt, QObject, QBuffer, QByteArray, QIODevice, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QImage
+
+from thumbcache import ThumbCache
+
+
+THUMB_SIZE = 96
+LOCAL = ""  # disk önbelleği okumaları için sahte "host"
+
+
+def thumb_host(url: str) -> str:
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+def scale_thumb(data: bytes) -> QImage:
+    img = QImage()
+    img.loadFromData(data)
+    if img.isNull():
+        return img
+    # QImage (QPixmap değil) worker thread içinde güvenle ölçeklenebilir
+    return img.scaled(
+        THUMB_SIZE, THUMB_SIZE,
+        Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+
+
+def encode_thumb(img: QImage) -> bytes:
+    ba = QByteArray()
+    buf = QBuffer(ba)
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    img.save(buf, "JPG", 90)
+    buf.close()
+    return bytes(ba)
+
+
+def fetch_thumb(
+    url: str,
+    timeout: float = 4.0,
+    etag: str = "",
+    last_modified: str = "",
+) -> Optional[Tuple[QImage, str, str]]:
+    # None => 304 Not Modified
+    import urllib.request  # http.client/ssl/email açılışı yavaşlatmasın (ilk fetch worker'da)
+    from netpool import urlopen  # yt-dlp ile ortak keep-alive havuzu
+
+    req = urllib.request.Request(url)
+    if etag:
+        req.add_header("If-None-Match", etag)
+    if last_modified:
+        req.add_header("If-Modified-Since", last_modified)
+    try:
+        with urlopen(req, timeout=timeout) as r:
+            data = r.read()
+            new_etag = r.headers.get("ETag") or ""
+            new_lm = r.headers.get("Last-Modified") or ""
+    except HTTPError as ex:
+        if ex.code == 304:
+            return None
+        raise
+    return scale_thumb(data), new_etag, new_lm
+
+
+# Thumbnail'lar GUI thread dışında, sınırlı bir havuzda indirilir:
+# toplam `workers`, host başına `per_host` eşzamanlı istek.
+# cancel() => bekleyenler atılır, uçuştakilerin sonucu yok sayılır (generation).
+class ThumbnailLoader(QObject):
+
+    sig_ready = pyqtSignal(str, QImage)
+    _sig_result = pyqtSignal(int, str, QImage)
+
+    def __init__(
+        self,
+        workers: int = 8,
+        per_host: int = 4,
+        timeout: float = 4.0,
+        cache: Optional[ThumbCache] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.cache = cache
+
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumb")
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._pending: Dict[str, Deque[Tuple[str, bool]]] = {}
+        self._active: Dict[str, int] = {}
+        self._running = 0
+        self._inflight: Dict[str, int] = {}  # url -> kuyruktaki/çalışan iş sayısı
+
+        self._sig_result.connect(self._on_result, Qt.ConnectionType.QueuedConnection)
+
+    def request(self, url: str):
+        if not url:
+            return
+        with self._lock:
+            if url in self._inflight:
+                return
+
+            # önbellekte varsa önce diskten boya; bayatsa ağdan koşullu doğrula
+            meta = self.cache.meta(url) if self.cache else None
+            n = 0
+            if meta:
+                self._pending.setdefault(LOCAL, deque()).append((url, True))
+                n += 1
+            if not meta or not self.cache.is_fresh(meta):
+                self._pending.setdefault(thumb_host(url), deque()).append((url, False))
+                n += 1
+            self._inflight[url] = n
+            jobs = self._take_ready()
+        self._submit(jobs)
+
+    def cancel(self):
+        with self._lock:
+            self._gen += 1
+            self._pending.clear()
+            self._inflight.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache:
+            self.cache.flush()  # okumalarda biriken erişim zamanları
+
+    # ---- internals ----
+
+    def _take_ready(self) -> List[Tuple[int, str, str, bool]]:
+        # lock altında çağrılır
+        jobs: List[Tuple[int, str, str, bool]] = []
+        for host in list(self._pending.keys()):
+            q = self._pending[host]
+            cap = self.workers if host == LOCAL else self.per_host
+            while q and self._running < self.workers and self._active.get(host, 0) < cap:
+                url, from_disk = q.popleft()
+                jobs.append((self._gen, host, url, from_disk))
+                self._active[host] = self._active.get(host, 0) + 1
+                self._running += 1
+            if not q:
+                del self._pending[host]
+        return jobs
+
+    def _submit(self, jobs: List[Tuple[int, str, str, bool]]):
+        for gen, host, url, from_disk in jobs:
+            try:
+                self._pool.submit(self._work, gen, host, url, from_disk)
+            except RuntimeError:
+                # havuz kapatıldı (pencere kapanıyor)
+                return
+
+    def _work(self, gen: int, host: str, url: str, from_disk: bool):
+        img = QImage()
+        try:
+            if gen != self._gen:
+                pass
+            elif from_disk:
+                data = self.cache.read(url)
+                if data:
+                    img.loadFromData(data)
+                else:
+                    img = self._fetch(url)  # index var ama dosya kayıp
+            else:
+                img = self._fetch(url)
+        except Exception:
+            img = QImage()
+        finally:
+            with self._lock:
+                self._active[host] = max(0, self._active.get(host, 0) - 1)
+                if not self._active[host]:
+                    del self._active[host]
+                self._running = max(0, self._running - 1)
+                if gen == self._gen and url in self._inflight:
+                    self._inflight[url] -= 1
+                    if self._inflight[url] <= 0:
+                        del self._inflight[url]
+                jobs = self._take_ready()
+            self._submit(jobs)
+
+        if not img.isNull():
+            self._sig_result.emit(gen, url, img)
+
+    def _fetch(self, url: str) -> QImage:
+        meta = self.cache.meta(url) if self.cache else None
+        res = fetch_thumb(
+            url,
+            self.timeout,
+            etag=meta.etag if meta else "",
+            last_modified=meta.last_modified if meta else "",
+        )
+        if res is None:
+            # değişmemiş; diskteki kopya zaten boyandı
+            self.cache.revalidated(url)
+            return QImage()
+
+        img, etag, lm = res
+        if self.cache and not img.isNull():
+            self.cache.put(url, encode_thumb(img), etag, lm)
+        return img
+
+    @pyqtSlot(int, str, QImage)
+    def _on_result(self, gen: int, url: str, img: QImage):
+        if gen != self._gen:
+            return
+        self.sig_ready.emit(url, img)
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+# Ses dönüştürme (MP3/M4A/OPUS/WAV/FLAC) indirmeden ayrı bir aşama.
+# yt-dlp sadece indirir; ffmpeg işleri burada CPU çekirdeği kadar paralel
+# çalışır => bir dosya dönüştürülürken ağ boş beklemez, dönüştürme hızı
+# çekirdek sayısıyla ölçeklenir. Her iş ayrı bir ffmpeg süreci (GIL yok);
+# thread'ler sadece süreci bekler.
+# Kaynak zaten hedef codec'teyse yeniden kodlanmaz (kopya/remux: opus => .opus,
+# aac => .m4a); kodlama gerekiyorsa bit hızı kaynağınkini aşmaz.
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+EXTRACT_AUDIO_PP = "FFmpegExtractAudio"
+ORIGINAL = "best"  # yt-dlp'deki gibi: codec'e dokunma, yeniden kodlamadan kap değiştir (remux)
+
+# hedef codec -> (uzantı, ffmpeg kodlayıcı argümanları); yt-dlp'nin FFmpegExtractAudio'su ile aynı
+_CODECS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "mp3": ("mp3", ("-acodec", "libmp3lame")),
+    "m4a": ("m4a", ("-acodec", "aac")),
+    "opus": ("opus", ("-acodec", "libopus")),
+    "wav": ("wav", ("-f", "wav")),
+    "flac": ("flac", ("-acodec", "flac")),
+}
+LOSSLESS = ("wav", "flac")
+
+# kaynak codec (acodec öneki) -> hedef codec adı ve doğal uzantısı (kopyalama için)
+_SOURCE: Tuple[Tuple[str, str, str], ...] = (
+    ("mp4a", "m4a", "m4a"),
+    ("aac", "m4a", "m4a"),
+    ("opus", "opus", "opus"),
+    ("vorbis", "", "ogg"),
+    ("mp3", "mp3", "mp3"),
+    ("flac", "flac", "flac"),
+)
+# acodec bilinmiyorsa uzantıdan tahmin
+_EXT_CODEC = {"m4a": "mp4a", "mp4": "mp4a", "aac": "aac", "opus": "opus", "webm": "opus",
+              "ogg": "vorbis", "mp3": "mp3", "flac": "flac"}
+
+# kaynak bit hızına en yakın (üstteki) standart değer
+BITRATES = (32, 48, 64, 96, 128, 160, 192, 256, 320)
+
+
+def match_bitrate(source_kbps: float, requested_kbps: int = 0) -> int:
+    # kaynaktan yüksek bit hızıyla kodlamak kalite kazandırmaz: istenen değer üst sınır
+    if not source_kbps:
+        return requested_kbps
+    std = next((b for b in BITRATES if b >= source_kbps * 0.97), BITRATES[-1])
+    return min(std, requested_kbps) if requested_kbps else std
+
+
+def transcode_jobs() -> int:
+    try:
+        n = int(os.environ.get("MEDIA_DL_TRANSCODE_JOBS") or 0)
+    except ValueError:
+        n = 0
+    return max(1, n or os.cpu_count() or 1)
+
+
+def ffmpeg_path(ffmpeg_bin: Optional[str] = None) -> str:
+    # ffmpeg_bin: yt-dlp'deki ffmpeg_location gibi dizin ya da dosya
+    if ffmpeg_bin:
+        if os.path.isdir(ffmpeg_bin):
+            return os.path.join(ffmpeg_bin, "ffmpeg")
+        return ffmpeg_bin
+    return shutil.which("ffmpeg") or "ffmpeg"
+
+
+@dataclass(frozen=True)
+class AudioTarget:
+    codec: str  # _CODECS anahtarı ya da ORIGINAL
+    quality: str = ""  # "320" (kbps, üst sınır) / "0".."9" (MP3 VBR) / "" (kaynağa göre)
+
+    def plan(self, src: str, acodec: str = "", abr: float = 0.0) -> Optional[Tuple[str, List[str]]]:
+        # (çıktı uzantısı, ffmpeg argümanları); None => dosya olduğu gibi kalır
+        src_ext = os.path.splitext(src)[1].lstrip(".").lower()
+        ac = (acodec if acodec and acodec != "none" else _EXT_CODEC.get(src_ext, "")).lower()
+        src_codec, natural = next(((c, e) for p, c, e in _SOURCE if ac.startswith(p)), ("", ""))
+
+        try:
+            q = float(self.quality)
+        except ValueError:
+            q = None
+
+        copy = self.codec == ORIGINAL or (
+            self.codec == src_codec and (q is None or q <= 10 or not abr or abr <= q * 1.05)
+        )
+        if copy:
+            if not natural:
+                return None  # bilinmeyen codec: dokunma
+            if natural == src_ext:
+                return None  # zaten doğru kapta
+            args = ["-vn", "-acodec", "copy"]
+            if natural == "m4a" and src_ext not in ("mp4", "m4a"):
+                args += ["-bsf:a", "aac_adtstoasc"]  # HLS (ADTS) => MP4
+            return natural, args
+
+        ext, enc = _CODECS[self.codec]
+        args = ["-vn", *enc]
+        if self.codec in LOSSLESS:
+            return ext, args
+        if q is not None and q <= 10:
+            if self.codec == "mp3":
+                args += ["-q:a", f"{q:g}"]  # 0 (en iyi) .. 9 (VBR)
+            return ext, args
+        kbps = match_bitrate(abr, int(q) if q else 0)
+        if kbps:
+            args += ["-b:a", f"{kbps}k"]
+        return ext, args
+
+
+def split_audio(opts: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[AudioTarget]]:
+    # yt-dlp seçeneklerinden ses dönüştürmeyi çıkarır (bu aşama üstlenir)
+    post = list(opts.get("postprocessors") or [])
+    for pp in post:
+        if pp.get("key") == EXTRACT_AUDIO_PP and (pp.get("preferredcodec") in _CODECS or pp.get("preferredcodec") == ORIGINAL):
+            target = AudioTarget(pp["preferredcodec"], str(pp.get("preferredquality") or ""))
+            opts = dict(opts)
+            opts["postprocessors"] = [p for p in post if p is not pp]
+            return opts, target
+    return opts, None
+
+
+@dataclass(eq=False)
+class TranscodeTask:
+    src: str
+    target: AudioTarget
+    ffmpeg: str = "ffmpeg"
+    acodec: str = ""  # indirilen ses akışı (bit hızı eşleme / kopyalama kararı)
+    abr: float = 0.0
+    on_done: Optional[Callable[["TranscodeTask"], None]] = None
+
+    out: str = ""  # bitince dönüştürülmüş dosya
+    error: str = ""
+    copied: bool = False  # yeniden kodlanmadı (kopya/remux ya da dokunulmadı)
+    queued: float = 0.0  # perf_counter: kuyruğa girdiği / başladığı / bittiği an
+    started: float = 0.0
+    ended: float = 0.0
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _proc: Optional[subprocess.Popen] = field(default=None, repr=False)
+
+    def cancel(self):
+        self._cancel.set()
+        proc = self._proc
+        if proc and proc.poll() is None:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+
+def run_task(task: TranscodeTask):
+    src = task.src
+    plan = task.target.plan(src, task.acodec, task.abr)
+    if plan is None:
+        task.out = src  # kopyalamaya bile gerek yok
+        task.copied = True
+        return
+    ext, args = plan
+    task.copied = "copy" in args
+    base = os.path.splitext(src)[0]
+    dst = f"{base}.{ext}"
+    tmp = f"{base}.temp.{ext}"
+    cmd = [
+        task.ffmpeg, "-y", "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", src, *args, tmp,
+    ]
+    try:
+        task._proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if task.cancelled:  # cancel() Popen'dan hemen önce geldiyse
+            task._proc.kill()
+        _, err = task._proc.communicate()
+        rc = task._proc.returncode
+    except OSError as ex:
+        task.error = f"ffmpeg: {ex}"
+        return
+    finally:
+        task._proc = None
+
+    if task.cancelled or rc != 0:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        if not task.cancelled:
+            lines = (err or b"").decode("utf-8", "replace").strip().splitlines()
+            task.error = f"audio conversion failed: {lines[-1] if lines else f'ffmpeg exit {rc}'}"
+        return
+
+    if dst != src:
+        try:
+            os.remove(src)  # yt-dlp gibi: kaynak (webm/m4a) silinir
+        except OSError:
+            pass
+    os.replace(tmp, dst)
+    task.out = dst
+
+
+class TranscodePool:
+    # En fazla `workers` ffmpeg süreci aynı anda; kuyruk sırayla (FIFO).
+    # Thread'ler ilk işte açılır (açılışta maliyet yok).
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or transcode_jobs())
+        self._cond = threading.Condition()
+        self._queue: Deque[TranscodeTask] = deque()
+        self._running: List[TranscodeTask] = []
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+    def submit(self, task: TranscodeTask) -> TranscodeTask:
+        with self._cond:
+            if not self._closed and not task.cancelled:
+                task.queued = time.perf_counter()
+                self._queue.append(task)
+                self._spawn()
+                self._cond.notify()
+                return task
+        task.cancel()
+        self._finish(task)
+        return task
+
+    def cancel(self, task: TranscodeTask):
+        task.cancel()
+        with self._cond:
+            if task not in self._queue:
+                return  # çalışıyorsa süreç öldürüldü, thread bitirir
+            self._queue.remove(task)
+        self._finish(task)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue) + len(self._running)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            jobs = list(self._queue)
+            self._queue.clear()
+            running = list(self._running)
+            self._cond.notify_all()
+        for t in running:
+            t.cancel()
+        for t in jobs:
+            t.cancel()
+            self._finish(t)
+
+    # ---- internals ----
+
+    def _spawn(self):
+        # lock altında
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < min(self.workers, len(self._queue) + len(self._running)):
+            t = threading.Thread(target=self._loop, name=f"ffmpeg-{len(self._threads)}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                task = self._queue.popleft()
+                self._running.append(task)
+
+            task.started = time.perf_counter()
+            try:
+                if not task.cancelled:
+                    run_task(task)
+            except Exception as ex:
+                task.error = str(ex)
+            finally:
+                task.ended = time.perf_counter()
+                with self._cond:
+                    self._running.remove(task)
+
+            self._finish(task)
+
+    def _finish(self, task: TranscodeTask):
+        if task.on_done:
+            try:
+                task.on_done(task)
+            except Exception:
+                pass
@@ -4,7 +4,7 @@ import sys
 import locale
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QWidget, QLineEdit,
-    QComboBox, QPushButton, QProgressBar, QListWidget, QCheckBox,
+    QComboBox, QPushButton, QProgressBar, QListView, QCheckBox,
     QLabel, QHBoxLayout, QSpacerItem, QSizePolicy, QFileDialog
 )
 from PyQt6.QtCore import Qt, pyqtSignal
@@ -80,13 +80,19 @@ class MediaDownloaderUI(QMainWindow):
         self.url_input.setObjectName("url_input")
         self.url_input.setPlaceholderText("YouTube, Instagram, TikTok, Twitter vb. bağlantı yapıştır...")
         self.url_input.setFixedHeight(50)
+        self.url_input.setMaxLength(1 << 24)  # yüzlerce bağlantılık listeler kesilmesin
 
         self.check_button = QPushButton("Kontrol")
         self.check_button.setObjectName("check_btn")
         self.check_button.setFixedHeight(50)
         self.check_button.setFixedWidth(140)
 
+        self.import_button = QPushButton("Dosyadan...")
+        self.import_button.setObjectName("import_btn")
+        self.import_button.setFixedHeight(50)
+
         url_row.addWidget(self.url_input, 1)
+        url_row.addWidget(self.import_button, 0)
         url_row.addWidget(self.check_button, 0)
         layout.addLayout(url_row)
 
@@ -99,15 +105,11 @@ class MediaDownloaderUI(QMainWindow):
         self.format_combo = QComboBox()
         self.format_combo.setObjectName("format_combo")
         self.format_combo.setFixedHeight(48)
-        self.format_combo.addItems([
-            "MP3",
-            "WAV",
-            "FLAC",
-            "MP4",
-            "WEBM",
-        ])
+        # data = format kodu (core.AUDIO_FORMATS / VIDEO_FORMATS); metin çevrilebilir
+        for code in ("MP3", "M4A", "OPUS", "WAV", "FLAC", "ORIGINAL", "MP4", "WEBM"):
+            self.format_combo.addItem(code, code)
         # default: MP4
-        self.format_combo.setCurrentIndex(self.format_combo.findText("MP4"))
+        self.format_combo.setCurrentIndex(self.format_combo.findData("MP4"))
 
         format_layout.addWidget(self.format_label)
         format_layout.addWidget(self.format_combo)
@@ -137,6 +139,46 @@ class MediaDownloaderUI(QMainWindow):
         quality_layout.addWidget(self.quality_combo)
         layout.addLayout(quality_layout)
 
+        # Parallel downloads row
+        parallel_layout = QHBoxLayout()
+
+        self.jobs_label = QLabel("Eşzamanlı indirme:")
+        self.jobs_label.setObjectName("jobs_label")
+
+        self.jobs_combo = QComboBox()
+        self.jobs_combo.setObjectName("jobs_combo")
+        self.jobs_combo.setFixedHeight(48)
+        self.jobs_combo.addItems(["1", "2", "3", "4", "6", "8"])
+
+        self.frag_label = QLabel("Parça paralelliği:")
+        self.frag_label.setObjectName("frag_label")
+
+        self.frag_combo = QComboBox()
+        self.frag_combo.setObjectName("frag_combo")
+        self.frag_combo.setFixedHeight(48)
+        self.frag_combo.addItem("Otomatik", "auto")
+        for n in ("1", "2", "4", "8", "16"):
+            self.frag_combo.addItem(n, n)
+
+        self.limit_label = QLabel("Hız sınırı:")
+        self.limit_label.setObjectName("limit_label")
+
+        self.limit_combo = QComboBox()
+        self.limit_combo.setObjectName("limit_combo")
+        self.limit_combo.setFixedHeight(48)
+        self.limit_combo.addItem("Sınırsız", "0")
+        for text, rate in (("512 KB/s", "512K"), ("1 MB/s", "1M"), ("2 MB/s", "2M"),
+                           ("5 MB/s", "5M"), ("10 MB/s", "10M"), ("20 MB/s", "20M")):
+            self.limit_combo.addItem(text, rate)
+
+        parallel_layout.addWidget(self.jobs_label)
+        parallel_layout.addWidget(self.jobs_combo)
+        parallel_layout.addWidget(self.frag_label)
+        parallel_layout.addWidget(self.frag_combo)
+        parallel_layout.addWidget(self.limit_label)
+        parallel_layout.addWidget(self.limit_combo)
+        layout.addLayout(parallel_layout)
+
         # Folder row
         folder_layout = QHBoxLayout()
 
@@ -172,9 +214,13 @@ class MediaDownloaderUI(QMainWindow):
         search_layout.addWidget(self.playlist_search, 1)
         search_layout.addWidget(self.select_all_cb, 0)
 
-        self.playlist_list = QListWidget()
+        self.playlist_list = QListView()
         self.playlist_list.setObjectName("playlist_list")
-        self.playlist_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self.playlist_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.playlist_list.setUniformItemSizes(True)
+        # büyük listelerde (filtre sonrası) yeniden yerleşim parça parça => UI donmaz
+        self.playlist_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.playlist_list.setBatchSize(500)
         self.playlist_list.setMinimumHeight(200)
         self.playlist_list.setMaximumHeight(250)
 
@@ -257,7 +303,7 @@ class MediaDownloaderUI(QMainWindow):
             QComboBox::down-arrow {
                 image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTIiIGhlaWdodD0iOCIgdmlld0JveD0iMCAwIDEyIDgiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxwYXRoIGQ9Ik0xIDFMNiA2TDExIDEiIHN0cm9rZT0iI2I3YjdiNyIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiLz4KPC9zdmc+);
             }
-            QListWidget {
+            QListView {
                 background-color: #1e1e1e;
                 border: 2px solid #333333;
                 border-radius: 16px;
@@ -265,8 +311,8 @@ class MediaDownloaderUI(QMainWindow):
                 padding: 8px;
                 font-size: 12pt;
             }
-            QListWidget::item { padding: 12px; border-bottom: 1px solid #2d2d2d; }
-            QListWidget::item:selected { background-color: #64b5f6; color: #121212; }
+            QListView::item { padding: 12px; border-bottom: 1px solid #2d2d2d; }
+            QListView::item:selected { background-color: #64b5f6; color: #121212; }
 
             QProgressBar {
                 background-color: #1e1e1e;
@@ -297,6 +343,8 @@ class MediaDownloaderUI(QMainWindow):
             QPushButton#folder_btn { background: #2d2d2d; }
             QPushButton#folder_btn:hover { background: #3d3d3d; }
             QPushButton#check_btn { border-radius: 18px; }
+            QPushButton#import_btn { background: #2d2d2d; border-radius: 18px; padding: 0 16px; }
+            QPushButton#import_btn:hover { background: #3d3d3d; }
             QCheckBox { color: #e0e0e0; font-size: 12pt; }
             QCheckBox::indicator {
                 width: 20px; height: 20px;